@@ -0,0 +1,58 @@
+from typing import Optional
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.exceptions import InvalidToken
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.permissions import get_claims_versions, get_user_permissions
+
+
+def set_user_claims(token, user) -> None:
+    """Escribe en el token los claims con los que ClaimsJWTAuthentication resuelve al usuario"""
+    token['restaurant_id'] = user.restaurant_id
+    token['is_staff'] = user.is_staff
+    token['is_superuser'] = user.is_superuser
+    for claim, version in get_claims_versions(user.id).items():
+        token[claim] = version
+
+
+class ClaimsUser(TokenUser):
+    """
+    Usuario ligero construido a partir de los claims del token.
+
+    Expone los atributos que usan las vistas (id, restaurant_id, is_staff,
+    is_superuser) y resuelve los permisos contra el conjunto compilado en
+    caché, sin cargar la fila de USERS.
+    """
+
+    @property
+    def restaurant_id(self) -> Optional[int]:
+        return self.token.get('restaurant_id')
+
+    def has_perm(self, perm: str, obj: Optional[object] = None) -> bool:
+        return self.is_superuser or perm in get_user_permissions(self.id)
+
+    def has_perms(self, perm_list, obj: Optional[object] = None) -> bool:
+        return all(self.has_perm(perm, obj) for perm in perm_list)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Autenticación JWT sin consulta por petición a USERS.
+
+    Solo se recurre a la base de datos cuando cambió la versión de permisos o
+    la del usuario (desactivación o cambio de rol) respecto a la del token.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        current = get_claims_versions(user_id)
+        for claim, version in current.items():
+            if validated_token.get(claim) != version:
+                return super().get_user(validated_token)
+
+        return ClaimsUser(validated_token)
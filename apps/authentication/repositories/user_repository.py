@@ -12,11 +12,11 @@ class UserRepository(DjangoRepository[User]):
 
     def get_by_email(self, email: str) -> Optional[User]:
         cache_key = f'user_email_{email}'
-        user = cache.get(cache_key)
+        user = self._cache_get(cache.get, cache_key)
         
         if not user:
             user = self.model_class.objects.filter(email=email).first()
             if user:
-                cache.set(cache_key, user, self.cache_timeout)
+                self._cache_set(cache.set, cache_key, user, self.cache_timeout)
         
         return user
@@ -1,6 +1,12 @@
+from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from drf_spectacular.utils import extend_schema_serializer
 
+from apps.authentication.backends.claims_authentication import set_user_claims
+
 @extend_schema_serializer(
     examples=[
         {
@@ -12,3 +18,35 @@ from drf_spectacular.utils import extend_schema_serializer
 class TokenSerializer(serializers.Serializer):
     access = serializers.CharField()
     refresh = serializers.CharField()
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Renueva los tokens con los claims vigentes del usuario. Sin esto se
+    copiarían los del token anterior: tras un cambio de versión de permisos
+    o del usuario, todos los tokens renovados irían a la base de datos en
+    cada petición hasta un nuevo login.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+
+        user = get_user_model().objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh.payload.get(api_settings.USER_ID_CLAIM)}
+        ).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+        set_user_claims(refresh, user)
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+
+        return data
@@ -3,11 +3,11 @@ from django.forms import ValidationError
 from apps.authentication.dtos.login_dto import LoginDTO
 from apps.authentication.dtos.password_change_dto import PasswordChangeDTO
 from apps.authentication.dtos.token_dto import TokenDTO
+from apps.authentication.backends.claims_authentication import set_user_claims
 from apps.core.exceptions import UnauthorizedException, ValidationException
 from apps.users.repositories.user_repository import UserRepository
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
-from django.core.cache import cache
 from django.utils.translation import gettext as _
 
 class AuthService:
@@ -29,6 +29,9 @@ class AuthService:
             raise UnauthorizedException(_("Credenciales inválidas"))
         
         refresh = RefreshToken.for_user(user)
+        # claims para resolver el usuario sin consultar la base de datos
+        set_user_claims(refresh, user)
+        
         return TokenDTO(
             access=str(refresh.access_token),
             refresh=str(refresh)
@@ -59,8 +62,7 @@ class AuthService:
             user.save()
             
             # Limpiar cache
-            cache.delete_pattern(f'user_email_{user.email}')
-            cache.delete_pattern(f'user_{user.id}')
+            self.repository.invalidate(user)
             
         except ValidationException as e:
             raise e
@@ -1,3 +1,109 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
-# Create your tests here.
+from apps.authentication.backends.claims_authentication import ClaimsJWTAuthentication, ClaimsUser
+from apps.authentication.dtos.login_dto import LoginDTO
+from apps.authentication.services.auth_service import AuthService
+from apps.core.permissions import get_claims_versions, invalidate_permissions
+from apps.users.models import User
+from apps.users.repositories.user_repository import UserRepository
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ClaimsAuthenticationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='claims@example.com', password='Secret123!', first_name='Test', last_name='Claims',
+            phone='5550000'
+        )
+
+    def _login(self):
+        return AuthService().login(LoginDTO(email=self.user.email, password='Secret123!'))
+
+    def _authenticate(self, access):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        with CaptureQueriesContext(connection) as queries:
+            user, _token = ClaimsJWTAuthentication().authenticate(request)
+        users_queries = [query for query in queries if '"USERS"' in query['sql']]
+        return user, users_queries
+
+    def test_claims_resolve_user_without_query(self):
+        """Test que un token con claims vigentes no consulta USERS"""
+        user, queries = self._authenticate(self._login().access)
+
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(queries, [])
+        print("✅ Test autenticación por claims válido")
+
+    def test_stale_version_falls_back_to_database(self):
+        """Test que un cambio de versión de permisos resuelve el usuario en la base de datos"""
+        access = self._login().access
+        invalidate_permissions()
+
+        user, queries = self._authenticate(access)
+
+        self.assertIsInstance(user, User)
+        self.assertEqual(len(queries), 1)
+        print("✅ Test claims desactualizados válido")
+
+    def test_deactivated_user_is_rejected(self):
+        """Test que un usuario desactivado no se autentica con un token emitido antes"""
+        access = self._login().access
+        UserRepository().delete(self.user.id)
+
+        with self.assertRaises(AuthenticationFailed):
+            self._authenticate(access)
+        print("✅ Test usuario desactivado válido")
+
+    def test_changes_outside_repository_invalidate_claims(self):
+        """Test que desactivar o cambiar el rol fuera de UserRepository invalida los claims"""
+        access = self._login().access
+        user = User.objects.get(id=self.user.id)
+        user.first_name = 'Otro'
+        user.save()
+        self.assertIsInstance(self._authenticate(access)[0], ClaimsUser)
+
+        user.is_staff = True
+        user.save()
+        user, queries = self._authenticate(access)
+        self.assertIsInstance(user, User)
+        self.assertEqual(len(queries), 1)
+
+        access = self._login().access
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        with self.assertRaises(AuthenticationFailed):
+            self._authenticate(access)
+        print("✅ Test claims invalidados por señal válido")
+
+    def test_token_without_claims_falls_back_to_database(self):
+        """Test que un token firmado sin los claims se resuelve en la base de datos"""
+        user, queries = self._authenticate(str(AccessToken.for_user(self.user)))
+
+        self.assertIsInstance(user, User)
+        self.assertEqual(len(queries), 1)
+        print("✅ Test token sin claims válido")
+
+    def test_refresh_stamps_current_versions(self):
+        """Test que el refresh emite los claims con las versiones vigentes"""
+        refresh = self._login().refresh
+        invalidate_permissions()
+
+        response = APIClient().post('/auth/refresh/', {'refresh': refresh}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        access = AccessToken(response.data['access'])
+        for claim, version in get_claims_versions(self.user.id).items():
+            self.assertEqual(access[claim], version)
+            self.assertEqual(RefreshToken(response.data['refresh'])[claim], version)
+        user, queries = self._authenticate(response.data['access'])
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(queries, [])
+        print("✅ Test refresh con claims vigentes válido")
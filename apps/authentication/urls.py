@@ -1,8 +1,9 @@
 from django.urls import path
-from .views.auth_views import LoginAPIView, LogoutAPIView, PasswordChangeAPIView
+from .views.auth_views import LoginAPIView, LogoutAPIView, PasswordChangeAPIView, TokenRefreshAPIView
 
 urlpatterns = [
     path('login/', LoginAPIView.as_view(), name='auth-login'),
+    path('refresh/', TokenRefreshAPIView.as_view(), name='auth-refresh'),
     path('logout/', LogoutAPIView.as_view(), name='auth-logout'),
     path('change-password/', PasswordChangeAPIView.as_view(), name='auth-change-password'),
 ]
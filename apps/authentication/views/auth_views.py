@@ -2,9 +2,11 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.views import TokenRefreshView
 from ..dtos.login_dto import LoginDTO
 from ..dtos.password_change_dto import PasswordChangeDTO
-from ..serializers.token_serializer import TokenSerializer
+from ..serializers.token_serializer import ClaimsTokenRefreshSerializer, TokenSerializer
 from ..services.auth_service import AuthService
 from apps.core.exceptions import UnauthorizedException, ValidationException
 from django.utils.translation import gettext_lazy as _
@@ -34,6 +36,12 @@ class LoginAPIView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
+class TokenRefreshAPIView(TokenRefreshView):
+    """
+    API para renovar el token de acceso con el refresh
+    """
+    serializer_class = ClaimsTokenRefreshSerializer
+
 class LogoutAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -52,6 +60,9 @@ class LogoutAPIView(APIView):
         )
         
 class PasswordChangeAPIView(APIView):
+    # requiere la instancia completa del usuario (check_password / save)
+    authentication_classes = [JWTAuthentication]
+
     def post(self, request):
         try:
             password_dto = PasswordChangeDTO(**request.data)
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
+
+    def ready(self):
+        from .db_pool import connect_connection_signals
+        from .instrumentation import connect_instrumentation_signals
+        from .metrics import connect_metrics_signals
+        from .signals import connect_permission_signals
+        connect_permission_signals()
+        connect_connection_signals()
+        connect_instrumentation_signals()
+        connect_metrics_signals()
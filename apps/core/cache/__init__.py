@@ -0,0 +1,19 @@
+from .tags import TaggedCache, tagged_cache
+from .result_cache import ResultCache
+from .two_tier import LocalCache, TwoTierCache, entity_cache
+from .async_cache import AsyncCache, async_cache
+from .snapshot import Snapshot
+from .commit import invalidate_on_commit
+
+__all__ = [
+    'TaggedCache',
+    'tagged_cache',
+    'ResultCache',
+    'LocalCache',
+    'TwoTierCache',
+    'entity_cache',
+    'AsyncCache',
+    'async_cache',
+    'Snapshot',
+    'invalidate_on_commit'
+]
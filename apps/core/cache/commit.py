@@ -0,0 +1,16 @@
+from typing import Any, Callable
+from django.db import transaction
+
+
+def invalidate_on_commit(invalidation: Callable[..., Any], *args: Any, using: str = None) -> None:
+    """
+    Ejecuta una invalidación ahora y otra vez al confirmar la transacción.
+
+    La primera evita que la propia transacción lea entradas viejas; la segunda
+    descarta lo que otro lector haya cacheado entre la escritura y el commit,
+    cuando todavía veía las filas anteriores. Fuera de una transacción se
+    ejecuta una sola vez.
+    """
+    invalidation(*args)
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(lambda: invalidation(*args), using=using)
@@ -0,0 +1,46 @@
+import hashlib
+import json
+from typing import Optional, Dict, Any, List
+from .tags import tagged_cache
+
+
+class ResultCache:
+    """
+    Caché de resultados ya serializados.
+
+    Guarda la página renderizada (ids + bytes JSON) bajo una clave derivada de
+    los filtros normalizados y la paginación, de modo que un acierto evita la
+    consulta a la base de datos, la conversión a DTOs y la serialización.
+    Cada página registra las etiquetas de las que depende para invalidarse
+    con un cambio de versión.
+    """
+
+    def __init__(self, prefix: str, timeout: int):
+        self.prefix = prefix
+        self.timeout = timeout
+
+    def make_key(self, filters: Optional[Dict[str, Any]], page: Any, page_size: Any) -> str:
+        """Construye la clave a partir de los filtros normalizados y la página"""
+        normalized = {
+            str(k): str(v) for k, v in (filters or {}).items()
+            if v is not None and v != ''
+        }
+        raw = json.dumps([normalized, str(page or 1), str(page_size)], sort_keys=True)
+        digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+        return f'{self.prefix}_{digest}'
+
+    def get(self, filters: Optional[Dict[str, Any]], page: Any, page_size: Any) -> Optional[bytes]:
+        entry = tagged_cache.get(self.make_key(filters, page, page_size))
+        if not entry:
+            return None
+        return entry['body']
+
+    def set(self, filters: Optional[Dict[str, Any]], page: Any, page_size: Any,
+            ids: List[int], body: bytes, versions: Dict[str, int]) -> None:
+        """`versions`: las de tagged_cache.get_versions() tomadas antes de consultar la página"""
+        tagged_cache.set(
+            self.make_key(filters, page, page_size),
+            {'ids': ids, 'body': body},
+            versions,
+            self.timeout
+        )
@@ -0,0 +1,88 @@
+import gzip
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+try:
+    import brotli
+except ImportError:  # sin brotli se ofrece solo gzip
+    brotli = None
+
+# preferencia del servidor cuando el cliente acepta varias
+ENCODINGS = ('br', 'gzip')
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    """Codificaciones de Accept-Encoding con su peso q"""
+    accepted = {}
+    for part in header.split(','):
+        name, _sep, params = part.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip().replace(' ', '')
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+@dataclass
+class Snapshot:
+    """
+    Respuesta JSON ya serializada y precomprimida, con ETag fuerte.
+
+    El ETag sale del contenido: regenerar un snapshot sin cambios conserva el
+    ETag y los clientes siguen recibiendo 304. Cada codificación es una
+    representación distinta y tiene su propio ETag.
+    """
+    body: bytes
+    digest: str
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, body: bytes) -> 'Snapshot':
+        encoded = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            encoded['br'] = brotli.compress(body, quality=9)
+        return cls(body=body, digest=hashlib.sha256(body).hexdigest()[:32], encoded=encoded)
+
+    def etag(self, encoding: Optional[str] = None) -> str:
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding in ENCODINGS:
+            if encoding in self.encoded and accepted.get(encoding, accepted.get('*', 0)) > 0:
+                return encoding
+        return None
+
+    def is_current(self, if_none_match: str) -> bool:
+        """Si el cliente ya tiene esta versión, en cualquier codificación (comparación débil)"""
+        etags = parse_etags(if_none_match)
+        if '*' in etags:
+            return True
+        own = {self.etag(encoding) for encoding in (None, *self.encoded)}
+        return any(etag.removeprefix('W/') in own for etag in etags)
+
+    def to_response(self, request, content_type: str = 'application/json') -> HttpResponse:
+        """200 con el cuerpo en la mejor codificación aceptada, o 304 si el cliente está al día"""
+        encoding = self.choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if self.is_current(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(self.encoded[encoding] if encoding else self.body, content_type=content_type)
+            if encoding:
+                response['Content-Encoding'] = encoding
+
+        response['ETag'] = self.etag(encoding)
+        response['Vary'] = 'Accept-Encoding'
+        # el cliente guarda la respuesta pero revalida siempre con If-None-Match
+        response['Cache-Control'] = 'private, no-cache'
+        return response
@@ -0,0 +1,104 @@
+import time
+from typing import Any, Dict, Iterable, Optional, Union
+from django.core.cache import cache
+
+from .async_cache import async_cache
+
+
+class TaggedCache:
+    """
+    Caché con invalidación por etiquetas (generaciones).
+
+    Cada entrada guarda la versión de las etiquetas de las que depende
+    (restaurante, cliente, tipo de entidad). Invalidar una etiqueta es un
+    incremento O(1) de su versión: las entradas que la registraron con una
+    versión anterior dejan de ser válidas sin recorrer el keyspace.
+
+    Las versiones se toman con get_versions() antes de leer la base y se
+    pasan a set(): si una invalidación ocurre entre la lectura y el set, la
+    entrada queda con la versión anterior y no se sirve.
+    """
+
+    version_prefix = 'tag_version'
+
+    def _version_key(self, tag: str) -> str:
+        return f'{self.version_prefix}_{tag}'
+
+    def get_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        """Obtiene la versión actual de cada etiqueta, inicializando las que falten"""
+        tags = list(tags)
+        keys = {self._version_key(tag): tag for tag in tags}
+        found = cache.get_many(list(keys))
+
+        versions = {keys[key]: value for key, value in found.items()}
+        for key, tag in keys.items():
+            if key in found:
+                continue
+            # se inicializa con el reloj para que una versión expulsada
+            # de redis nunca vuelva a un valor ya usado
+            cache.add(key, time.time_ns(), None)
+            versions[tag] = cache.get(key)
+        return versions
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = cache.get(key)
+        if entry is None:
+            return default
+
+        tags = entry['tags']
+        if tags and self.get_versions(tags) != tags:
+            return default
+        return entry['value']
+
+    def set(self, key: str, value: Any, tags: Union[Dict[str, int], Iterable[str]],
+            timeout: Optional[int] = None) -> None:
+        """
+        `tags` son las versiones tomadas antes de leer la base; con una lista
+        de etiquetas se usan las actuales, válido solo para querysets sin
+        evaluar (se leen al serializarse, después de tomar las versiones)
+        """
+        versions = tags if isinstance(tags, dict) else self.get_versions(tags)
+        cache.set(key, {'tags': versions, 'value': value}, timeout)
+
+    async def aget_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        """Como get_versions(), con el cliente async"""
+        tags = list(tags)
+        keys = {self._version_key(tag): tag for tag in tags}
+        found = await async_cache.get_many(list(keys))
+
+        versions = {keys[key]: value for key, value in found.items()}
+        for key, tag in keys.items():
+            if key in found:
+                continue
+            await async_cache.add(key, time.time_ns(), None)
+            versions[tag] = await async_cache.get(key)
+        return versions
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        entry = await async_cache.get(key)
+        if entry is None:
+            return default
+
+        tags = entry['tags']
+        if tags and await self.aget_versions(tags) != tags:
+            return default
+        return entry['value']
+
+    async def aset(self, key: str, value: Any, tags: Union[Dict[str, int], Iterable[str]],
+                   timeout: Optional[int] = None) -> None:
+        versions = tags if isinstance(tags, dict) else await self.aget_versions(tags)
+        await async_cache.set(key, {'tags': versions, 'value': value}, timeout)
+
+    def invalidate(self, *tags: str) -> None:
+        """Invalida todas las entradas asociadas a las etiquetas dadas"""
+        for tag in tags:
+            key = self._version_key(tag)
+            try:
+                cache.incr(key)
+            except ValueError:
+                # sin version previa (o expulsada): el reloj supera cualquier
+                # version ya registrada por las entradas existentes
+                cache.add(key, time.time_ns(), None)
+
+
+tagged_cache = TaggedCache()
@@ -0,0 +1,201 @@
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.db_router import mark_written
+from .async_cache import async_cache
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LocalCache:
+    """LRU acotado y con TTL en la memoria del proceso"""
+
+    def __init__(self, max_entries: int = 1024, timeout: int = 30):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> None:
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        with self._lock:
+            self._data[key] = (time.monotonic() + timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'size': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+class TwoTierCache:
+    """
+    Caché de dos niveles para búsquedas de entidades por id.
+
+    El primer nivel es un LRU en memoria de cada worker y el segundo la caché
+    de Django (redis). Las invalidaciones se propagan a los demás workers por
+    pub/sub de redis; el TTL corto del nivel local acota la inconsistencia si
+    se pierde algún mensaje.
+    """
+
+    def __init__(self, max_entries: int = 1024, timeout: int = 30,
+                 channel: str = 'cache_invalidation', enabled: bool = True):
+        self.local = LocalCache(max_entries=max_entries, timeout=timeout)
+        self.channel = channel
+        self.enabled = enabled
+        self.remote_hits = 0
+        self.remote_misses = 0
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self.enabled:
+            self._ensure_listener()
+            value = self.local.get(key, _MISSING)
+            if value is not _MISSING:
+                # copia superficial: los servicios modifican la instancia obtenida
+                return copy.copy(value)
+
+        value = cache.get(key)
+        if value is None:
+            self.remote_misses += 1
+            return default
+
+        self.remote_hits += 1
+        if self.enabled:
+            self.local.set(key, copy.copy(value))
+        return value
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> None:
+        cache.set(key, value, timeout)
+        if self.enabled:
+            self.local.set(key, copy.copy(value), timeout)
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        """Como get(); el nivel local no bloquea y el remoto usa el cliente async"""
+        if self.enabled:
+            self._ensure_listener()
+            value = self.local.get(key, _MISSING)
+            if value is not _MISSING:
+                return copy.copy(value)
+
+        value = await async_cache.get(key)
+        if value is None:
+            self.remote_misses += 1
+            return default
+
+        self.remote_hits += 1
+        if self.enabled:
+            self.local.set(key, copy.copy(value))
+        return value
+
+    async def aset(self, key: str, value: Any, timeout: Optional[int] = None) -> None:
+        await async_cache.set(key, value, timeout)
+        if self.enabled:
+            self.local.set(key, copy.copy(value), timeout)
+
+    def delete(self, *keys: str) -> None:
+        """Elimina las claves en ambos niveles y avisa a los demás workers"""
+        cache.delete_many(keys)
+        mark_written(*keys)
+        if not self.enabled:
+            return
+        self.local.delete_many(keys)
+        try:
+            self._redis().publish(self.channel, json.dumps(keys))
+        except NotImplementedError:
+            pass
+        except Exception as e:
+            logger.warning(f"No se pudo publicar la invalidación de caché: {str(e)}")
+
+    def stats(self) -> Dict[str, int]:
+        stats = {f'local_{name}': value for name, value in self.local.stats().items()}
+        stats['remote_hits'] = self.remote_hits
+        stats['remote_misses'] = self.remote_misses
+        return stats
+
+    def _redis(self):
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+
+    def _ensure_listener(self) -> None:
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+
+        with self._listener_lock:
+            if self._listener_pid == pid:
+                return
+            # tras un fork el contenido heredado puede estar desactualizado
+            self.local.clear()
+            self._listener_pid = pid
+            thread = threading.Thread(
+                target=self._listen, name='cache-invalidation-listener', daemon=True
+            )
+            thread.start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self._redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    self.local.delete_many(json.loads(message['data']))
+            except NotImplementedError:
+                # la caché configurada no es redis: solo aplica el TTL local
+                return
+            except Exception as e:
+                logger.warning(f"Listener de invalidación desconectado: {str(e)}")
+                # pudieron perderse mensajes mientras no había suscripción
+                self.local.clear()
+                time.sleep(5)
+
+
+_config = getattr(settings, 'LOCAL_CACHE', {})
+
+entity_cache = TwoTierCache(
+    max_entries=_config.get('MAX_ENTRIES', 1024),
+    timeout=_config.get('TIMEOUT', 30),
+    channel=_config.get('CHANNEL', 'cache_invalidation'),
+    enabled=_config.get('ENABLED', True)
+)
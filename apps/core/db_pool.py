@@ -0,0 +1,60 @@
+import time
+from collections import Counter
+from typing import Any, Dict
+from django.db import DatabaseError, connections
+from django.db.backends.signals import connection_created
+
+# conexiones abiertas por alias en este proceso (sin pool)
+_opened = Counter()
+
+
+def _connection_opened(sender, connection, **kwargs):
+    _opened[connection.alias] += 1
+
+
+def connect_connection_signals():
+    connection_created.connect(_connection_opened, dispatch_uid='db_pool_connection_opened')
+
+
+def uses_pool(alias: str) -> bool:
+    return bool(connections[alias].settings_dict.get('OPTIONS', {}).get('pool'))
+
+
+def pool_stats(alias: str) -> Dict[str, int]:
+    """
+    Métricas de conexiones del alias en este proceso. Con pool: conexiones en
+    uso, esperas por una conexión libre y esperas que terminaron en timeout.
+    """
+    if not uses_pool(alias):
+        return {'connections_opened': _opened[alias]}
+
+    stats = connections[alias].pool.get_stats()
+    size = stats.get('pool_size', 0)
+    available = stats.get('pool_available', 0)
+    return {
+        'pool_min': stats.get('pool_min', 0),
+        'pool_max': stats.get('pool_max', 0),
+        'pool_size': size,
+        'available': available,
+        'checked_out': size - available,
+        'waiting': stats.get('requests_waiting', 0),
+        'requests': stats.get('requests_num', 0),
+        'waits': stats.get('requests_queued', 0),
+        'wait_ms': stats.get('requests_wait_ms', 0),
+        'timeouts': stats.get('requests_errors', 0),
+        'connections_opened': stats.get('connections_num', 0),
+        'connections_errors': stats.get('connections_errors', 0),
+        'connections_lost': stats.get('connections_lost', 0),
+    }
+
+
+def check_database(alias: str) -> Dict[str, Any]:
+    """Ejecuta SELECT 1 en el alias y mide la latencia, incluida la obtención de la conexión"""
+    start = time.perf_counter()
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except DatabaseError as e:
+        return {'healthy': False, 'error': str(e)}
+    return {'healthy': True, 'latency_ms': round((time.perf_counter() - start) * 1000, 2)}
@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# request en curso (ReadYourWritesMiddleware) y si ya escribió en el primario
+_current_request = ContextVar('db_current_request', default=None)
+_pinned = ContextVar('db_pinned', default=False)
+
+_health = {}
+_health_lock = threading.Lock()
+
+_LAG_SQL = (
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def _config() -> dict:
+    return getattr(settings, 'DATABASE_REPLICA', {})
+
+
+def replica_alias() -> Optional[str]:
+    """Alias de la réplica, o None si no está configurada"""
+    alias = _config().get('ALIAS', 'replica')
+    return alias if alias in settings.DATABASES and alias != DEFAULT_DB_ALIAS else None
+
+
+def _max_lag() -> float:
+    return _config().get('MAX_LAG_SECONDS', 5)
+
+
+def _written_key(key: str) -> str:
+    return f'db_written:{key}'
+
+
+def _request_user_key() -> Optional[str]:
+    request = _current_request.get()
+    user = getattr(request, 'user', None) if request is not None else None
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return None
+
+
+def replica_lag(alias: str) -> float:
+    """Segundos de retraso de la réplica; 0 fuera de PostgreSQL"""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(_LAG_SQL)
+        lag = cursor.fetchone()[0]
+    return float(lag) if lag is not None else float('inf')
+
+
+def replica_is_healthy(alias: str) -> bool:
+    """Estado de la réplica, consultado como mucho cada CHECK_INTERVAL segundos por proceso"""
+    now = time.monotonic()
+    with _health_lock:
+        checked_at, healthy = _health.get(alias, (None, False))
+        if checked_at is not None and now - checked_at < _config().get('CHECK_INTERVAL', 5):
+            return healthy
+        # los demás hilos usan el último estado mientras este consulta
+        _health[alias] = (now, healthy)
+
+    try:
+        lag = replica_lag(alias)
+        healthy = lag <= _max_lag()
+        if not healthy:
+            logger.warning(f"Réplica {alias} con {lag:.1f}s de retraso; lecturas al primario")
+    except DatabaseError as e:
+        healthy = False
+        logger.warning(f"Réplica {alias} no disponible: {str(e)}")
+
+    with _health_lock:
+        _health[alias] = (now, healthy)
+    return healthy
+
+
+def mark_written(*keys: str) -> None:
+    """
+    Registra escrituras sobre las claves dadas (entidades, o el usuario que escribió).
+    Mientras dure el retraso máximo admitido, read_db() con esas claves usa el primario.
+    Las etiquetas de los listados no se registran: fijarían a todos los lectores.
+    """
+    if not keys or not replica_alias():
+        return
+    cache.set_many({_written_key(key): 1 for key in keys}, _max_lag())
+
+
+def read_db(*keys: str) -> str:
+    """
+    Alias para una lectura que tolera el retraso de la réplica.
+
+    Usa el primario dentro de una transacción, después de escribir en la misma
+    request, durante el retraso máximo tras una escritura del usuario o sobre
+    alguna de las claves dadas, y cuando la réplica no responde o se atrasa.
+    """
+    alias = replica_alias()
+    if not alias or _pinned.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return DEFAULT_DB_ALIAS
+
+    keys = [key for key in (*keys, _request_user_key()) if key]
+    if keys and cache.get_many([_written_key(key) for key in keys]):
+        return DEFAULT_DB_ALIAS
+
+    return alias if replica_is_healthy(alias) else DEFAULT_DB_ALIAS
+
+
+async def aread_db(*keys: str) -> str:
+    """read_db() para vistas async; sin réplica no sale del event loop"""
+    if not replica_alias():
+        return DEFAULT_DB_ALIAS
+    return await sync_to_async(read_db)(*keys)
+
+
+class ReplicaRouter:
+    """
+    Las escrituras van siempre al primario. Las lecturas también, salvo las que
+    los repositorios envían a la réplica con .using(read_db(...)).
+    """
+
+    def db_for_read(self, model, **hints):
+        return None
+
+    def db_for_write(self, model, **hints):
+        if _current_request.get() is not None:
+            _pinned.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # primario y réplica tienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == replica_alias():
+            return False
+        return None
+
+
+class ReadYourWritesMiddleware:
+    """
+    Asocia la request al contexto de lectura y, tras una escritura exitosa de un
+    usuario autenticado, fija sus lecturas al primario durante el retraso máximo.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _user_wrote(self, request, response) -> Optional[str]:
+        if request.method in ('GET', 'HEAD', 'OPTIONS') or response.status_code >= 400:
+            return None
+        return _request_user_key()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        request_token = _current_request.set(request)
+        pinned_token = _pinned.set(False)
+        try:
+            response = self.get_response(request)
+            user_key = self._user_wrote(request, response)
+            if user_key:
+                mark_written(user_key)
+            return response
+        finally:
+            _pinned.reset(pinned_token)
+            _current_request.reset(request_token)
+
+    async def __acall__(self, request):
+        request_token = _current_request.set(request)
+        pinned_token = _pinned.set(False)
+        try:
+            response = await self.get_response(request)
+            user_key = self._user_wrote(request, response)
+            if user_key and replica_alias():
+                await sync_to_async(mark_written)(user_key)
+            return response
+        finally:
+            _pinned.reset(pinned_token)
+            _current_request.reset(request_token)
@@ -1,22 +1,36 @@
 from functools import wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from rest_framework.exceptions import PermissionDenied, NotAuthenticated
 
+from .permissions import has_permissions
+
+
+def _check_permissions(request, perms):
+    # Verifica si el usuario está autenticado
+    if not request.user.is_authenticated:
+        raise NotAuthenticated()
+
+    # Verificar permisos contra el conjunto compilado del usuario
+    if not has_permissions(request, perms):
+        raise PermissionDenied(
+            detail="No tiene permiso para esta acción.",
+            code='permission_denied'
+        )
+
+
 def permission_required(perms):
     def decorator(view_method):
+        if iscoroutinefunction(view_method):
+            # los permisos compilados se leen de la caché fuera del event loop
+            @wraps(view_method)
+            async def async_wrapped_view(self, request, *args, **kwargs):
+                await sync_to_async(_check_permissions)(request, perms)
+                return await view_method(self, request, *args, **kwargs)
+            return async_wrapped_view
+
         @wraps(view_method)
         def wrapped_view(self, request, *args, **kwargs):
-            # Verifica si el usuario está autenticado
-            if not request.user.is_authenticated:
-                raise NotAuthenticated()
-                
-            # Verificar permisos
-            for perm in perms:
-                if not request.user.has_perm(perm):
-                    raise PermissionDenied(
-                        detail="No tiene permiso para esta acción.",
-                        code='permission_denied'
-                    )
-            
+            _check_permissions(request, perms)
             return view_method(self, request, *args, **kwargs)
         return wrapped_view
     return decorator
@@ -0,0 +1,97 @@
+from dataclasses import MISSING, field as dataclass_field, fields, make_dataclass
+from operator import attrgetter
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Mapping, Optional, Type, TypeVar
+
+T = TypeVar('T')
+
+
+def dto_fields(dto_class: type) -> List[str]:
+    """Nombres de los campos del DTO, en orden"""
+    return [field.name for field in fields(dto_class)]
+
+
+def slotted(dto_class: type) -> type:
+    """
+    Variante de un DTO de lectura para listados y exportaciones: mismos campos
+    y valores por defecto, pero inmutable y con __slots__, sin un __dict__ por
+    instancia (menos memoria y menos trabajo para el GC en lotes de miles de
+    filas). El DTO original sigue siendo mutable para el código que lo modifica.
+    Se asigna en el módulo del DTO con el nombre Slotted<DTO> para que pickle
+    la encuentre.
+    """
+    spec = []
+    for dto_field in fields(dto_class):
+        if dto_field.default is not MISSING:
+            spec.append((dto_field.name, dto_field.type, dataclass_field(default=dto_field.default)))
+        elif dto_field.default_factory is not MISSING:
+            spec.append((dto_field.name, dto_field.type, dataclass_field(default_factory=dto_field.default_factory)))
+        else:
+            spec.append((dto_field.name, dto_field.type))
+    variant = make_dataclass(f'Slotted{dto_class.__name__}', spec, slots=True, frozen=True)
+    variant.__module__ = dto_class.__module__
+    return variant
+
+
+class DTOBatch(Generic[T]):
+    """
+    Lote columnar de DTOs: una lista por campo en vez de un objeto por fila.
+
+    Los serializers compilados (apps.core.serializers) lo recorren columna a
+    columna sin crear un DTO por fila. Iterarlo construye los DTOs para el
+    código que trabaja con objetos.
+    """
+    __slots__ = ('dto_class', 'columns', 'size')
+
+    def __init__(self, dto_class: Type[T], columns: Mapping[str, List[Any]]):
+        names = dto_fields(dto_class)
+        missing = set(names) - set(columns)
+        if missing:
+            raise ValueError(f"Faltan columnas para {dto_class.__name__}: {', '.join(sorted(missing))}")
+        sizes = {len(columns[name]) for name in names}
+        if len(sizes) > 1:
+            raise ValueError(f"Las columnas de {dto_class.__name__} tienen longitudes distintas")
+
+        self.dto_class = dto_class
+        # mismo orden que los campos del dataclass para construir DTOs por posición
+        self.columns: Dict[str, List[Any]] = {name: columns[name] for name in names}
+        self.size = sizes.pop() if sizes else 0
+
+    @classmethod
+    def from_objects(cls, dto_class: Type[T], objects: Iterable[Any],
+                     converters: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+                     columns: Optional[Mapping[str, List[Any]]] = None) -> 'DTOBatch[T]':
+        """
+        Construye el lote leyendo de cada objeto (modelos o filas de
+        values_list(named=True)) el atributo con el nombre de cada campo.
+        `converters` transforma el valor de los campos que no se copian tal
+        cual; `columns` da ya armadas las columnas que los objetos no tienen.
+        """
+        objects = objects if isinstance(objects, list) else list(objects)
+        converters = converters or {}
+        columns = dict(columns or {})
+        for field in fields(dto_class):
+            if field.name in columns:
+                continue
+            column = list(map(attrgetter(field.name), objects))
+            convert = converters.get(field.name)
+            if convert is not None:
+                column = [convert(value) for value in column]
+            columns[field.name] = column
+        return cls(dto_class, columns)
+
+    def column(self, name: str) -> List[Any]:
+        return self.columns[name]
+
+    def rows(self) -> Iterator[tuple]:
+        """Valores de cada fila en el orden de los campos del DTO"""
+        return zip(*self.columns.values())
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[T]:
+        dto_class = self.dto_class
+        return (dto_class(*values) for values in self.rows())
+
+    def __getitem__(self, index: int) -> T:
+        return self.dto_class(*(column[index] for column in self.columns.values()))
@@ -0,0 +1,211 @@
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+from .metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+# métricas de la request en curso; None si no se muestreó
+_metrics = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Totales de una request muestreada: consultas SQL, caché y serialización"""
+    __slots__ = ('queries', 'query_ms', 'cache_hits', 'cache_misses', 'cache_ms', 'serialize_ms')
+
+    def __init__(self):
+        self.queries = 0
+        self.query_ms = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_ms = 0.0
+        self.serialize_ms = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        values = {name: getattr(self, name) for name in self.__slots__}
+        return {name: round(value, 2) if isinstance(value, float) else value for name, value in values.items()}
+
+    def server_timing(self, total_ms: float) -> str:
+        """Valor de la cabecera Server-Timing (los navegadores la muestran en la pestaña de red)"""
+        return ', '.join([
+            f'db;dur={self.query_ms:.2f};desc="{self.queries} queries"',
+            f'cache;dur={self.cache_ms:.2f};desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+            f'serialize;dur={self.serialize_ms:.2f}',
+            f'total;dur={total_ms:.2f}',
+        ])
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    return _metrics.get()
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.query_ms += (time.perf_counter() - start) * 1000
+
+
+def _install_query_hook(sender, connection, **kwargs):
+    # la señal se repite en cada reconexión del mismo DatabaseWrapper
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def connect_instrumentation_signals():
+    connection_created.connect(_install_query_hook, dispatch_uid='instrumentation_query_hook')
+
+
+def _record_cache(metrics: RequestMetrics, start: float, hit: Optional[bool]) -> None:
+    metrics.cache_ms += (time.perf_counter() - start) * 1000
+    if hit is True:
+        metrics.cache_hits += 1
+    elif hit is False:
+        metrics.cache_misses += 1
+
+
+def timed_cache_get(getter: Callable, *args: Any) -> Any:
+    """
+    getter(*args) contando un acierto (valor no None) o un fallo. Todas las
+    lecturas suman a /metrics por familia de clave; el tiempo, solo las de
+    requests muestreadas.
+    """
+    metrics = _metrics.get()
+    if metrics is None:
+        value = getter(*args)
+    else:
+        start = time.perf_counter()
+        value = getter(*args)
+        _record_cache(metrics, start, value is not None)
+    record_cache_lookup(args[0] if args else None, value is not None)
+    return value
+
+
+async def atimed_cache_get(getter: Callable, *args: Any) -> Any:
+    metrics = _metrics.get()
+    if metrics is None:
+        value = await getter(*args)
+    else:
+        start = time.perf_counter()
+        value = await getter(*args)
+        _record_cache(metrics, start, value is not None)
+    record_cache_lookup(args[0] if args else None, value is not None)
+    return value
+
+
+def timed_cache_set(setter: Callable, *args: Any) -> None:
+    """setter(*args) sumando su tiempo a la caché, sin contar acierto ni fallo"""
+    metrics = _metrics.get()
+    if metrics is None:
+        setter(*args)
+        return
+    start = time.perf_counter()
+    setter(*args)
+    _record_cache(metrics, start, None)
+
+
+async def atimed_cache_set(setter: Callable, *args: Any) -> None:
+    metrics = _metrics.get()
+    if metrics is None:
+        await setter(*args)
+        return
+    start = time.perf_counter()
+    await setter(*args)
+    _record_cache(metrics, start, None)
+
+
+@contextmanager
+def timed_serialization():
+    metrics = _metrics.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serialize_ms += (time.perf_counter() - start) * 1000
+
+
+class RequestMetricsMiddleware:
+    """
+    Mide una fracción de las requests (REQUEST_METRICS['SAMPLE_RATE']) y
+    publica los totales en la cabecera Server-Timing y en una línea JSON del
+    logger apps.core.instrumentation. Las requests no muestreadas no pagan
+    más que el sorteo.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = getattr(settings, 'REQUEST_METRICS', {})
+        self.sample_rate = config.get('SAMPLE_RATE', 0)
+        self.server_timing = config.get('SERVER_TIMING', True)
+        self.log = config.get('LOG', True)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _sampled(self) -> bool:
+        return self.sample_rate >= 1 or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _metrics.reset(token)
+        self._emit(request, response, metrics, (time.perf_counter() - start) * 1000)
+        return response
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _metrics.reset(token)
+        self._emit(request, response, metrics, (time.perf_counter() - start) * 1000)
+        return response
+
+    def _emit(self, request, response, metrics: RequestMetrics, total_ms: float) -> None:
+        if self.server_timing:
+            timing = metrics.server_timing(total_ms)
+            existing = response.get('Server-Timing')
+            response['Server-Timing'] = f'{existing}, {timing}' if existing else timing
+
+        if self.log and logger.isEnabledFor(logging.INFO):
+            match = getattr(request, 'resolver_match', None)
+            payload = {
+                'method': request.method,
+                'path': request.path,
+                'view': match.view_name if match else None,
+                'status': response.status_code,
+                'total_ms': round(total_ms, 2),
+                **metrics.as_dict(),
+            }
+            logger.info(f"request_metrics {json.dumps(payload, sort_keys=True)}", extra={'request_metrics': payload})
@@ -0,0 +1,121 @@
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from apps.core.perf.benchmark import (
+    BENCHMARK_BASELINE_PATH, COLLECTION_PATH, Runner, compare, load_benchmark_baseline, load_operations,
+    make_plan, regressions, save_benchmark_baseline, summarize
+)
+from apps.core.perf.dataset import seed
+from apps.core.perf.harness import clear_caches
+
+
+class Command(BaseCommand):
+    help = (
+        "Reproduce una mezcla ponderada de las requests de postman/collection.json contra la app "
+        "en el mismo proceso y reporta p50/p95/p99, throughput y consultas/caché por endpoint. "
+        "Usa una base de datos de test sembrada con apps/core/perf y vacía la caché configurada. "
+        "Con SQLite en memoria la concurrencia serializa las escrituras: para medir carga, PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--collection', type=Path, default=COLLECTION_PATH, help="Colección de Postman")
+        parser.add_argument('--scale', type=int, default=2, help="Copias de los datos de import/")
+        parser.add_argument('--requests', type=int, default=500, help="Requests medidas")
+        parser.add_argument('--warmup', type=int, default=50, help="Requests previas sin medir")
+        parser.add_argument('--concurrency', type=int, default=4, help="Hilos simultáneos")
+        parser.add_argument('--seed', type=int, default=0, help="Semilla de la mezcla de requests")
+        parser.add_argument(
+            '--weight', action='append', default=[], metavar='NOMBRE=PESO',
+            help="Peso de una request ('orders/list=10'); 0 la excluye. Repetible"
+        )
+        parser.add_argument('--baseline', type=Path, default=BENCHMARK_BASELINE_PATH, help="Archivo de baseline")
+        parser.add_argument('--save-baseline', action='store_true', help="Guarda el resultado como baseline")
+        parser.add_argument(
+            '--max-regression', type=float, default=None, metavar='PCT',
+            help="Falla si el p95 o el throughput empeoran más de PCT %% respecto al baseline"
+        )
+
+    def handle(self, *args, **options):
+        weights = self._weights(options['weight'])
+        operations, skipped = load_operations(options['collection'], weights)
+        for reason in skipped:
+            self.stdout.write(self.style.WARNING(f"Omitida: {reason}"))
+        if not operations:
+            raise CommandError("La colección no tiene requests ejecutables.")
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, serialized_aliases=set())
+        try:
+            clear_caches()
+            dataset = seed(options['scale'])
+            runner = Runner(dataset, options['concurrency'])
+            runner.run(make_plan(operations, options['warmup'], options['seed'] + 1))
+            samples, seconds = runner.run(make_plan(operations, options['requests'], options['seed']))
+            vendor = connection.vendor
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        summary = summarize(samples, seconds)
+        config = {key: options[key] for key in ('scale', 'requests', 'warmup', 'concurrency', 'seed')}
+        config['weights'] = weights
+        self._report(summary, vendor, config, seconds)
+
+        baseline = load_benchmark_baseline(options['baseline']).get(vendor)
+        if baseline is not None:
+            if baseline['config'] != config:
+                self.stdout.write(self.style.WARNING(f"El baseline se midió con otra configuración: {baseline['config']}"))
+            self._report_changes(compare(summary, baseline))
+
+        if options['save_baseline']:
+            save_benchmark_baseline(vendor, config, summary, options['baseline'])
+            self.stdout.write(self.style.SUCCESS(f"Baseline de {vendor} guardado en {options['baseline']}"))
+        elif baseline is not None and options['max_regression'] is not None:
+            found = regressions(compare(summary, baseline), options['max_regression'])
+            if found:
+                raise CommandError("Regresiones respecto al baseline:\n" + '\n'.join(found))
+
+    def _weights(self, values):
+        weights = {}
+        for value in values:
+            name, sep, weight = value.rpartition('=')
+            try:
+                weights[name] = float(weight)
+            except ValueError:
+                name = ''
+            if not sep or not name:
+                raise CommandError(f"Peso inválido: '{value}' (formato NOMBRE=PESO)")
+        return weights
+
+    def _report(self, summary, vendor, config, seconds):
+        total = summary['total']
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{total['requests']} requests en {seconds:.2f} s ({vendor}, escala {config['scale']}, "
+            f"{config['concurrency']} hilos)"
+        ))
+        self.stdout.write(
+            f"  p50 {total['p50']:.2f} ms  p95 {total['p95']:.2f} ms  p99 {total['p99']:.2f} ms  "
+            f"{total['rps']:.1f} req/s  errores {total['errors']}"
+        )
+        header = f"{'endpoint':<28}{'n':>6}{'err':>5}{'p50':>9}{'p95':>9}{'p99':>9}{'sql':>7}{'caché':>12}"
+        self.stdout.write(header)
+        for name, stats in summary['endpoints'].items():
+            ratio = stats['cache_hit_ratio']
+            cache = f"{stats['cache_hits']}/{stats['cache_misses']}" + (f" {ratio:.0%}" if ratio is not None else '')
+            line = (
+                f"{name:<28}{stats['requests']:>6}{stats['errors']:>5}{stats['p50']:>9.2f}"
+                f"{stats['p95']:>9.2f}{stats['p99']:>9.2f}{stats['queries']:>7.1f}{cache:>12}"
+            )
+            self.stdout.write(self.style.ERROR(line) if stats['errors'] else line)
+
+    def _report_changes(self, changes):
+        if not changes:
+            return
+        self.stdout.write(self.style.MIGRATE_HEADING("Variación respecto al baseline (%)"))
+        for name, metrics in changes.items():
+            values = '  '.join(
+                f"{metric} {value:+.1f}" if value is not None else f"{metric} -" for metric, value in metrics.items()
+            )
+            self.stdout.write(f"  {name:<26}{values}")
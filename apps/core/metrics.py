@@ -0,0 +1,346 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Tuple
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from celery.signals import before_task_publish, task_postrun, task_prerun
+from django.conf import settings
+from django.db import connections
+from prometheus_client import CollectorRegistry, Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+
+from .cache import entity_cache
+from .db_pool import pool_stats
+
+logger = logging.getLogger(__name__)
+
+# familias de claves de caché de los repositorios; el resto cuenta como 'other'.
+# Las que empiezan con el prefijo de otra (user_email_ y user_) son familias propias
+CACHE_KEY_FAMILIES = (
+    'order_', 'archived_order_', 'menu_item_', 'user_', 'user_email_', 'user_perms_', 'restaurant_'
+)
+# el prefijo más largo primero: 'user_email_1' no cuenta como 'user'
+_FAMILY_PREFIXES = sorted(CACHE_KEY_FAMILIES, key=len, reverse=True)
+
+# segundos: los reportes y las cargas masivas tardan de segundos a minutos
+TASK_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+# registro propio: /metrics expone solo lo de esta app
+registry = CollectorRegistry()
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Latencia de las requests por nombre de ruta',
+    ['view', 'method'], registry=registry
+)
+REQUESTS = Counter(
+    'http_requests', 'Requests por nombre de ruta y status', ['view', 'method', 'status'], registry=registry
+)
+CACHE_LOOKUPS = Counter(
+    'cache_lookups', 'Lecturas de caché de los repositorios por familia de clave',
+    ['family', 'result'], registry=registry
+)
+
+
+def cache_key_family(key: Any) -> str:
+    """'order_15' -> 'order'; claves de listados, páginas o snapshots -> 'other'"""
+    if isinstance(key, str):
+        for prefix in _FAMILY_PREFIXES:
+            if key.startswith(prefix):
+                return prefix[:-1]
+    return 'other'
+
+
+def record_cache_lookup(key: Any, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache_key_family(key), 'hit' if hit else 'miss').inc()
+
+
+class PrometheusMiddleware:
+    """Latencia y status de cada request, por nombre de ruta (sin ids en las etiquetas)"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self._observe(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, time.perf_counter() - start)
+        return response
+
+    def _observe(self, request, response, seconds: float) -> None:
+        match = getattr(request, 'resolver_match', None)
+        # las rutas inexistentes comparten etiqueta: no crean series por URL
+        view = match.view_name if match else 'unmatched'
+        REQUEST_LATENCY.labels(view, request.method).observe(seconds)
+        REQUESTS.labels(view, request.method, str(response.status_code)).inc()
+
+
+class TaskStats:
+    """
+    Duraciones y tareas encoladas de Celery, compartidas entre procesos: el
+    worker las registra y el proceso web las expone. Se guardan en redis (un
+    hash por tarea); con otra caché, en la memoria del proceso (tareas eager).
+    """
+    prefix = 'metrics:celery'
+
+    def __init__(self):
+        self._local: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _redis(self):
+        from django_redis import get_redis_connection
+        try:
+            return get_redis_connection('default')
+        except NotImplementedError:
+            return None
+
+    def _increments(self, seconds: float, failed: bool) -> Dict[str, float]:
+        bucket = next((le for le in TASK_BUCKETS if seconds <= le), None)
+        increments = {'count': 1, 'sum': seconds}
+        if bucket is not None:
+            increments[f'bucket:{bucket}'] = 1
+        if failed:
+            increments['failures'] = 1
+        return increments
+
+    def _apply(self, key: str, increments: Dict[str, float]) -> None:
+        client = self._redis()
+        if client is None:
+            with self._lock:
+                values = self._local.setdefault(key, {})
+                for field, amount in increments.items():
+                    values[field] = values.get(field, 0) + amount
+            return
+        pipe = client.pipeline()
+        for field, amount in increments.items():
+            if isinstance(amount, float):
+                pipe.hincrbyfloat(key, field, amount)
+            else:
+                pipe.hincrby(key, field, amount)
+        if key.startswith(f'{self.prefix}:task:'):
+            pipe.sadd(f'{self.prefix}:tasks', key)
+        pipe.execute()
+
+    def observe(self, task: str, seconds: float, failed: bool) -> None:
+        self._apply(f'{self.prefix}:task:{task}', self._increments(seconds, failed))
+
+    def queued(self, task: str, amount: int) -> None:
+        self._apply(f'{self.prefix}:queued', {task: amount})
+
+    def snapshot(self) -> Tuple[Dict[str, Dict[str, float]], Dict[str, int]]:
+        """({tarea: contadores de duración}, {tarea: encoladas})"""
+        task_prefix = f'{self.prefix}:task:'
+        client = self._redis()
+        if client is None:
+            with self._lock:
+                data = {key: dict(values) for key, values in self._local.items()}
+        else:
+            keys = [key.decode() for key in client.smembers(f'{self.prefix}:tasks')]
+            keys.append(f'{self.prefix}:queued')
+            pipe = client.pipeline()
+            for key in keys:
+                pipe.hgetall(key)
+            data = {
+                key: {field.decode(): float(value) for field, value in values.items()}
+                for key, values in zip(keys, pipe.execute())
+            }
+
+        durations = {
+            key[len(task_prefix):]: values for key, values in data.items() if key.startswith(task_prefix)
+        }
+        # sin piso, una tarea perdida por el broker dejaría el contador en negativo
+        queued = {task: max(0, int(value)) for task, value in data.get(f'{self.prefix}:queued', {}).items()}
+        return durations, queued
+
+    def clear(self) -> None:
+        client = self._redis()
+        if client is None:
+            with self._lock:
+                self._local.clear()
+            return
+        keys = [key.decode() for key in client.smembers(f'{self.prefix}:tasks')]
+        client.delete(f'{self.prefix}:tasks', f'{self.prefix}:queued', *keys)
+
+
+task_stats = TaskStats()
+
+# inicio de cada tarea en ejecución en este worker, por id
+_task_starts: Dict[str, float] = {}
+
+
+def _record(action, *args) -> None:
+    # las métricas no deben hacer fallar la publicación ni la tarea
+    try:
+        action(*args)
+    except Exception as e:
+        logger.warning(f"No se pudo registrar la métrica de Celery: {str(e)}")
+
+
+def _task_published(sender=None, **kwargs):
+    _record(task_stats.queued, sender, 1)
+
+
+def _task_started(sender=None, task_id=None, task=None, **kwargs):
+    _task_starts[task_id] = time.monotonic()
+    # las tareas eager no pasan por el broker ni por before_task_publish
+    if not task.request.is_eager:
+        _record(task_stats.queued, task.name, -1)
+
+
+def _task_finished(sender=None, task_id=None, task=None, state=None, **kwargs):
+    start = _task_starts.pop(task_id, None)
+    if start is not None:
+        _record(task_stats.observe, task.name, time.monotonic() - start, state == 'FAILURE')
+
+
+def connect_metrics_signals():
+    before_task_publish.connect(_task_published, dispatch_uid='metrics_task_published')
+    task_prerun.connect(_task_started, dispatch_uid='metrics_task_started')
+    task_postrun.connect(_task_finished, dispatch_uid='metrics_task_finished')
+
+
+class CacheCollector:
+    """Proporción de aciertos por familia de clave y estado del nivel local de entity_cache"""
+
+    def collect(self):
+        lookups: Dict[str, Dict[str, float]] = {}
+        for metric in CACHE_LOOKUPS.collect():
+            for sample in metric.samples:
+                if sample.name.endswith('_total'):
+                    lookups.setdefault(sample.labels['family'], {})[sample.labels['result']] = sample.value
+
+        ratio = GaugeMetricFamily(
+            'cache_hit_ratio', 'Aciertos / lecturas de caché de los repositorios', labels=['family']
+        )
+        for family, counts in sorted(lookups.items()):
+            total = counts.get('hit', 0) + counts.get('miss', 0)
+            if total:
+                ratio.add_metric([family], counts.get('hit', 0) / total)
+        yield ratio
+
+        stats = entity_cache.stats()
+        yield GaugeMetricFamily(
+            'entity_cache_local_entries', 'Entradas en el nivel en memoria de entity_cache', value=stats['local_size']
+        )
+        tiers = CounterMetricFamily(
+            'entity_cache_lookups', 'Lecturas de entity_cache por nivel y resultado', labels=['tier', 'result']
+        )
+        tiers.add_metric(['local', 'hit'], stats['local_hits'])
+        tiers.add_metric(['local', 'miss'], stats['local_misses'])
+        tiers.add_metric(['remote', 'hit'], stats['remote_hits'])
+        tiers.add_metric(['remote', 'miss'], stats['remote_misses'])
+        yield tiers
+        yield CounterMetricFamily(
+            'entity_cache_local_evictions', 'Entradas expulsadas del nivel local por el LRU',
+            value=stats['local_evictions']
+        )
+
+
+class CeleryCollector:
+    """Duración por tarea, tareas encoladas y largo de las colas del broker"""
+
+    def collect(self):
+        try:
+            durations, queued = task_stats.snapshot()
+        except Exception as e:
+            logger.warning(f"No se pudieron leer las métricas de Celery: {str(e)}")
+            durations, queued = {}, {}
+
+        histogram = HistogramMetricFamily(
+            'celery_task_duration_seconds', 'Duración de las tareas de Celery', labels=['task']
+        )
+        failures = CounterMetricFamily('celery_task_failures', 'Tareas terminadas con error', labels=['task'])
+        for task, values in sorted(durations.items()):
+            cumulative, buckets = 0, []
+            for le in TASK_BUCKETS:
+                cumulative += values.get(f'bucket:{le}', 0)
+                buckets.append((str(float(le)), cumulative))
+            buckets.append(('+Inf', values.get('count', 0)))
+            histogram.add_metric([task], buckets, values.get('sum', 0))
+            failures.add_metric([task], values.get('failures', 0))
+        yield histogram
+        yield failures
+
+        pending = GaugeMetricFamily(
+            'celery_task_queued', 'Tareas publicadas que aún no empezaron', labels=['task']
+        )
+        for task, value in sorted(queued.items()):
+            pending.add_metric([task], value)
+        yield pending
+
+        lengths = GaugeMetricFamily('celery_queue_length', 'Mensajes en la cola del broker', labels=['queue'])
+        for queue, length in self._queue_lengths().items():
+            lengths.add_metric([queue], length)
+        yield lengths
+
+    def _queue_lengths(self) -> Dict[str, int]:
+        from config.celery import app
+
+        config = getattr(settings, 'METRICS', {})
+        lengths = {}
+        try:
+            # un broker caído no debe colgar el scrape: un intento, timeout corto
+            with app.connection_for_read(connect_timeout=config.get('BROKER_TIMEOUT', 1)) as connection:
+                connection.ensure_connection(max_retries=1)
+                channel = connection.default_channel
+                for queue in config.get('CELERY_QUEUES', ['celery']):
+                    try:
+                        lengths[queue] = channel.queue_declare(queue=queue, passive=True).message_count
+                    except Exception:
+                        # la cola todavía no existe en el broker
+                        lengths[queue] = 0
+        except Exception as e:
+            logger.warning(f"No se pudo consultar el broker de Celery: {str(e)}")
+        return lengths
+
+
+class DatabaseCollector:
+    """Conexiones de cada alias en este proceso (ver db_pool.pool_stats)"""
+
+    def collect(self):
+        in_use = GaugeMetricFamily(
+            'db_pool_connections', 'Conexiones del pool por estado', labels=['alias', 'state']
+        )
+        limits = GaugeMetricFamily('db_pool_max_connections', 'Tamaño máximo del pool', labels=['alias'])
+        waiting = GaugeMetricFamily(
+            'db_pool_waiting_requests', 'Requests esperando una conexión libre', labels=['alias']
+        )
+        waits = CounterMetricFamily('db_pool_waits', 'Esperas por una conexión libre', labels=['alias'])
+        timeouts = CounterMetricFamily(
+            'db_pool_timeouts', 'Esperas que terminaron sin conexión', labels=['alias']
+        )
+        opened = CounterMetricFamily('db_connections_opened', 'Conexiones abiertas', labels=['alias'])
+
+        for alias in connections:
+            try:
+                stats = pool_stats(alias)
+            except Exception as e:
+                logger.warning(f"No se pudieron leer las conexiones de {alias}: {str(e)}")
+                continue
+            opened.add_metric([alias], stats.get('connections_opened', 0))
+            if 'pool_max' not in stats:
+                continue
+            in_use.add_metric([alias, 'in_use'], stats['checked_out'])
+            in_use.add_metric([alias, 'idle'], stats['available'])
+            limits.add_metric([alias], stats['pool_max'])
+            waiting.add_metric([alias], stats['waiting'])
+            waits.add_metric([alias], stats['waits'])
+            timeouts.add_metric([alias], stats['timeouts'])
+
+        yield from (in_use, limits, waiting, waits, timeouts, opened)
+
+
+registry.register(CacheCollector())
+registry.register(CeleryCollector())
+registry.register(DatabaseCollector())
@@ -0,0 +1,177 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import InvalidPage, Page
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """PageNumberPagination que además pagina con el ORM async (COUNT y página sin bloquear el event loop)"""
+
+    async def apaginate_queryset(self, queryset: QuerySet, request, view=None) -> Optional[List[Any]]:
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # con el total ya resuelto, Paginator no consulta la base
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        bottom = (number - 1) * paginator.per_page
+        top = bottom + paginator.per_page
+        if top + paginator.orphans >= paginator.count:
+            top = paginator.count
+
+        items = [item async for item in queryset[bottom:top]]
+        self.page = Page(items, number, paginator)
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return items
+
+
+class KeysetPagination:
+    """
+    Paginación por cursor sobre (campo de fecha, id).
+
+    Cada página se obtiene con un filtro sobre la última fila de la anterior,
+    sin COUNT(*) ni OFFSET, por lo que el costo no crece con la profundidad.
+    El cursor es opaco (base64 de la última clave) y el total, si se pide
+    con ?include_total=true, es una estimación del planificador.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    total_query_param = 'include_total'
+    max_page_size = 100
+    # por debajo de esta estimación el COUNT exacto es barato
+    exact_count_threshold = 1000
+
+    def __init__(self, ordering_field: str = 'created_at', page_size: Optional[int] = None):
+        self.ordering_field = ordering_field
+        self.page_size = page_size or settings.REST_FRAMEWORK.get('PAGE_SIZE', 10)
+        self.next_cursor = None
+        self.total = None
+
+    def _page_queryset(self, queryset: QuerySet, request) -> QuerySet:
+        """Queryset de la página pedida, con una fila extra para saber si hay siguiente"""
+        page_size = request.query_params.get(self.page_size_query_param)
+        if page_size:
+            try:
+                # 0 o negativos dejarían la página vacía o un slice negativo
+                self.page_size = max(1, min(int(page_size), self.max_page_size))
+            except ValueError:
+                pass  # usa tamaño por defecto
+
+        queryset = queryset.order_by(f'-{self.ordering_field}', '-id')
+        cursor = self.decode_cursor(request.query_params.get(self.cursor_query_param))
+        if cursor:
+            value, pk = cursor
+            queryset = queryset.filter(
+                Q(**{f'{self.ordering_field}__lt': value}) |
+                Q(**{self.ordering_field: value, 'id__lt': pk})
+            )
+        return queryset[:self.page_size + 1]
+
+    def _wants_total(self, request) -> bool:
+        return request.query_params.get(self.total_query_param) in ('1', 'true', 'True')
+
+    def _page_from_rows(self, rows: List[Any]) -> List[Any]:
+        page = rows[:self.page_size]
+        if len(rows) > self.page_size:
+            last = page[-1]
+            self.next_cursor = self.encode_cursor(getattr(last, self.ordering_field), last.id)
+        return page
+
+    def paginate_queryset(self, queryset: QuerySet, request) -> List[Any]:
+        if self._wants_total(request):
+            self.total = self.estimate_count(queryset)
+
+        page_queryset = self._page_queryset(queryset, request)
+        return self._page_from_rows(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset: QuerySet, request) -> List[Any]:
+        """paginate_queryset() para vistas async"""
+        if self._wants_total(request):
+            self.total = await sync_to_async(self.estimate_count)(queryset)
+
+        page_queryset = self._page_queryset(queryset, request)
+        return self._page_from_rows([row async for row in page_queryset])
+
+    def get_paginated_response(self, data) -> Response:
+        body = {
+            'items': data,
+            'next_cursor': self.next_cursor,
+            'page_size': self.page_size,
+        }
+        if self.total is not None:
+            body['total'] = self.total
+        return Response(body)
+
+    def encode_cursor(self, value: datetime, pk: int) -> str:
+        raw = json.dumps([value.isoformat(), pk])
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, cursor: Optional[str]):
+        if not cursor:
+            return None
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            return datetime.fromisoformat(value), int(pk)
+        except (ValueError, TypeError):
+            raise NotFound(_("Cursor inválido"))
+
+    def estimate_count(self, queryset: QuerySet) -> int:
+        """Total aproximado: estimación del planificador en PostgreSQL, COUNT en otros motores"""
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return queryset.count()
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]['Plan']['Plan Rows'])
+        if estimate < self.exact_count_threshold:
+            return queryset.count()
+        return estimate
+
+
+class KeysetPaginationMixin:
+    """Habilita la paginación por cursor en las vistas de listado con ?cursor="""
+
+    keyset_ordering_field = 'created_at'
+
+    def use_keyset_pagination(self) -> bool:
+        return KeysetPagination.cursor_query_param in self.request.query_params
+
+    @property
+    def keyset_paginator(self) -> KeysetPagination:
+        if not hasattr(self, '_keyset_paginator'):
+            self._keyset_paginator = KeysetPagination(ordering_field=self.keyset_ordering_field)
+        return self._keyset_paginator
+
+    def paginate_keyset(self, queryset: QuerySet) -> List[Any]:
+        return self.keyset_paginator.paginate_queryset(queryset, self.request)
+
+    async def apaginate_keyset(self, queryset: QuerySet) -> List[Any]:
+        return await self.keyset_paginator.apaginate_queryset(queryset, self.request)
+
+    def get_keyset_paginated_response(self, data) -> Response:
+        return self.keyset_paginator.get_paginated_response(data)
@@ -0,0 +1,314 @@
+import json
+import math
+import queue
+import random
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import Resolver404, resolve
+from rest_framework.test import APIClient
+
+from apps.authentication.dtos.login_dto import LoginDTO
+from apps.authentication.services.auth_service import AuthService
+from apps.core.cache import entity_cache
+from .dataset import ADMIN_PASSWORD, Dataset
+from .scenarios import SCENARIOS, Scenario
+
+COLLECTION_PATH = Path(settings.BASE_DIR) / 'postman' / 'collection.json'
+BENCHMARK_BASELINE_PATH = Path(__file__).with_name('benchmark.json')
+
+# peso por defecto de cada request de la colección: el tráfico real es sobre todo de lectura
+READ_WEIGHT = 4
+WRITE_WEIGHT = 1
+
+# muestras mínimas de una operación para compararla con el baseline
+MIN_SAMPLES = 20
+
+_VARIABLE = re.compile(r'\{\{\w+\}\}')
+
+
+@dataclass(frozen=True)
+class Operation:
+    """Request de la colección de Postman ligada al escenario que la reproduce"""
+    name: str
+    scenario: Scenario
+    query: Tuple[Tuple[str, str], ...] = ()
+    weight: float = 1
+
+    def build(self, dataset: Dataset) -> Dict[str, Any]:
+        """Como Scenario.build(), con los filtros activos de la colección en la query"""
+        request = self.scenario.build(dataset)
+        if self.query:
+            path, _sep, query = request['path'].partition('?')
+            params = dict(parse_qsl(query, keep_blank_values=True))
+            params.update(self.query)
+            request['path'] = f'{path}?{urlencode(params)}'
+        return request
+
+
+@dataclass
+class Sample:
+    operation: str
+    status: int
+    ms: float
+    queries: int
+    cache_hits: int
+    cache_misses: int
+    ok: bool
+
+
+def _walk(items: List[dict], folder: str = ''):
+    for item in items:
+        name = f'{folder}/{item["name"]}' if folder else item['name']
+        if 'item' in item:
+            yield from _walk(item['item'], name)
+        else:
+            yield name, item['request']
+
+
+def load_operations(path: Path = COLLECTION_PATH,
+                    weights: Optional[Dict[str, float]] = None) -> Tuple[List[Operation], List[str]]:
+    """
+    Requests de la colección con su escenario (misma ruta y método).
+
+    Los ids y cuerpos de la colección son los de la base de quien la exportó,
+    así que la ruta y el cuerpo los pone el escenario sobre los datos sembrados;
+    de la colección se toman la mezcla de endpoints y los filtros activos.
+    `weights` admite el nombre de la request ('orders/list') o el del escenario.
+    Devuelve también las requests omitidas, con el motivo.
+    """
+    weights = {name.lower(): weight for name, weight in (weights or {}).items()}
+    with open(path, encoding='utf-8') as f:
+        collection = json.load(f)
+
+    operations, skipped = [], []
+    for name, request in _walk(collection['item']):
+        url = request['url']
+        url_path = _VARIABLE.sub('0', '/' + '/'.join(url.get('path', [])))
+        method = request['method'].lower()
+        try:
+            url_name = resolve(url_path).view_name
+        except Resolver404:
+            skipped.append(f'{name}: {request["method"]} {url_path} no coincide con ninguna ruta')
+            continue
+
+        scenario = next(
+            (s for s in SCENARIOS if s.url_name == url_name and s.method == method), None
+        )
+        if scenario is None:
+            skipped.append(f'{name}: sin escenario para {request["method"]} {url_name}')
+            continue
+
+        default = READ_WEIGHT if method == 'get' else WRITE_WEIGHT
+        weight = weights.get(name.lower(), weights.get(scenario.name, default))
+        if weight <= 0:
+            continue
+        query = tuple(
+            (param['key'], param['value']) for param in url.get('query', []) if not param.get('disabled')
+        )
+        operations.append(Operation(name=name, scenario=scenario, query=query, weight=weight))
+    return operations, skipped
+
+
+def _cache_counters() -> Tuple[int, int]:
+    stats = entity_cache.stats()
+    return stats['local_hits'] + stats['remote_hits'], stats['remote_misses']
+
+
+class Runner:
+    """
+    Reproduce una mezcla de operaciones con `concurrency` hilos, cada uno con
+    su cliente de tests y su conexión a la base de datos.
+
+    Las consultas SQL se cuentan por request en la conexión del hilo. Los
+    aciertos y fallos de caché salen de los contadores globales de
+    entity_cache, así que con más de un hilo pueden incluir los de requests
+    simultáneas.
+    """
+
+    def __init__(self, dataset: Dataset, concurrency: int = 1):
+        self.dataset = dataset
+        self.concurrency = max(1, concurrency)
+        self._token = AuthService().login(LoginDTO(email=dataset.admin.email, password=ADMIN_PASSWORD)).access
+        self._local = threading.local()
+
+    def _client(self) -> APIClient:
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            # los errores cuentan como respuestas 500 en vez de cortar la carga
+            client = APIClient(raise_request_exception=False)
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {self._token}')
+            self._local.client = client
+        return client
+
+    def _execute(self, operation: Operation) -> Sample:
+        request = operation.build(self.dataset)
+        client = self._client()
+        hits, misses = _cache_counters()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = getattr(client, operation.scenario.method)(**request)
+            elapsed = (time.perf_counter() - start) * 1000
+        after_hits, after_misses = _cache_counters()
+        return Sample(
+            operation=operation.name, status=response.status_code, ms=elapsed, queries=len(queries),
+            cache_hits=after_hits - hits, cache_misses=after_misses - misses,
+            ok=response.status_code == operation.scenario.status
+        )
+
+    def run(self, plan: List[Operation]) -> Tuple[List[Sample], float]:
+        """Ejecuta el plan; devuelve las muestras y los segundos de reloj"""
+        samples: List[Sample] = []
+        start = time.perf_counter()
+        if self.concurrency == 1:
+            # en el hilo actual: ve la transacción abierta (tests)
+            samples.extend(self._execute(operation) for operation in plan)
+            return samples, time.perf_counter() - start
+
+        pending = queue.SimpleQueue()
+        for operation in plan:
+            pending.put(operation)
+
+        def worker():
+            try:
+                while True:
+                    try:
+                        operation = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    samples.append(self._execute(operation))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, name=f'benchmark-{i}') for i in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return samples, time.perf_counter() - start
+
+
+def make_plan(operations: List[Operation], size: int, seed: int = 0) -> List[Operation]:
+    """Secuencia de `size` operaciones según los pesos; misma semilla, mismo plan"""
+    if not operations or size <= 0:
+        return []
+    return random.Random(seed).choices(operations, weights=[op.weight for op in operations], k=size)
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Percentil con interpolación lineal entre las muestras ordenadas"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@dataclass
+class Stats:
+    requests: int
+    errors: int
+    p50: float
+    p95: float
+    p99: float
+    rps: float
+    queries: float
+    cache_hits: int
+    cache_misses: int
+    cache_hit_ratio: Optional[float] = field(default=None)
+
+
+def _stats(samples: List[Sample], seconds: float) -> Stats:
+    timings = [sample.ms for sample in samples]
+    hits = sum(sample.cache_hits for sample in samples)
+    misses = sum(sample.cache_misses for sample in samples)
+    return Stats(
+        requests=len(samples),
+        errors=sum(not sample.ok for sample in samples),
+        p50=round(percentile(timings, 50), 2),
+        p95=round(percentile(timings, 95), 2),
+        p99=round(percentile(timings, 99), 2),
+        rps=round(len(samples) / seconds, 2) if seconds else 0.0,
+        queries=round(sum(sample.queries for sample in samples) / len(samples), 2) if samples else 0.0,
+        cache_hits=hits,
+        cache_misses=misses,
+        cache_hit_ratio=round(hits / (hits + misses), 3) if hits + misses else None,
+    )
+
+
+def summarize(samples: List[Sample], seconds: float) -> Dict[str, Any]:
+    """
+    Totales y estadísticas por operación. Las rps por operación son su parte
+    del throughput total, no las de la operación aislada.
+    """
+    by_operation: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_operation.setdefault(sample.operation, []).append(sample)
+    return {
+        'total': asdict(_stats(samples, seconds)),
+        'endpoints': {
+            name: asdict(_stats(group, seconds)) for name, group in sorted(by_operation.items())
+        },
+    }
+
+
+def load_benchmark_baseline(path: Path = BENCHMARK_BASELINE_PATH) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_benchmark_baseline(vendor: str, config: Dict[str, Any], summary: Dict[str, Any],
+                            path: Path = BENCHMARK_BASELINE_PATH) -> None:
+    """Reescribe la sección del motor de base de datos actual"""
+    baseline = load_benchmark_baseline(path)
+    baseline[vendor] = {'config': config, **summary}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def _change(new: float, old: float) -> Optional[float]:
+    return round((new - old) / old * 100, 1) if old else None
+
+
+def compare(summary: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Variación porcentual de latencias, throughput y consultas respecto al
+    baseline; las operaciones con menos de MIN_SAMPLES requests no se comparan.
+    """
+    changes = {}
+    rows = {'total': (summary['total'], baseline.get('total'))}
+    rows.update({
+        name: (stats, baseline.get('endpoints', {}).get(name)) for name, stats in summary['endpoints'].items()
+    })
+    for name, (current, previous) in rows.items():
+        if previous is None or current['requests'] < MIN_SAMPLES:
+            continue
+        changes[name] = {
+            metric: _change(current[metric], previous[metric])
+            for metric in ('p50', 'p95', 'p99', 'rps', 'queries')
+        }
+    return changes
+
+
+def regressions(changes: Dict[str, Dict[str, Optional[float]]], max_regression: float) -> List[str]:
+    """Peor p95 o menos throughput total que el baseline en más de `max_regression` %"""
+    found = []
+    for name, metrics in changes.items():
+        p95 = metrics['p95']
+        if p95 is not None and p95 > max_regression:
+            found.append(f'{name}: p95 {p95:+.1f}%')
+    rps = changes.get('total', {}).get('rps')
+    if rps is not None and -rps > max_regression:
+        found.append(f'total: throughput {rps:+.1f}%')
+    return found
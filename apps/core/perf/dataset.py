@@ -0,0 +1,137 @@
+import csv
+import json
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, List
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils.dateparse import parse_datetime
+
+from apps.menu.models import MenuItem
+from apps.orders.models import Order, OrderItem
+from apps.orders.repositories import OrderRepository
+from apps.reports.models import SalesReport
+from apps.restaurants.models import Restaurant
+from apps.users.models import User
+
+IMPORT_DIR = Path(settings.BASE_DIR) / 'import'
+
+# cada orden de ejemplo se repite con estos estados en cada copia
+ORDER_STATUSES = ('pending', 'completed', 'cancelled', 'pending', 'completed')
+
+ADMIN_EMAIL = 'perf-admin@example.com'
+ADMIN_PASSWORD = 'PerfAdmin123!'
+
+
+@dataclass
+class Dataset:
+    """Datos sembrados por seed(); los escenarios toman de aquí los ids de las URLs"""
+    scale: int
+    admin: User
+    restaurants: List[Restaurant]
+    menu_items: List[MenuItem]
+    users: List[User]
+    orders: List[Order]
+
+
+def _scaled_email(email: str, copy: int) -> str:
+    if copy == 0:
+        return email
+    local, _at, domain = email.partition('@')
+    return f'{local}+{copy}@{domain}'
+
+
+def load_import_files() -> Dict[str, list]:
+    """Contenido de import/restaurant_menu_order.json e import/users.csv"""
+    with open(IMPORT_DIR / 'restaurant_menu_order.json', encoding='utf-8') as f:
+        data = json.load(f)
+    with open(IMPORT_DIR / 'users.csv', encoding='utf-8', newline='') as f:
+        data['users'] = list(csv.DictReader(f, delimiter=';'))
+    return data
+
+
+def seed(scale: int = 1) -> Dataset:
+    """
+    Siembra `scale` copias de los datos de import/. Los ids de los archivos se
+    traducen a los de cada copia; el restaurant_id de users.csv se asigna en
+    módulo a los restaurantes disponibles. Mismo resultado en cada ejecución,
+    salvo ids y fechas de creación.
+    """
+    data = load_import_files()
+    admin = User.objects.create_superuser(
+        email=ADMIN_EMAIL, password=ADMIN_PASSWORD, first_name='Perf', last_name='Admin', phone='5550000'
+    )
+    dataset = Dataset(scale=scale, admin=admin, restaurants=[], menu_items=[], users=[], orders=[])
+
+    for copy in range(scale):
+        suffix = f' {copy + 1}' if copy else ''
+        restaurants = Restaurant.objects.bulk_create([
+            Restaurant(
+                name=f"{row['name']}{suffix}", address=row['address'], rating=Decimal(str(row['rating'])),
+                status=row['status'], category=row['category'],
+                latitude=row['latitude'], longitude=row['longitude']
+            ) for row in data['restaurants']
+        ])
+        restaurant_ids = {row['id']: restaurant.id for row, restaurant in zip(data['restaurants'], restaurants)}
+
+        menu_items = MenuItem.objects.bulk_create([
+            MenuItem(
+                name=row['name'], description=row['description'], price=Decimal(str(row['price'])),
+                preparation_time=row['preparation_time'], category=row['category'],
+                restaurant_id=restaurant_ids[row['restaurant_id']],
+                image=f"menu/item_images/{row['image']}" if row.get('image') else None
+            ) for row in data['menu_items']
+        ])
+        menu_item_ids = {row['id']: item.id for row, item in zip(data['menu_items'], menu_items)}
+
+        users = []
+        for row in data['users']:
+            restaurant_id = None
+            if row['restaurant_id']:
+                restaurant_id = restaurants[(int(row['restaurant_id']) - 1) % len(restaurants)].id
+            user = User(
+                email=_scaled_email(row['email'], copy), first_name=row['first_name'],
+                last_name=row['last_name'], phone=row['phone'] or None,
+                default_address=row['default_address'] or None, restaurant_id=restaurant_id
+            )
+            user.set_password(row['password'])
+            users.append(user)
+        users = User.objects.bulk_create(users)
+
+        orders, order_items = [], []
+        for status in ORDER_STATUSES:
+            for row in data['orders']:
+                orders.append(Order(
+                    customer_id=users[(row['customer_id'] - 1) % len(users)].id,
+                    restaurant_id=restaurant_ids[row['restaurant_id']],
+                    total_amount=Decimal(str(row['total_amount'])),
+                    status=status,
+                    delivery_address=row.get('delivery_address'),
+                    special_instructions=row.get('special_instructions'),
+                    estimated_delivery_time=parse_datetime(row['estimated_delivery_time'])
+                ))
+                order_items.append([
+                    OrderItem(
+                        menu_item_id=menu_item_ids[item['menu_item_id']], quantity=item['quantity'],
+                        subtotal=Decimal(str(item['subtotal'])), note=item.get('note')
+                    ) for item in row['items']
+                ])
+        # mismo camino que la carga masiva: también actualiza el agregado diario
+        OrderRepository().create_batch(orders, order_items)
+
+        dataset.restaurants.extend(restaurants)
+        dataset.menu_items.extend(menu_items)
+        dataset.users.extend(users)
+        dataset.orders.extend(orders)
+
+    return dataset
+
+
+def completed_report(dataset: Dataset) -> SalesReport:
+    """Reporte terminado con su archivo; la descarga lo borra, así que se crea uno por uso"""
+    report = SalesReport.objects.create(
+        restaurant=dataset.restaurants[0], month=1, year=2025, status='completed'
+    )
+    report.report_file.save(f'perf_report_{report.id}.csv', ContentFile(b'date,total\n2025-01-01,10.00\n'))
+    return report
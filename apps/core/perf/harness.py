@@ -0,0 +1,89 @@
+import json
+import os
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.cache import entity_cache
+from .dataset import Dataset
+from .scenarios import Scenario
+
+BASELINE_PATH = Path(__file__).with_name('baseline.json')
+
+
+@dataclass
+class Measurement:
+    status: int
+    queries: int
+    ms: float
+    # consultas de la misma lectura repetida, con la caché ya cargada
+    cached_queries: Optional[int] = None
+
+
+def clear_caches() -> None:
+    cache.clear()
+    entity_cache.local.clear()
+
+
+def _timed_request(client, scenario: Scenario, request: Dict[str, Any]):
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        response = getattr(client, scenario.method)(**request)
+        elapsed = (time.perf_counter() - start) * 1000
+    return response, len(queries), elapsed
+
+
+def measure(client, scenario: Scenario, dataset: Dataset, repeat: int = 5) -> Measurement:
+    """
+    Ejecuta el escenario con las cachés vacías y, si es una lectura, `repeat`
+    veces más. El tiempo es la mediana de las repeticiones (o el de la única
+    ejecución); las consultas, las de la primera request.
+    """
+    clear_caches()
+    request = scenario.build(dataset)
+    response, queries, elapsed = _timed_request(client, scenario, request)
+    measurement = Measurement(status=response.status_code, queries=queries, ms=elapsed)
+
+    if scenario.repeatable and repeat:
+        timings = []
+        for _ in range(repeat):
+            _response, cached_queries, elapsed = _timed_request(client, scenario, request)
+            timings.append(elapsed)
+        measurement.cached_queries = cached_queries
+        measurement.ms = statistics.median(timings)
+    return measurement
+
+
+def load_baseline() -> Dict[str, Any]:
+    if not BASELINE_PATH.exists():
+        return {}
+    with open(BASELINE_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(vendor: str, scale: int, measurements: Dict[str, Measurement]) -> None:
+    """Reescribe la sección del motor de base de datos actual con las mediciones"""
+    baseline = load_baseline()
+    baseline['scale'] = scale
+    baseline[vendor] = {
+        name: {
+            key: round(value, 2) if isinstance(value, float) else value
+            for key, value in asdict(measurement).items() if key != 'status' and value is not None
+        }
+        for name, measurement in sorted(measurements.items())
+    }
+    with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def time_budget(baseline_ms: float) -> float:
+    """Margen sobre el tiempo de referencia: PERF_TIME_FACTOR veces más PERF_TIME_SLACK_MS"""
+    factor = float(os.environ.get('PERF_TIME_FACTOR', 3))
+    slack = float(os.environ.get('PERF_TIME_SLACK_MS', 25))
+    return baseline_ms * factor + slack
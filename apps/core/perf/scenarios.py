@@ -0,0 +1,251 @@
+import itertools
+import json
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.orders.models import Order
+from apps.reports.models import SalesReport
+from apps.restaurants.models import Restaurant
+from apps.users.models import User
+from apps.menu.models import MenuItem
+from .dataset import ADMIN_PASSWORD, Dataset, completed_report
+
+# sufijo único para los datos que crea cada request (emails, nombres)
+_sequence = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    Una request del arnés. `path` y `data` se evalúan antes de medir, por lo
+    que pueden crear lo que la request consume (p. ej. el registro a borrar).
+    """
+    name: str
+    url_name: str
+    path: Callable[[Dataset], str]
+    method: str = 'get'
+    data: Optional[Callable[[Dataset], Any]] = None
+    format: Optional[str] = 'json'
+    content_type: Optional[str] = None
+    status: int = 200
+    # las lecturas se repiten para medir también el camino con caché
+    repeatable: bool = False
+
+    def build(self, dataset: Dataset) -> Dict[str, Any]:
+        """Argumentos para el método del cliente de tests"""
+        kwargs = {'path': self.path(dataset)}
+        if self.data is not None:
+            kwargs['data'] = self.data(dataset)
+        if self.content_type:
+            kwargs['content_type'] = self.content_type
+        elif self.format and self.method != 'get':
+            kwargs['format'] = self.format
+        return kwargs
+
+
+def read(name: str, url_name: str, path: Callable[[Dataset], str]) -> Scenario:
+    return Scenario(name=name, url_name=url_name, path=path, repeatable=True)
+
+
+def _admin_credentials(dataset: Dataset) -> Dict[str, str]:
+    # change-password cambia la clave: cada escenario parte de la original
+    dataset.admin.set_password(ADMIN_PASSWORD)
+    dataset.admin.save(update_fields=['password'])
+    return {'email': dataset.admin.email, 'password': ADMIN_PASSWORD}
+
+
+def _new_password(dataset: Dataset) -> Dict[str, str]:
+    _admin_credentials(dataset)
+    return {'old_password': ADMIN_PASSWORD, 'new_password': 'Changed123!', 'confirm_password': 'Changed123!'}
+
+
+def _refresh_token(dataset: Dataset) -> Dict[str, str]:
+    return {'refresh': str(RefreshToken.for_user(dataset.admin))}
+
+
+def _user_payload(dataset: Dataset) -> Dict[str, Any]:
+    return {
+        'email': f'perf{next(_sequence)}@example.com', 'first_name': 'John', 'last_name': 'Doe',
+        'password': 'SecurePassword123!', 'phone': '+1234567890', 'default_address': '123 Main St',
+        'restaurant_id': dataset.restaurants[0].id,
+    }
+
+
+def _throwaway_user(dataset: Dataset) -> str:
+    user = User.objects.create_user(
+        email=f'throwaway{next(_sequence)}@example.com', password='x', first_name='T', last_name='U', phone='1'
+    )
+    return f'/users/{user.id}/'
+
+
+def _users_csv(dataset: Dataset) -> Dict[str, Any]:
+    batch = next(_sequence)
+    lines = ['email;password;first_name;last_name;phone;default_address;restaurant_id']
+    lines += [f'bulk{batch}_{i}@example.com;Quick29!;Bulk;User;+573205097741;;' for i in range(10)]
+    return {'file': SimpleUploadedFile('users.csv', '\n'.join(lines).encode(), content_type='text/csv')}
+
+
+def _bulk_task(prefix: str) -> Callable[[Dataset], str]:
+    def path(dataset: Dataset) -> str:
+        task_id = f'perf-{next(_sequence)}'
+        cache.set(f'{prefix}_task_{task_id}', {'status': 'completed', 'processed': 10, 'errors': []})
+        url = 'users' if prefix == 'bulk_user' else 'orders'
+        return f'/{url}/bulk/status/{task_id}/'
+    return path
+
+
+def _restaurant_payload(dataset: Dataset) -> Dict[str, Any]:
+    return {
+        'name': f'Dragon Wok perf-{next(_sequence)}', 'address': 'Calle Dragón 321', 'rating': 4.7,
+        'status': 'open', 'category': 'chinese', 'latitude': 39.904202, 'longitude': 116.407394,
+    }
+
+
+def _throwaway_restaurant(dataset: Dataset) -> str:
+    restaurant = Restaurant.objects.create(
+        name=f'Throwaway {next(_sequence)}', address='A', rating=Decimal('4.0'), status='open',
+        category='test', latitude=0, longitude=0
+    )
+    return f'/restaurants/{restaurant.id}/'
+
+
+def _menu_item_payload(dataset: Dataset) -> Dict[str, Any]:
+    return {
+        'name': f'Provoleta {next(_sequence)}', 'description': 'Queso provolone a la parrilla',
+        'price': '10.5', 'preparation_time': '10', 'category': 'entradas',
+        'restaurant_id': str(dataset.restaurants[1].id),
+    }
+
+
+def _throwaway_menu_item(dataset: Dataset) -> str:
+    item = MenuItem.objects.create(
+        name=f'Throwaway {next(_sequence)}', description='T', price=Decimal('1.00'), preparation_time=1,
+        category='test', restaurant=dataset.restaurants[0]
+    )
+    return f'/menu/{item.id}/'
+
+
+def _order_payload(dataset: Dataset) -> Dict[str, Any]:
+    items = [item for item in dataset.menu_items if item.restaurant_id == dataset.restaurants[0].id]
+    return {
+        'customer_id': dataset.users[0].id, 'restaurant_id': dataset.restaurants[0].id,
+        'delivery_address': 'Avenida Libertador 890', 'special_instructions': 'Dejar en portería',
+        'estimated_delivery_time': '2025-04-01T18:30:00',
+        'items': [{'menu_item_id': item.id, 'quantity': 2, 'note': 'Sin cebolla'} for item in items[:2]],
+    }
+
+
+def _orders_ndjson(dataset: Dataset) -> str:
+    return '\n'.join(json.dumps(_order_payload(dataset)) for _ in range(10))
+
+
+def _throwaway_order(dataset: Dataset) -> str:
+    order = Order.objects.create(
+        customer=dataset.users[0], restaurant=dataset.restaurants[0], total_amount=Decimal('1.00')
+    )
+    return f'/orders/{order.id}/'
+
+
+def _pending_report(dataset: Dataset) -> str:
+    report = SalesReport.objects.create(restaurant=dataset.restaurants[0], month=1, year=2025)
+    return f'/reports/{report.id}/status/'
+
+
+def _daily_sales(dataset: Dataset) -> str:
+    today = date.today()
+    return (f'/reports/daily-sales/?restaurant_id={dataset.restaurants[0].id}'
+            f'&start={today - timedelta(days=30)}&end={today}')
+
+
+SCENARIOS: List[Scenario] = [
+    # autenticación
+    Scenario('auth-login', 'auth-login', lambda d: '/auth/login/', 'post', _admin_credentials),
+    Scenario('auth-refresh', 'auth-refresh', lambda d: '/auth/refresh/', 'post', _refresh_token),
+    Scenario('auth-logout', 'auth-logout', lambda d: '/auth/logout/', 'post', _refresh_token),
+    Scenario('auth-change-password', 'auth-change-password', lambda d: '/auth/change-password/',
+             'post', _new_password, status=204),
+
+    # usuarios
+    read('users-list', 'user-list', lambda d: '/users/?page_size=20'),
+    read('users-list-cursor', 'user-list', lambda d: '/users/?cursor=&page_size=20'),
+    read('users-retrieve', 'user-retrieve-update-destroy', lambda d: f'/users/{d.users[0].id}/'),
+    Scenario('users-create', 'user-list', lambda d: '/users/', 'post', _user_payload, status=201),
+    Scenario('users-update', 'user-retrieve-update-destroy', lambda d: f'/users/{d.users[1].id}/', 'put',
+             lambda d: {'first_name': 'Perf', 'default_address': 'Calle Rubio #46'}),
+    Scenario('users-delete', 'user-retrieve-update-destroy', _throwaway_user, 'delete', status=204),
+    Scenario('users-bulk', 'bulk-user-create', lambda d: '/users/bulk/', 'post', _users_csv,
+             format='multipart', status=202),
+    read('users-bulk-status', 'bulk-user-status', _bulk_task('bulk_user')),
+
+    # restaurantes
+    read('restaurants-list', 'restaurants-list', lambda d: '/restaurants/?page_size=20'),
+    read('restaurants-retrieve', 'restaurants-detail', lambda d: f'/restaurants/{d.restaurants[0].id}/'),
+    Scenario('restaurants-create', 'restaurants-list', lambda d: '/restaurants/', 'post',
+             _restaurant_payload, status=201),
+    Scenario('restaurants-update', 'restaurants-detail', lambda d: f'/restaurants/{d.restaurants[1].id}/',
+             'put', lambda d: {'name': f'Sakura Sushi perf-{next(_sequence)}'}),
+    Scenario('restaurants-delete', 'restaurants-detail', _throwaway_restaurant, 'delete', status=204),
+
+    # menú
+    read('menu-list', 'menu-item-list-create', lambda d: '/menu/?page_size=20'),
+    read('menu-list-cursor', 'menu-item-list-create', lambda d: '/menu/?cursor=&page_size=20'),
+    read('menu-retrieve', 'menu-item-detail', lambda d: f'/menu/{d.menu_items[0].id}/'),
+    read('menu-restaurant', 'restaurant-menu-items', lambda d: f'/menu/restaurant/{d.restaurants[0].id}/'),
+    Scenario('menu-create', 'menu-item-list-create', lambda d: '/menu/', 'post', _menu_item_payload,
+             format='multipart', status=201),
+    Scenario('menu-update', 'menu-item-detail', lambda d: f'/menu/{d.menu_items[1].id}/', 'put',
+             lambda d: {'name': 'pizza grande'}),
+    Scenario('menu-delete', 'menu-item-detail', _throwaway_menu_item, 'delete', status=204),
+
+    # órdenes
+    read('orders-list', 'order-list-create', lambda d: '/orders/?page_size=20'),
+    read('orders-list-pending', 'order-list-create', lambda d: '/orders/?status=pending&page_size=20'),
+    read('orders-list-cursor', 'order-list-create', lambda d: '/orders/?cursor=&page_size=20'),
+    read('orders-retrieve', 'order-detail', lambda d: f'/orders/{d.orders[0].id}/'),
+    Scenario('orders-create', 'order-list-create', lambda d: '/orders/', 'post', _order_payload, status=201),
+    Scenario('orders-update', 'order-detail', lambda d: f'/orders/{d.orders[1].id}/', 'put',
+             lambda d: {'status': 'completed'}),
+    Scenario('orders-delete', 'order-detail', _throwaway_order, 'delete', status=204),
+    Scenario('orders-bulk', 'bulk-order-create', lambda d: '/orders/bulk/', 'post', _orders_ndjson,
+             content_type='application/x-ndjson', status=202),
+    read('orders-bulk-status', 'bulk-order-status', _bulk_task('bulk_order')),
+
+    # reportes
+    Scenario('reports-generate', 'generate_report', lambda d: '/reports/generate/', 'post',
+             lambda d: {'restaurant_id': d.restaurants[0].id, 'month': 3, 'year': 2025}, status=202),
+    read('reports-status', 'report_status', _pending_report),
+    Scenario('reports-download', 'download_report', lambda d: f'/reports/{completed_report(d).id}/download/'),
+    read('reports-daily-sales', 'daily_sales', _daily_sales),
+
+    # operación y documentación
+    read('health-db', 'database_health', lambda d: '/health/db/'),
+    read('metrics', 'metrics', lambda d: '/metrics'),
+    read('schema', 'schema', lambda d: '/api/schema/'),
+    read('schema-swagger', 'swagger-ui', lambda d: '/api/schema/swagger-ui/'),
+    read('schema-redoc', 'redoc', lambda d: '/api/schema/redoc/'),
+    read('admin-index', 'admin:index', lambda d: '/admin/'),
+]
+
+
+def url_names(patterns=None, namespace: str = '') -> List[str]:
+    """
+    Nombres de las rutas de config/urls.py. Del admin de Django solo cuenta
+    el índice; las rutas sin nombre (media) no se ejercitan.
+    """
+    names = []
+    for pattern in patterns if patterns is not None else get_resolver().url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace == 'admin':
+                names.append('admin:index')
+                continue
+            inner = f'{namespace}{pattern.namespace}:' if pattern.namespace else namespace
+            names.extend(url_names(pattern.url_patterns, inner))
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.append(f'{namespace}{pattern.name}')
+    return names
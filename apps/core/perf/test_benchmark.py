@@ -0,0 +1,50 @@
+import json
+from django.test import TestCase
+
+from .benchmark import COLLECTION_PATH, Runner, load_operations, make_plan, percentile, summarize
+from .dataset import seed
+
+
+class BenchmarkTest(TestCase):
+    """Runner de carga de la colección de Postman (manage.py benchmark)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = seed(1)
+
+    def test_collection_requests_have_scenarios(self):
+        """Test que cada request de la colección se reproduce con un escenario"""
+        operations, skipped = load_operations()
+        self.assertEqual(skipped, [])
+
+        with open(COLLECTION_PATH, encoding='utf-8') as f:
+            content = f.read()
+        self.assertEqual(len(operations), content.count('"request": {'))
+        orders = next(op for op in operations if op.name == 'orders/list')
+        self.assertIn('status=pending', orders.build(self.dataset)['path'])
+        print("✅ Test colección de Postman del benchmark válido")
+
+    def test_weights_and_plan(self):
+        """Test que los pesos excluyen requests y la mezcla es reproducible"""
+        operations, _skipped = load_operations(weights={'orders/create': 0, 'users-list': 10})
+        names = {op.name for op in operations}
+        self.assertNotIn('orders/create', names)
+        self.assertEqual(next(op for op in operations if op.name == 'users/list').weight, 10)
+        self.assertEqual(make_plan(operations, 50, seed=3), make_plan(operations, 50, seed=3))
+        print("✅ Test pesos del benchmark válido")
+
+    def test_run_summary(self):
+        """Test que una corrida reporta percentiles, consultas y caché por endpoint"""
+        operations, _skipped = load_operations()
+        samples, seconds = Runner(self.dataset).run(make_plan(operations, 40))
+
+        summary = summarize(samples, seconds)
+        total = summary['total']
+        self.assertEqual(total['requests'], 40)
+        self.assertEqual(total['errors'], 0, [(s.operation, s.status) for s in samples if not s.ok])
+        self.assertLessEqual(total['p50'], total['p95'])
+        self.assertLessEqual(total['p95'], total['p99'])
+        self.assertEqual(sum(stats['requests'] for stats in summary['endpoints'].values()), 40)
+        json.dumps(summary)
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2.5)
+        print("✅ Test resumen del benchmark válido")
@@ -0,0 +1,76 @@
+import os
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from .dataset import seed
+from .harness import load_baseline, measure, save_baseline, time_budget
+from .scenarios import SCENARIOS, url_names
+
+
+class EndpointBudgetTest(TestCase):
+    """
+    Presupuesto de consultas y de tiempo por endpoint, según apps/core/perf/baseline.json.
+
+    Variables de entorno:
+    - PERF_CHECK_TIME=1: comprueba también los tiempos. Dependen de la máquina, así que
+      la corrida por defecto (y la de CI) solo comprueba las consultas.
+    - PERF_SCALE: copias de los datos de import/ (por defecto, la escala del baseline).
+      Las consultas se comprueban a cualquier escala; los tiempos, solo a la del baseline.
+    - PERF_REPEAT: repeticiones de cada lectura (5).
+    - PERF_TIME_FACTOR / PERF_TIME_SLACK_MS: margen sobre el tiempo de referencia.
+    - PERF_UPDATE_BASELINE=1: reescribe el baseline del motor actual en vez de comprobarlo.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.baseline = load_baseline()
+        cls.scale = int(os.environ.get('PERF_SCALE', cls.baseline.get('scale', 2)))
+        cls.dataset = seed(cls.scale)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.dataset.admin)
+
+    def test_every_url_has_a_scenario(self):
+        """Test que cada ruta de config/urls.py tiene al menos un escenario"""
+        missing = set(url_names()) - {scenario.url_name for scenario in SCENARIOS}
+        self.assertFalse(missing, f"Rutas sin escenario en apps/core/perf/scenarios.py: {sorted(missing)}")
+        print("✅ Test cobertura de rutas del arnés válido")
+
+    def test_endpoints_within_budget(self):
+        """Test que ningún endpoint supera sus consultas ni su tiempo de referencia"""
+        vendor = connection.vendor
+        budgets = self.baseline.get(vendor, {})
+        update = os.environ.get('PERF_UPDATE_BASELINE') == '1'
+        check_time = os.environ.get('PERF_CHECK_TIME') == '1' and self.scale == self.baseline.get('scale')
+        repeat = int(os.environ.get('PERF_REPEAT', 5))
+
+        measurements, failures = {}, []
+        for scenario in SCENARIOS:
+            # el admin de Django usa la sesión, que invalida cualquier cambio de clave
+            self.client.force_login(self.dataset.admin)
+            measurement = measure(self.client, scenario, self.dataset, repeat)
+            measurements[scenario.name] = measurement
+            if measurement.status != scenario.status:
+                failures.append(f"{scenario.name}: status {measurement.status}, se esperaba {scenario.status}")
+                continue
+            if update:
+                continue
+
+            budget = budgets.get(scenario.name)
+            if budget is None:
+                failures.append(f"{scenario.name}: sin baseline para {vendor} (PERF_UPDATE_BASELINE=1)")
+                continue
+            if measurement.queries > budget['queries']:
+                failures.append(f"{scenario.name}: {measurement.queries} consultas, presupuesto {budget['queries']}")
+            if measurement.cached_queries is not None and measurement.cached_queries > budget.get('cached_queries', 0):
+                failures.append(f"{scenario.name}: {measurement.cached_queries} consultas con caché, "
+                                f"presupuesto {budget.get('cached_queries', 0)}")
+            if check_time and measurement.ms > time_budget(budget['ms']):
+                failures.append(f"{scenario.name}: {measurement.ms:.1f} ms, referencia {budget['ms']} ms")
+
+        if update and not failures:
+            save_baseline(vendor, self.scale, measurements)
+        self.assertFalse(failures, '\n'.join(failures))
+        print("✅ Test presupuesto de endpoints válido")
@@ -0,0 +1,73 @@
+from typing import Dict, FrozenSet, Iterable
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db.models import Q
+
+from apps.core.cache import tagged_cache
+
+PERMISSIONS_TAG = 'permissions'
+PERMISSIONS_TIMEOUT = 60 * 60  # 1 hora
+
+
+def get_permissions_version() -> int:
+    """Versión actual de la asignación de grupos y permisos"""
+    return tagged_cache.get_versions([PERMISSIONS_TAG])[PERMISSIONS_TAG]
+
+
+def invalidate_permissions() -> None:
+    """Invalida los permisos compilados de todos los usuarios"""
+    tagged_cache.invalidate(PERMISSIONS_TAG)
+
+
+def user_claims_tag(user_id: int) -> str:
+    return f'user:{user_id}'
+
+
+def get_claims_versions(user_id: int) -> Dict[str, int]:
+    """Versiones que un token debe llevar para que sus claims sigan vigentes"""
+    tag = user_claims_tag(user_id)
+    versions = tagged_cache.get_versions([PERMISSIONS_TAG, tag])
+    return {
+        'perm_version': versions[PERMISSIONS_TAG],
+        'user_version': versions[tag],
+    }
+
+
+def invalidate_user_claims(user_id: int) -> None:
+    """Invalida los claims emitidos para un usuario (desactivación, cambio de rol)"""
+    tagged_cache.invalidate(user_claims_tag(user_id))
+
+
+def get_user_permissions(user_id: int) -> FrozenSet[str]:
+    """
+    Conjunto compilado de permisos ('app_label.codename') de un usuario,
+    propios y heredados de sus grupos, cacheado por id y versión de permisos.
+    """
+    cache_key = f'user_perms_{user_id}_{get_permissions_version()}'
+    permissions = cache.get(cache_key)
+
+    if permissions is None:
+        rows = Permission.objects.filter(
+            Q(group__user__id=user_id) | Q(user__id=user_id)
+        ).values_list('content_type__app_label', 'codename').distinct()
+        permissions = frozenset(f'{app_label}.{codename}' for app_label, codename in rows)
+        cache.set(cache_key, permissions, PERMISSIONS_TIMEOUT)
+
+    return permissions
+
+
+def has_permissions(request, perms: Iterable[str]) -> bool:
+    """Verifica los permisos del usuario de la petición sin consultar la base de datos"""
+    user = request.user
+    if not user.is_active:
+        return False
+    if user.is_superuser:
+        return True
+
+    # el conjunto se compila una sola vez por petición
+    permissions = getattr(request, '_compiled_permissions', None)
+    if permissions is None:
+        permissions = get_user_permissions(user.id)
+        request._compiled_permissions = permissions
+
+    return all(perm in permissions for perm in perms)
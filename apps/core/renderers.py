@@ -0,0 +1,80 @@
+import math
+import re
+from rest_framework.renderers import JSONRenderer
+from apps.core.instrumentation import timed_serialization
+
+try:
+    import orjson
+except ImportError:  # sin orjson se usa JSONRenderer
+    orjson = None
+
+# posibles exponentes; empezar por un literal hace la búsqueda mucho más rápida
+_EXPONENT = re.compile(rb'e-?[0-9]')
+
+
+def _float_mismatch(ret: bytes) -> bool:
+    """Si hay floats que orjson escribe distinto que json: con exponente o menores a 1e-4"""
+    if b'0.0000' in ret:
+        return True
+    for match in _EXPONENT.finditer(ret):
+        start = match.start()
+        if start and ret[start - 1] in b'0123456789':
+            return True
+    return False
+
+
+def _has_non_finite(data) -> bool:
+    """Si hay floats NaN o infinitos: orjson los escribe como null y DRF los rechaza"""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer que codifica con orjson cuando está instalado. La salida es
+    idéntica byte a byte a la de JSONRenderer: con indentación, ensure_ascii,
+    floats que orjson escribe distinto o tipos que no soporta se usa el
+    JSONRenderer de DRF. Las fechas, Decimal y textos traducibles pasan por
+    el encoder de DRF. NaN e infinito también van al JSONRenderer, que los
+    rechaza con el mismo error.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed_serialization():
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        if (orjson is None or data is None or self.ensure_ascii or not self.compact or not self.strict
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            )
+        except TypeError:
+            # enteros de más de 64 bits, claves no str, etc.
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if _float_mismatch(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # solo si hay algún null se recorren los datos buscando NaN o infinito
+        if b'null' in ret and _has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # mismos escapes que JSONRenderer para los separadores de línea de JavaScript
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -1,5 +1,7 @@
 from django.db import transaction
-from typing import Type, Dict, Any, Optional
+from django.db.models import QuerySet
+from typing import Type, Dict, Any, Callable, Iterable, Optional
+from apps.core.instrumentation import atimed_cache_get, atimed_cache_set, timed_cache_get, timed_cache_set
 from .base import BaseRepository, T
 
 class DjangoRepository(BaseRepository[T]):
@@ -18,6 +20,29 @@ class DjangoRepository(BaseRepository[T]):
             queryset = queryset.filter(**filters)
         return queryset
     
+    def project(self, queryset: QuerySet, fields: Iterable[str]) -> QuerySet:
+        """
+        El mismo queryset devolviendo tuplas con nombre con las columnas pedidas
+        que existen en el modelo: sin instanciar modelos ni los JOINs de
+        select_related. Los nombres que no son columnas (relaciones) se omiten.
+        """
+        columns = {field.attname for field in self.model_class._meta.concrete_fields}
+        return queryset.values_list(*[name for name in fields if name in columns], named=True)
+    
+    # lecturas y escrituras de caché medidas en las métricas de la request
+    # (apps.core.instrumentation); fuera de una request muestreada, llamada directa
+    def _cache_get(self, getter: Callable, *args: Any) -> Any:
+        return timed_cache_get(getter, *args)
+
+    async def _acache_get(self, getter: Callable, *args: Any) -> Any:
+        return await atimed_cache_get(getter, *args)
+
+    def _cache_set(self, setter: Callable, *args: Any) -> None:
+        timed_cache_set(setter, *args)
+
+    async def _acache_set(self, setter: Callable, *args: Any) -> None:
+        await atimed_cache_set(setter, *args)
+    
     @transaction.atomic
     def create(self, entity: T) -> T:
         entity.save()
@@ -0,0 +1,216 @@
+import datetime
+import decimal
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from django.conf import settings
+from django.db.models.manager import BaseManager
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from apps.core.dtos import DTOBatch
+from apps.core.instrumentation import timed_serialization
+
+# funciones ya compiladas por clase de serializer
+_compiled: Dict[type, Optional[Callable[[Any], dict]]] = {}
+_compiled_batch: Dict[type, Optional[Callable[[DTOBatch], List[dict]]]] = {}
+
+_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _field_expression(field: serializers.Field, var: str, namespace: Dict[str, Any]) -> str:
+    """
+    Expresión equivalente a field.to_representation(var) para un valor no nulo.
+    Los tipos que no se especializan llaman al propio campo.
+    """
+    name = f'f_{len(namespace)}'
+    namespace[name] = field
+    fallback = f'{name}.to_representation({var})'
+    field_type = type(field)
+
+    if field_type is serializers.IntegerField:
+        return f'int({var})'
+    if field_type in (serializers.CharField, serializers.EmailField):
+        return f'str({var})'
+    if field_type is serializers.FloatField:
+        return f'float({var})'
+    if field_type is serializers.BooleanField:
+        return f'({var} if {var}.__class__ is bool else {fallback})'
+
+    if field_type is serializers.DecimalField:
+        coerce = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+        if not coerce or field.localize or field.normalize_output or field.decimal_places is None:
+            return fallback
+        context = decimal.getcontext().copy()
+        if field.max_digits is not None:
+            context.prec = field.max_digits
+        namespace[f'{name}_exp'] = decimal.Decimal('.1') ** field.decimal_places
+        namespace[f'{name}_ctx'] = context
+        namespace[f'{name}_rounding'] = field.rounding
+        value = f'({var} if {var}.__class__ is Decimal else Decimal(str({var}).strip()))'
+        return (f"'{{:f}}'.format({value}.quantize({name}_exp, "
+                f"rounding={name}_rounding, context={name}_ctx))")
+
+    if field_type is serializers.DateTimeField:
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        # con USE_TZ o zona propia el campo convierte la fecha: se delega
+        if (not isinstance(output_format, str) or output_format.lower() == ISO_8601
+                or hasattr(field, 'timezone') or settings.USE_TZ):
+            return fallback
+        naive = f'{var}.__class__ is datetime and {var}.tzinfo is None'
+        if output_format == _DATETIME_FORMAT:
+            # isoformat da el mismo texto sin strftime (que no rellena años < 1000)
+            return f"({var}.isoformat(' ', 'seconds') if {naive} and {var}.year >= 1000 else {fallback})"
+        namespace[f'{name}_format'] = output_format
+        return f'({var}.strftime({name}_format) if {naive} else {fallback})'
+
+    if (field_type in (serializers.ListSerializer, CompiledListSerializer) and isinstance(field.child, serializers.Serializer)
+            and compile_serializer(type(field.child))):
+        namespace[f'{name}_child'] = compile_serializer(type(field.child))
+        items = f'({var}.all() if isinstance({var}, BaseManager) else {var})'
+        return f'[{name}_child(item) for item in {items}]'
+
+    if isinstance(field, serializers.Serializer) and compile_serializer(field_type):
+        namespace[f'{name}_nested'] = compile_serializer(field_type)
+        return f'{name}_nested({var})'
+
+    return fallback
+
+
+def _compilable(serializer_class: type) -> bool:
+    """Solo serializers que usan to_representation de DRF y campos con source simple"""
+    if serializer_class.to_representation not in (
+            serializers.Serializer.to_representation, CompiledSerializerMixin.to_representation):
+        return False
+    return all(
+        field.source != '*' and '.' not in field.source
+        for field in serializer_class()._readable_fields
+    )
+
+
+def _entries(serializer_class: type, namespace: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    """(source, var, entrada del dict) por cada campo legible, en orden"""
+    entries = []
+    for index, field in enumerate(serializer_class()._readable_fields):
+        var = f'v{index}'
+        entries.append((field.source, var, f'{field.field_name!r}: None if {var} is None else '
+                                            f'{_field_expression(field, var, namespace)},'))
+    return entries
+
+
+def _namespace() -> Dict[str, Any]:
+    return {
+        'Decimal': decimal.Decimal,
+        'datetime': datetime.datetime,
+        'BaseManager': BaseManager,
+    }
+
+
+def _exec(lines: List[str], serializer_class: type, namespace: Dict[str, Any]) -> Callable:
+    exec(compile('\n'.join(lines), f'<compiled {serializer_class.__name__}>', 'exec'), namespace)
+    return namespace['to_representation']
+
+
+def compile_serializer(serializer_class: type) -> Optional[Callable[[Any], dict]]:
+    """
+    Genera, una vez por clase, una función que produce el mismo dict que
+    serializer_class().to_representation(instance) para objetos con atributos
+    (DTOs). Devuelve None si la clase no se puede compilar.
+    """
+    if serializer_class in _compiled:
+        return _compiled[serializer_class]
+    if not _compilable(serializer_class):
+        _compiled[serializer_class] = None
+        return None
+
+    namespace = _namespace()
+    entries = _entries(serializer_class, namespace)
+    lines = ['def to_representation(instance):']
+    lines.extend(f'    {var} = instance.{source}' for source, var, _entry in entries)
+    lines.append('    return {')
+    lines.extend(f'        {entry}' for _source, _var, entry in entries)
+    lines.append('    }')
+
+    _compiled[serializer_class] = _exec(lines, serializer_class, namespace)
+    return _compiled[serializer_class]
+
+
+def compile_batch_serializer(serializer_class: type) -> Optional[Callable[[DTOBatch], List[dict]]]:
+    """
+    Como compile_serializer(), pero la función recibe un DTOBatch y devuelve la
+    lista de dicts recorriendo sus columnas, sin construir un DTO por fila.
+    Lanza KeyError si al lote le falta la columna de algún campo.
+    """
+    if serializer_class in _compiled_batch:
+        return _compiled_batch[serializer_class]
+    if not _compilable(serializer_class):
+        _compiled_batch[serializer_class] = None
+        return None
+
+    namespace = _namespace()
+    entries = _entries(serializer_class, namespace)
+    lines = [
+        'def to_representation(batch):',
+        '    columns = batch.columns',
+        '    return [',
+        '        {',
+    ]
+    lines.extend(f'            {entry}' for _source, _var, entry in entries)
+    lines.append('        }')
+    variables = ', '.join(var for _source, var, _entry in entries)
+    sources = ', '.join(f'columns[{source!r}]' for source, _var, _entry in entries)
+    lines.append(f'        for {variables}, in zip({sources})')
+    lines.append('    ]')
+
+    _compiled_batch[serializer_class] = _exec(lines, serializer_class, namespace)
+    return _compiled_batch[serializer_class]
+
+
+class CompiledListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer de los serializers compilados: un DTOBatch se serializa por
+    columnas; cualquier otra colección, elemento a elemento.
+    """
+
+    @property
+    def data(self):
+        with timed_serialization():
+            return super().data
+
+    def to_representation(self, data):
+        if isinstance(data, DTOBatch) and not self.context:
+            compiled = compile_batch_serializer(type(self.child))
+            if compiled is not None:
+                try:
+                    return compiled(data)
+                except (KeyError, AttributeError):
+                    # columna o atributo ausente: se resuelve fila a fila
+                    pass
+        return super().to_representation(data)
+
+
+class CompiledSerializerMixin:
+    """
+    Serializa objetos (DTOs) con la función compilada de la clase en vez de
+    recorrer los campos de DRF uno por uno. El resultado es el mismo dict.
+
+    Diccionarios (p. ej. validated_data), serializers con contexto y valores
+    que el camino compilado no cubre pasan por to_representation de DRF.
+    Con many=True se usa CompiledListSerializer, que acepta un DTOBatch.
+    """
+
+    class Meta:
+        list_serializer_class = CompiledListSerializer
+
+    @property
+    def data(self):
+        with timed_serialization():
+            return super().data
+
+    def to_representation(self, instance):
+        compiled = compile_serializer(type(self))
+        if compiled is None or self.context or isinstance(instance, Mapping):
+            return super().to_representation(instance)
+        try:
+            return compiled(instance)
+        except AttributeError:
+            # atributo ausente: DRF decide entre default, None u omitir el campo
+            return super().to_representation(instance)
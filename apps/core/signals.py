@@ -0,0 +1,42 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .cache import invalidate_on_commit
+from .permissions import invalidate_permissions, invalidate_user_claims
+
+
+def _permissions_changed(sender, **kwargs):
+    if kwargs.get('action', 'post_').startswith('post_'):
+        invalidate_permissions()
+
+
+def _user_claims_saved(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Invalida los claims emitidos si cambió la actividad o el rol del usuario,
+    aunque el cambio no pase por UserRepository (admin, shell, otro servicio).
+    Compara contra los valores cargados de la base (User.from_db); un campo
+    que no se cargó se trata como cambiado.
+    """
+    if created or raw:
+        return
+    # solo los campos presentes: leer uno diferido haría una consulta
+    current = {field: instance.__dict__[field] for field in sender.CLAIM_FIELDS if field in instance.__dict__}
+    loaded = getattr(instance, '_loaded_claims', {})
+    if any(field not in loaded or loaded[field] != value for field, value in current.items()):
+        invalidate_on_commit(invalidate_user_claims, instance.pk)
+    instance._loaded_claims = {**loaded, **current}
+
+
+def connect_permission_signals():
+    """Invalida los permisos compilados cuando cambian grupos o permisos (admin, shell, etc.)"""
+    User = get_user_model()
+    m2m_changed.connect(_permissions_changed, sender=Group.permissions.through,
+                        dispatch_uid='permissions_group_permissions')
+    m2m_changed.connect(_permissions_changed, sender=User.groups.through,
+                        dispatch_uid='permissions_user_groups')
+    m2m_changed.connect(_permissions_changed, sender=User.user_permissions.through,
+                        dispatch_uid='permissions_user_permissions')
+    post_delete.connect(_permissions_changed, sender=Group,
+                        dispatch_uid='permissions_group_delete')
+    post_save.connect(_user_claims_saved, sender=User, dispatch_uid='claims_user_saved')
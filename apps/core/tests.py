@@ -1,3 +1,470 @@
-from django.test import TestCase
+import pickle
+import re
+from dataclasses import FrozenInstanceError, asdict
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from celery.signals import before_task_publish
+from prometheus_client.parser import text_string_to_metric_families
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.request import Request
 
-# Create your tests here.
+from apps.core import db_router
+from apps.core.cache import entity_cache, tagged_cache, LocalCache
+from apps.core.dtos import DTOBatch
+from apps.core.instrumentation import current_metrics
+from apps.core.metrics import cache_key_family, task_stats
+from apps.core.db_router import ReadYourWritesMiddleware, ReplicaRouter, mark_written, read_db
+from apps.core.pagination import AsyncPageNumberPagination, KeysetPagination
+from apps.core.permissions import get_user_permissions
+from apps.core.renderers import FastJSONRenderer
+from apps.orders.dtos import OrderDTO, OrderItemDTO, SlottedOrderDTO
+from apps.orders.serializers import OrderDTOSerializer
+from apps.restaurants.dtos.restaurant_dto import RestaurantDTO
+from apps.restaurants.serializers.restaurant_serializers import RestaurantDTOSerializer
+from apps.restaurants.models import Restaurant
+from apps.users.models import User
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TaggedCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidate_tag_expires_dependent_entries(self):
+        """Test que invalidar una etiqueta expira solo las entradas que dependen de ella"""
+        tagged_cache.set('orders_page_a', 'a', ['orders:restaurant:1'])
+        tagged_cache.set('orders_page_b', 'b', ['orders:restaurant:2'])
+
+        tagged_cache.invalidate('orders:restaurant:1')
+
+        self.assertIsNone(tagged_cache.get('orders_page_a'))
+        self.assertEqual(tagged_cache.get('orders_page_b'), 'b')
+        print("✅ Test invalidación por etiqueta válido")
+
+    def test_invalidation_during_read_is_not_cached_as_fresh(self):
+        """Test que una invalidación entre la lectura y el set deja la entrada vencida"""
+        versions = tagged_cache.get_versions(['orders'])
+        # otra request escribe mientras esta consulta la base
+        tagged_cache.invalidate('orders')
+        tagged_cache.set('orders_page_a', 'stale', versions)
+
+        self.assertIsNone(tagged_cache.get('orders_page_a'))
+        print("✅ Test invalidación durante la lectura válido")
+
+    def test_evicted_version_does_not_revive_entries(self):
+        """Test que una versión expulsada no revive entradas antiguas"""
+        tagged_cache.set('orders_page_a', 'a', ['orders'])
+        cache.delete('tag_version_orders')
+
+        tagged_cache.invalidate('orders')
+
+        self.assertIsNone(tagged_cache.get('orders_page_a'))
+        print("✅ Test versión expulsada válido")
+
+
+class LocalCacheTest(TestCase):
+    def test_lru_eviction_and_counters(self):
+        """Test que el LRU local expulsa la entrada menos usada y cuenta aciertos/fallos"""
+        local = LocalCache(max_entries=2, timeout=30)
+        local.set('restaurant_1', 1)
+        local.set('restaurant_2', 2)
+        local.get('restaurant_1')
+        local.set('restaurant_3', 3)
+
+        self.assertIsNone(local.get('restaurant_2'))
+        self.assertEqual(local.get('restaurant_1'), 1)
+        self.assertEqual(local.stats(), {'size': 2, 'hits': 2, 'misses': 1, 'evictions': 1})
+        print("✅ Test LRU local válido")
+
+    def test_expired_entries_are_misses(self):
+        """Test que las entradas vencidas se consideran fallos"""
+        local = LocalCache(max_entries=10, timeout=0)
+        local.set('menu_item_1', 1)
+
+        self.assertIsNone(local.get('menu_item_1'))
+        print("✅ Test TTL local válido")
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PermissionCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name='Customer')
+        self.permission = Permission.objects.get(codename='view_order')
+        self.group.permissions.add(self.permission)
+        self.user = User.objects.create_user(
+            email='customer@example.com', first_name='Ana', last_name='Perez', phone='123'
+        )
+        self.user.groups.add(self.group)
+
+    def test_group_change_invalidates_compiled_permissions(self):
+        """Test que cambiar los permisos de un grupo invalida el conjunto compilado"""
+        self.assertIn('orders.view_order', get_user_permissions(self.user.id))
+
+        with self.assertNumQueries(0):
+            get_user_permissions(self.user.id)
+
+        self.group.permissions.remove(self.permission)
+
+        self.assertNotIn('orders.view_order', get_user_permissions(self.user.id))
+        print("✅ Test cache de permisos válido")
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        for i in range(5):
+            Restaurant.objects.create(
+                name=f'Restaurant {i}', address=f'{i} Test St', rating=4.0,
+                status='open', category='italian', latitude=10.0 + i, longitude=-10.0
+            )
+        self.factory = APIRequestFactory()
+
+    def _page(self, **params):
+        paginator = KeysetPagination()
+        request = Request(self.factory.get('/restaurants/', params))
+        page = paginator.paginate_queryset(Restaurant.objects.all(), request)
+        return paginator, [restaurant.id for restaurant in page]
+
+    def test_cursor_walks_all_rows_without_duplicates(self):
+        """Test que recorrer los cursores devuelve todas las filas una sola vez"""
+        paginator, ids = self._page(cursor='', page_size=2, include_total='true')
+        self.assertEqual(paginator.total, 5)
+
+        while paginator.next_cursor:
+            paginator, page_ids = self._page(cursor=paginator.next_cursor, page_size=2)
+            ids += page_ids
+
+        expected = list(Restaurant.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        print("✅ Test paginación por cursor válido")
+
+    def test_page_size_is_clamped(self):
+        """Test que page_size se limita a [1, max_page_size]"""
+        for page_size, expected in (('0', 1), ('-3', 1), ('1000', KeysetPagination.max_page_size)):
+            paginator, ids = self._page(cursor='', page_size=page_size)
+            self.assertEqual(paginator.page_size, expected)
+            self.assertEqual(len(ids), min(expected, 5))
+        self.assertIsNotNone(self._page(cursor='', page_size='0')[0].next_cursor)
+        print("✅ Test límites de page_size válido")
+
+    def test_async_paginators_match_sync(self):
+        """Test que la paginación async devuelve las mismas páginas que la síncrona"""
+        queryset = Restaurant.objects.order_by('name')
+        request = Request(self.factory.get('/restaurants/', {'page': 2, 'page_size': 2}))
+
+        sync_paginator, async_paginator = AsyncPageNumberPagination(), AsyncPageNumberPagination()
+        sync_paginator.page_size = async_paginator.page_size = 2
+        page = async_to_sync(async_paginator.apaginate_queryset)(queryset, request)
+        self.assertEqual(page, sync_paginator.paginate_queryset(queryset, request))
+        self.assertEqual(async_paginator.page.paginator.count, 5)
+        self.assertEqual(async_paginator.page.number, 2)
+
+        request = Request(self.factory.get('/restaurants/', {'cursor': '', 'page_size': 2}))
+        sync_keyset, async_keyset = KeysetPagination(), KeysetPagination()
+        page = async_to_sync(async_keyset.apaginate_queryset)(queryset, request)
+        self.assertEqual(page, sync_keyset.paginate_queryset(queryset, request))
+        self.assertEqual(async_keyset.next_cursor, sync_keyset.next_cursor)
+        print("✅ Test paginación async válido")
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ReplicaRoutingTest(SimpleTestCase):
+    """Decisiones de read_db con una réplica simulada (sin transacción abierta)"""
+
+    def setUp(self):
+        cache.clear()
+        db_router._health.clear()
+        self.lag = 0
+        patches = [
+            mock.patch.object(db_router, 'replica_alias', return_value='replica'),
+            mock.patch.object(db_router, 'replica_lag', side_effect=lambda alias: self.lag),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_written_keys_and_lag_fall_back_to_primary(self):
+        """Test que las claves escritas y el retraso de la réplica llevan las lecturas al primario"""
+        self.assertEqual(read_db('order_1'), 'replica')
+
+        mark_written('order_1')
+        self.assertEqual(read_db('order_1'), 'default')
+        self.assertEqual(read_db('order_2'), 'replica')
+
+        db_router._health.clear()
+        self.lag = 60
+        self.assertEqual(read_db('order_2'), 'default')
+        print("✅ Test lecturas de réplica válido")
+
+    def test_tag_invalidation_does_not_pin_readers(self):
+        """Test que invalidar etiquetas globales no lleva a todos los lectores al primario"""
+        tagged_cache.invalidate('orders', 'orders:restaurant:1')
+
+        self.assertEqual(read_db(), 'replica')
+        self.assertEqual(read_db('orders'), 'replica')
+        print("✅ Test etiquetas sin fijar al primario válido")
+
+    def test_user_reads_own_writes(self):
+        """Test que tras escribir, las lecturas del usuario van al primario"""
+        user = SimpleNamespace(pk=7, is_authenticated=True)
+        factory = RequestFactory()
+        seen = []
+
+        def write_view(request):
+            request.user = user
+            seen.append(read_db())
+            ReplicaRouter().db_for_write(None)
+            seen.append(read_db())
+            return HttpResponse(status=201)
+
+        def read_view(request):
+            request.user = user
+            seen.append(read_db())
+            return HttpResponse()
+
+        ReadYourWritesMiddleware(write_view)(factory.post('/orders/'))
+        ReadYourWritesMiddleware(read_view)(factory.get('/orders/'))
+        self.assertEqual(seen, ['replica', 'default', 'default'])
+
+        # otro usuario sigue leyendo de la réplica
+        user = SimpleNamespace(pk=8, is_authenticated=True)
+        ReadYourWritesMiddleware(read_view)(factory.get('/orders/'))
+        self.assertEqual(seen[-1], 'replica')
+        print("✅ Test read-your-writes válido")
+
+
+class DatabaseHealthViewTest(TestCase):
+    def test_reports_health_and_connection_metrics(self):
+        """Test que el endpoint de salud reporta cada base de datos y sus conexiones"""
+        admin = User.objects.create_user(
+            email='admin@example.com', first_name='Admin', last_name='User', phone='5550000', is_staff=True
+        )
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        response = client.get('/health/db/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'ok')
+        self.assertTrue(response.data['databases']['default']['healthy'])
+        self.assertIn('connections_opened', response.data['databases']['default']['pool'])
+        print("✅ Test salud de base de datos válido")
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class RequestMetricsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        entity_cache.local.clear()
+        self.restaurant = Restaurant.objects.create(
+            name='Metrics', address='Calle 1', rating=4.5, status='open', category='test', latitude=0, longitude=0
+        )
+        admin = User.objects.create_superuser(
+            email='admin@example.com', password='x', first_name='Admin', last_name='User', phone='5550000'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def _timing(self, response):
+        """Cabecera Server-Timing como {métrica: (dur, desc)}"""
+        entries = re.findall(r'(\w+);dur=([\d.]+)(?:;desc="([^"]*)")?', response['Server-Timing'])
+        return {name: (float(dur), desc) for name, dur, desc in entries}
+
+    @override_settings(REQUEST_METRICS={'SAMPLE_RATE': 1})
+    def test_server_timing_and_log(self):
+        """Test que una request muestreada publica consultas, caché y serialización"""
+        with self.assertLogs('apps.core.instrumentation', 'INFO') as logs:
+            first = self.client.get(f'/restaurants/{self.restaurant.id}/')
+        second = self.client.get(f'/restaurants/{self.restaurant.id}/')
+
+        self.assertEqual(first.status_code, 200)
+        timing = self._timing(first)
+        self.assertEqual(set(timing), {'db', 'cache', 'serialize', 'total'})
+        self.assertEqual(timing['cache'][1], '0 hits, 1 misses')
+        self.assertNotEqual(timing['db'][1], '0 queries')
+        self.assertGreater(timing['serialize'][0], 0)
+        self.assertGreaterEqual(timing['total'][0], timing['db'][0])
+        # la segunda lectura sale de la caché de entidades, sin consultas
+        self.assertEqual(self._timing(second)['cache'][1], '1 hits, 0 misses')
+        self.assertEqual(self._timing(second)['db'][1], '0 queries')
+
+        self.assertEqual(len(logs.records), 1)
+        payload = logs.records[0].request_metrics
+        self.assertEqual(payload['view'], 'restaurants-detail')
+        self.assertEqual(payload['status'], 200)
+        self.assertEqual(payload['cache_misses'], 1)
+        self.assertIsNone(current_metrics())
+        print("✅ Test métricas por request válido")
+
+    @override_settings(REQUEST_METRICS={'SAMPLE_RATE': 0})
+    def test_unsampled_request_has_no_header(self):
+        """Test que las requests fuera de la muestra no llevan Server-Timing"""
+        response = self.client.get(f'/restaurants/{self.restaurant.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Server-Timing'))
+        print("✅ Test muestreo de métricas válido")
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class MetricsEndpointTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        entity_cache.local.clear()
+        task_stats.clear()
+        self.restaurant = Restaurant.objects.create(
+            name='Metrics', address='Calle 1', rating=4.5, status='open', category='test', latitude=0, longitude=0
+        )
+        admin = User.objects.create_superuser(
+            email='admin@example.com', password='x', first_name='Admin', last_name='User', phone='5550000'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def _samples(self, response):
+        """{(nombre, etiquetas ordenadas): valor} del texto de Prometheus"""
+        return {
+            (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+            for family in text_string_to_metric_families(response.content.decode())
+            for sample in family.samples
+        }
+
+    def test_metrics_exposes_requests_cache_and_celery(self):
+        """Test que /metrics expone latencias por ruta, aciertos de caché y tareas de Celery"""
+        self.client.get(f'/restaurants/{self.restaurant.id}/')
+        self.client.get(f'/restaurants/{self.restaurant.id}/')
+        response = self.client.post(
+            '/reports/generate/', {'restaurant_id': self.restaurant.id, 'month': 3, 'year': 2025}, format='json'
+        )
+        self.assertEqual(response.status_code, 202)
+        before_task_publish.send(sender='apps.users.tasks.process_bulk_users', body=(), headers={})
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        samples = self._samples(response)
+
+        latency = ('http_request_duration_seconds_count', (('method', 'GET'), ('view', 'restaurants-detail')))
+        self.assertGreaterEqual(samples[latency], 2)
+        self.assertIn(('cache_hit_ratio', (('family', 'restaurant'),)), samples)
+        report = (('task', 'apps.reports.tasks.generate_sales_report'),)
+        self.assertEqual(samples[('celery_task_duration_seconds_count', report)], 1)
+        self.assertEqual(samples[('celery_task_queued', (('task', 'apps.users.tasks.process_bulk_users'),))], 1)
+        self.assertIn(('db_connections_opened_total', (('alias', 'default'),)), samples)
+        print("✅ Test endpoint de métricas válido")
+
+    def test_cache_key_families(self):
+        """Test que las claves de caché se agrupan por entidad"""
+        self.assertEqual(cache_key_family('order_15'), 'order')
+        self.assertEqual(cache_key_family('menu_item_3'), 'menu_item')
+        self.assertEqual(cache_key_family('user_7'), 'user')
+        self.assertEqual(cache_key_family('user_email_a@b.com'), 'user_email')
+        self.assertEqual(cache_key_family('user_perms_7_3'), 'user_perms')
+        self.assertEqual(cache_key_family('archived_order_15'), 'archived_order')
+        self.assertEqual(cache_key_family('menu_items_all'), 'other')
+        self.assertEqual(cache_key_family({'status': 'pending'}), 'other')
+        print("✅ Test familias de claves de caché válido")
+
+    @override_settings(METRICS={'TOKEN': None})
+    def test_metrics_without_token_requires_admin(self):
+        """Test que sin token configurado /metrics solo responde a administradores"""
+        self.assertIn(APIClient().get('/metrics').status_code, (401, 403))
+        customer = User.objects.create_user(
+            email='cliente@example.com', first_name='Test', last_name='Cliente', phone='5550001'
+        )
+        client = APIClient()
+        client.force_authenticate(customer)
+        self.assertEqual(client.get('/metrics').status_code, 403)
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+        print("✅ Test métricas sin token válido")
+
+    @override_settings(METRICS={'TOKEN': 'scrape-secret'})
+    def test_metrics_token(self):
+        """Test que con token configurado /metrics lo exige"""
+        self.assertEqual(APIClient().get('/metrics').status_code, 403)
+        response = APIClient().get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+        print("✅ Test token de métricas válido")
+
+
+class CompiledSerializerTest(SimpleTestCase):
+    def _render_both(self, serializer_class, instances):
+        # con contexto el serializer usa el camino de DRF campo por campo
+        drf = JSONRenderer().render(serializer_class(instances, many=True, context={'drf': True}).data)
+        fast = FastJSONRenderer().render(serializer_class(instances, many=True).data)
+        return drf, fast
+
+    def test_output_is_byte_identical_to_drf(self):
+        """Test que el serializer compilado y el renderer rápido producen los mismos bytes que DRF"""
+        now = datetime(2025, 3, 4, 5, 6, 7, 891011)
+        orders = [
+            OrderDTO(
+                customer_id=1, restaurant_id=2, total_amount=2.675, status='pending', id=1,
+                delivery_address='Calle 3er piso \u2028 ñ', created_at=now, updated_at=now,
+                estimated_delivery_time=now.replace(tzinfo=timezone.utc),
+                order_items=[OrderItemDTO(menu_item_id=5, quantity=2, subtotal=1.005, id=9, order_id=1,
+                                          created_at=datetime(999, 1, 2, 3, 4, 5), updated_at=now)]
+            ),
+            OrderDTO(customer_id=3, restaurant_id=2, total_amount=10, status='completed', is_active='false'),
+        ]
+        drf, fast = self._render_both(OrderDTOSerializer, orders)
+        self.assertEqual(fast, drf)
+
+        restaurants = [
+            RestaurantDTO(name='R', address='A', rating=4.5, status='open', category='pizza',
+                          latitude=1e-05, longitude=1e16, created_at=now),
+            RestaurantDTO(name='R', address='A', rating=4.5, status='open', category='pizza',
+                          latitude=-34.6037, longitude=-58.3816),
+        ]
+        for instances in (restaurants, restaurants[1:]):
+            drf, fast = self._render_both(RestaurantDTOSerializer, instances)
+            self.assertEqual(fast, drf)
+        print("✅ Test serialización compilada válido")
+
+    def test_non_finite_floats_fail_like_drf(self):
+        """Test que NaN e infinito se rechazan igual que en el JSONRenderer de DRF"""
+        for value in (float('nan'), float('inf'), float('-inf')):
+            data = {'id': 1, 'image': None, 'rows': [{'rating': value}]}
+            with self.assertRaises(ValueError) as drf:
+                JSONRenderer().render(data)
+            with self.assertRaises(ValueError) as fast:
+                FastJSONRenderer().render(data)
+            self.assertEqual(str(fast.exception), str(drf.exception))
+        self.assertEqual(FastJSONRenderer().render({'image': None}), JSONRenderer().render({'image': None}))
+        print("✅ Test floats no finitos válido")
+
+    def test_batch_output_matches_rows(self):
+        """Test que un DTOBatch se serializa igual que la lista de DTOs que representa"""
+        now = datetime(2025, 3, 4, 5, 6, 7)
+        orders = [
+            OrderDTO(customer_id=1, restaurant_id=2, total_amount=2.675, status='pending', id=1,
+                     created_at=now, order_items=[OrderItemDTO(menu_item_id=5, quantity=2, subtotal=1.5)]),
+            OrderDTO(customer_id=3, restaurant_id=2, total_amount=10, status='completed', order_items=[]),
+        ]
+        batch = DTOBatch.from_objects(SlottedOrderDTO, orders)
+        self.assertEqual(len(batch), 2)
+        self.assertEqual([asdict(dto) for dto in batch], [asdict(order) for order in orders])
+        self.assertEqual(asdict(batch[1]), asdict(orders[1]))
+
+        drf = JSONRenderer().render(OrderDTOSerializer(orders, many=True, context={'drf': True}).data)
+        self.assertEqual(FastJSONRenderer().render(OrderDTOSerializer(batch, many=True).data), drf)
+        self.assertEqual(JSONRenderer().render(OrderDTOSerializer(batch, many=True, context={'drf': True}).data), drf)
+        self.assertEqual(FastJSONRenderer().render(OrderDTOSerializer(DTOBatch(OrderDTO, {
+            field: [] for field in batch.columns
+        }), many=True).data), b'[]')
+
+        with self.assertRaises(ValueError):
+            DTOBatch(OrderDTO, {**batch.columns, 'status': ['pending']})
+        # la variante del lote es inmutable y sin __dict__; el DTO original sigue mutable
+        with self.assertRaises(FrozenInstanceError):
+            batch[0].status = 'completed'
+        self.assertFalse(hasattr(batch[0], '__dict__'))
+        self.assertEqual(pickle.loads(pickle.dumps(batch[0])), batch[0])
+        orders[0].status = 'completed'
+        print("✅ Test lote columnar de DTOs válido")
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import DatabaseHealthView
+
+
+urlpatterns = [
+    path('db/', DatabaseHealthView.as_view(), name='database_health'),
+]
@@ -1,3 +1,65 @@
-from django.shortcuts import render
+import hmac
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from rest_framework import status
+from rest_framework.permissions import BasePermission, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from .db_pool import check_database, pool_stats
+from .metrics import registry
+
+
+class DatabaseHealthView(APIView):
+    """Estado de cada base de datos y métricas del pool de conexiones de este proceso"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        databases = {}
+        for alias in connections:
+            databases[alias] = {**check_database(alias), 'pool': pool_stats(alias)}
+
+        healthy = all(database['healthy'] for database in databases.values())
+        return Response(
+            {
+                'status': 'ok' if healthy else 'error',
+                'process': settings.DB_PROCESS_TYPE,
+                'databases': databases,
+            },
+            status=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+
+def _metrics_token():
+    return getattr(settings, 'METRICS', {}).get('TOKEN')
+
+
+class HasMetricsToken(BasePermission):
+    """
+    Con METRICS['TOKEN'] configurado exige 'Authorization: Bearer <token>'
+    (bearer_token del scrape de Prometheus). Sin token, solo administradores
+    autenticados: /metrics nunca queda abierto por omisión.
+    """
+
+    def has_permission(self, request, view):
+        token = _metrics_token()
+        if not token:
+            return IsAdminUser().has_permission(request, view)
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        return hmac.compare_digest(header.encode(), f'Bearer {token}'.encode())
+
+
+class MetricsView(APIView):
+    """Métricas de la API, la caché, Celery y las conexiones en formato de texto de Prometheus"""
+    permission_classes = [HasMetricsToken]
+
+    def get_authenticators(self):
+        # Prometheus no tiene JWT: con token propio lo valida HasMetricsToken
+        if _metrics_token():
+            return []
+        return super().get_authenticators()
+
+    def get(self, request):
+        return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
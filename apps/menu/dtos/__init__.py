@@ -1,3 +1,3 @@
-from .menu_dtos import MenuItemDTO, MenuItemCreateDTO, MenuItemUpdateDTO
+from .menu_dtos import MenuItemDTO, MenuItemCreateDTO, MenuItemUpdateDTO, SlottedMenuItemDTO
 
-__all__ = ['MenuItemDTO', 'MenuItemCreateDTO', 'MenuItemUpdateDTO']
+__all__ = ['MenuItemDTO', 'MenuItemCreateDTO', 'MenuItemUpdateDTO', 'SlottedMenuItemDTO']
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime
 
+from apps.core.dtos import slotted
+
 
 @dataclass
 class MenuItemDTO:
@@ -19,6 +21,9 @@ class MenuItemDTO:
     updated_at: Optional[datetime] = None
 
 
+SlottedMenuItemDTO = slotted(MenuItemDTO)
+
+
 @dataclass
 class MenuItemCreateDTO:
     name: str
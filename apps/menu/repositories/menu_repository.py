@@ -1,7 +1,9 @@
 from apps.core.repositories.django_repository import DjangoRepository
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from django.db import models, transaction
 from django.core.cache import cache
+from apps.core.cache import Snapshot, tagged_cache, entity_cache, invalidate_on_commit
+from apps.core.db_router import aread_db, read_db
 from ..models import MenuItem
 
 
@@ -9,53 +11,107 @@ class MenuItemRepository(DjangoRepository[MenuItem]):
     def __init__(self):
         super().__init__(MenuItem)
         self.cache_timeout = 60 * 10  # 10 minutos
+        # el snapshot se regenera con cada escritura: puede vivir mucho más
+        self.snapshot_timeout = 60 * 60 * 24  # 24 horas
     
     def get_by_id(self, id: int) -> Optional[MenuItem]:
         cache_key = f'menu_item_{id}'
-        menu_item = cache.get(cache_key)
+        menu_item = self._cache_get(entity_cache.get, cache_key)
         
         if not menu_item:
-            menu_item = MenuItem.objects.select_related('restaurant').filter(id=id).first()
+            menu_item = MenuItem.objects.using(read_db(cache_key)).select_related('restaurant').filter(id=id).first()
             if menu_item:
-                cache.set(cache_key, menu_item, self.cache_timeout)
+                self._cache_set(entity_cache.set, cache_key, menu_item, self.cache_timeout)
         
         return menu_item
     
     def get_by_restaurant_id(self, restaurant_id: int) -> models.QuerySet:
         """Obtener todos los ítems de menú de un restaurante específico"""
         cache_key = f'menu_items_restaurant_{restaurant_id}'
-        queryset = cache.get(cache_key)
+        queryset = self._cache_get(tagged_cache.get, cache_key)
         
         if queryset is None:
-            queryset = MenuItem.objects.filter(restaurant_id=restaurant_id, is_active=True)
-            cache.set(cache_key, queryset, self.cache_timeout)
+            tag = f'menu_items:restaurant:{restaurant_id}'
+            queryset = MenuItem.objects.using(read_db()).filter(restaurant_id=restaurant_id, is_active=True)
+            self._cache_set(tagged_cache.set, cache_key, queryset, [tag], self.cache_timeout)
         
         return queryset
     
+    async def aget_by_restaurant_id(self, restaurant_id: int) -> List[MenuItem]:
+        """get_by_restaurant_id() para vistas async; comparte la entrada de caché"""
+        cache_key = f'menu_items_restaurant_{restaurant_id}'
+        items = await self._acache_get(tagged_cache.aget, cache_key)
+        
+        if items is None:
+            tag = f'menu_items:restaurant:{restaurant_id}'
+            # la lista se lee antes del set: versiones previas a la consulta
+            versions = await tagged_cache.aget_versions([tag])
+            queryset = MenuItem.objects.using(await aread_db()).filter(restaurant_id=restaurant_id, is_active=True)
+            items = [item async for item in queryset]
+            await self._acache_set(tagged_cache.aset, cache_key, items, versions, self.cache_timeout)
+        
+        return items
+    
     def get_all(self, filters: Optional[Dict[str, Any]] = None) -> models.QuerySet:
         # Construir clave de caché basada en filtros
         filter_str = '_'.join(f"{k}:{v}" for k, v in sorted(filters.items())) if filters else "all"
         cache_key = f'menu_items_{filter_str}'
         
-        queryset = cache.get(cache_key)
+        queryset = self._cache_get(tagged_cache.get, cache_key)
         if queryset is None:
             # Optimizar consulta con select_related
-            queryset = MenuItem.objects.select_related('restaurant').all()
+            queryset = MenuItem.objects.using(read_db()).select_related('restaurant').all()
             
             # Aplicar filtros si existen
             if filters:
-                queryset = super().apply_filters(queryset, filters)
+                queryset = queryset.filter(**filters)
                 
-            cache.set(cache_key, queryset, self.cache_timeout)
+            self._cache_set(tagged_cache.set, cache_key, queryset, ['menu_items'], self.cache_timeout)
         
         return queryset
     
+    async def aget_all(self) -> models.QuerySet:
+        """Queryset base del listado para vistas async; se evalúa con el ORM async"""
+        return MenuItem.objects.using(await aread_db()).select_related('restaurant').all()
+    
+    def get_menu_snapshot(self, restaurant_id: int) -> Optional[Snapshot]:
+        """Menú del restaurante ya serializado y comprimido"""
+        return self._cache_get(tagged_cache.get, f'menu_snapshot_restaurant_{restaurant_id}')
+    
+    async def aget_menu_snapshot(self, restaurant_id: int) -> Optional[Snapshot]:
+        return await self._acache_get(tagged_cache.aget, f'menu_snapshot_restaurant_{restaurant_id}')
+    
+    def menu_snapshot_versions(self, restaurant_id: int) -> Dict[str, int]:
+        """
+        Versiones con las que guardar el snapshot; se toman antes de leer el
+        menú para que una escritura durante la lectura lo deje vencido
+        """
+        # misma etiqueta que la lista: cualquier escritura del restaurante lo invalida
+        return tagged_cache.get_versions([f'menu_items:restaurant:{restaurant_id}'])
+    
+    async def amenu_snapshot_versions(self, restaurant_id: int) -> Dict[str, int]:
+        return await tagged_cache.aget_versions([f'menu_items:restaurant:{restaurant_id}'])
+    
+    def save_menu_snapshot(self, restaurant_id: int, snapshot: Snapshot, versions: Dict[str, int]) -> None:
+        self._cache_set(
+            tagged_cache.set, f'menu_snapshot_restaurant_{restaurant_id}', snapshot,
+            versions, self.snapshot_timeout
+        )
+    
+    async def asave_menu_snapshot(self, restaurant_id: int, snapshot: Snapshot, versions: Dict[str, int]) -> None:
+        await self._acache_set(
+            tagged_cache.aset, f'menu_snapshot_restaurant_{restaurant_id}', snapshot,
+            versions, self.snapshot_timeout
+        )
+    
+    def _invalidate_lists(self, restaurant_id: int) -> None:
+        invalidate_on_commit(tagged_cache.invalidate, 'menu_items', f'menu_items:restaurant:{restaurant_id}')
+    
     @transaction.atomic
     def create(self, entity: MenuItem) -> MenuItem:
         entity.save()
         
-        cache.delete_pattern('menu_items_*')
-        cache.delete_pattern(f'menu_items_restaurant_{entity.restaurant_id}')
+        self._invalidate_lists(entity.restaurant_id)
     
         return entity
     
@@ -79,9 +135,8 @@ class MenuItemRepository(DjangoRepository[MenuItem]):
         entity.save(update_fields=changed_fields + ['updated_at'])
         
         # invalidar cache
-        cache.delete(f'menu_item_{entity.id}')
-        cache.delete_pattern('menu_items_*')
-        cache.delete_pattern(f'menu_items_restaurant_{entity.restaurant_id}')
+        invalidate_on_commit(entity_cache.delete, f'menu_item_{entity.id}')
+        self._invalidate_lists(entity.restaurant_id)
         
         return entity
     
@@ -98,9 +153,8 @@ class MenuItemRepository(DjangoRepository[MenuItem]):
             item.save(update_fields=['is_active', 'updated_at'])
             
             # Invalidar caché
-            cache.delete(f'menu_item_{id}')
-            cache.delete_pattern('menu_items_*')
-            cache.delete_pattern(f'menu_items_restaurant_{restaurant_id}')
+            invalidate_on_commit(entity_cache.delete, f'menu_item_{id}')
+            self._invalidate_lists(restaurant_id)
             
             return True
         except MenuItem.DoesNotExist:
@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from django.utils.translation import gettext as _
 
+from apps.core.serializers import CompiledSerializerMixin
 
-class MenuItemDTOSerializer(serializers.Serializer):
+
+class MenuItemDTOSerializer(CompiledSerializerMixin, serializers.Serializer):
     id = serializers.IntegerField(required=False)
     name = serializers.CharField(max_length=255)
     description = serializers.CharField()
@@ -1,10 +1,11 @@
-from typing import Optional, Dict, Any, List, Union
+import logging
+from typing import Optional, Dict, Any, Iterable, List, Union
 from django.db import models, transaction
 from django.utils.translation import gettext as _
 from rest_framework.exceptions import NotFound, ValidationError
 
 from ..repositories import MenuItemRepository
-from ..dtos import MenuItemDTO, MenuItemCreateDTO, MenuItemUpdateDTO
+from ..dtos import MenuItemDTO, MenuItemCreateDTO, MenuItemUpdateDTO, SlottedMenuItemDTO
 from ..models import MenuItem
 from ..serializers import (
     MenuItemDTOSerializer, 
@@ -13,7 +14,12 @@ from ..serializers import (
 )
 from ..filters import MenuItemFilter
 
+from apps.core.cache import Snapshot
+from apps.core.dtos import DTOBatch, dto_fields
 from apps.core.exceptions import ValidationException
+from apps.core.renderers import FastJSONRenderer
+
+logger = logging.getLogger(__name__)
 
 
 class MenuService:
@@ -46,13 +52,61 @@ class MenuService:
         filter_set = MenuItemFilter(filters or {}, queryset=base_queryset)
         filtered_queryset = filter_set.qs
         
-        return filtered_queryset.order_by('category', 'name')
+        return self.repository.project(filtered_queryset.order_by('category', 'name'), dto_fields(MenuItemDTO))
     
     def get_restaurant_menu(self, restaurant_id: int) -> List[MenuItemDTO]:
         """Obtiene todos los ítems de menú de un restaurante específico"""
         items = self.repository.get_by_restaurant_id(restaurant_id)
         return [self._to_dto(item) for item in items]
     
+    async def alist_menu_items(self, filters: Optional[Dict[str, Any]] = None) -> models.QuerySet:
+        """list_menu_items() para vistas async; el filtrado no consulta la base"""
+        base_queryset = await self.repository.aget_all()
+        filter_set = MenuItemFilter(filters or {}, queryset=base_queryset)
+        return self.repository.project(filter_set.qs.order_by('category', 'name'), dto_fields(MenuItemDTO))
+    
+    async def aget_restaurant_menu(self, restaurant_id: int) -> List[MenuItemDTO]:
+        """get_restaurant_menu() para vistas async"""
+        items = await self.repository.aget_by_restaurant_id(restaurant_id)
+        return [self._to_dto(item) for item in items]
+    
+    def _menu_body(self, restaurant_id: int, items) -> bytes:
+        """Cuerpo JSON del menú, idéntico al de RestaurantMenuItemsAPIView"""
+        dto_items = self._to_dto_batch(items)
+        return FastJSONRenderer().render({
+            'items': MenuItemDTOSerializer(dto_items, many=True).data,
+            'total': len(dto_items),
+            'restaurant_id': restaurant_id
+        })
+    
+    def refresh_menu_snapshot(self, restaurant_id: int) -> Snapshot:
+        """Regenera el snapshot del menú del restaurante"""
+        versions = self.repository.menu_snapshot_versions(restaurant_id)
+        items = self.repository.get_by_restaurant_id(restaurant_id)
+        snapshot = Snapshot.build(self._menu_body(restaurant_id, items))
+        self.repository.save_menu_snapshot(restaurant_id, snapshot, versions)
+        return snapshot
+    
+    async def aget_menu_snapshot(self, restaurant_id: int) -> Snapshot:
+        """Snapshot del menú; si no está en caché se arma y se guarda"""
+        snapshot = await self.repository.aget_menu_snapshot(restaurant_id)
+        if snapshot is None:
+            versions = await self.repository.amenu_snapshot_versions(restaurant_id)
+            items = await self.repository.aget_by_restaurant_id(restaurant_id)
+            snapshot = Snapshot.build(self._menu_body(restaurant_id, items))
+            await self.repository.asave_menu_snapshot(restaurant_id, snapshot, versions)
+        return snapshot
+    
+    def _refresh_menu_snapshot_on_commit(self, restaurant_id: int) -> None:
+        """Regenera el snapshot cuando la escritura se confirma, antes del próximo sondeo"""
+        def refresh():
+            try:
+                self.refresh_menu_snapshot(restaurant_id)
+            except Exception as e:
+                # el snapshot ya quedó invalidado: se arma en la próxima lectura
+                logger.warning(f"No se pudo regenerar el menú del restaurante {restaurant_id}: {str(e)}")
+        transaction.on_commit(refresh)
+    
     @transaction.atomic
     def create_menu_item(self, menu_item_data: MenuItemCreateDTO) -> Dict:
         """Crea un nuevo ítem de menú"""
@@ -64,6 +118,7 @@ class MenuService:
             # Crear ítem de menú
             menu_item = self._to_model(menu_item_data)
             created_item = self.repository.create(menu_item)
+            self._refresh_menu_snapshot_on_commit(created_item.restaurant_id)
             
             # Retornar DTO serializado
             return MenuItemDTOSerializer(self._to_dto(created_item)).data
@@ -112,6 +167,7 @@ class MenuService:
             
             # Guardar cambios
             updated_item = self.repository.update(existing)
+            self._refresh_menu_snapshot_on_commit(existing.restaurant_id)
             
             return MenuItemDTOSerializer(self._to_dto(updated_item)).data
             
@@ -126,9 +182,15 @@ class MenuService:
                 "message": str(e)
             })
     
+    @transaction.atomic
     def delete_menu_item(self, menu_item_id: int) -> bool:
         """Elimina (marca como inactivo) un ítem de menú"""
-        return self.repository.delete(menu_item_id)
+        menu_item = self.repository.get_by_id(menu_item_id)
+        if not menu_item or not self.repository.delete(menu_item_id):
+            return False
+        
+        self._refresh_menu_snapshot_on_commit(menu_item.restaurant_id)
+        return True
     
     def _to_dto(self, model: MenuItem) -> MenuItemDTO:
         """Convierte un modelo MenuItem a su DTO"""
@@ -147,6 +209,19 @@ class MenuService:
             updated_at=model.updated_at
         )
     
+    def _to_dto_batch(self, instances: Iterable[Any]) -> DTOBatch[SlottedMenuItemDTO]:
+        """Convierte items del menú (modelos o filas proyectadas) a un lote columnar de DTOs"""
+        return DTOBatch.from_objects(SlottedMenuItemDTO, instances, {
+            'price': float,
+            'image': self._image_url,
+        })
+    
+    def _image_url(self, image) -> Optional[str]:
+        """URL de la imagen; en las filas proyectadas llega solo el nombre del archivo"""
+        if not image:
+            return None
+        return MenuItem._meta.get_field('image').storage.url(str(image))
+    
     def _to_model(self, dto: Union[MenuItemCreateDTO, MenuItemUpdateDTO, MenuItemDTO]) -> MenuItem:
         """Convierte un DTO a modelo MenuItem"""
         model = MenuItem()
@@ -0,0 +1,91 @@
+import gzip
+import json
+from decimal import Decimal
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.menu.dependencies import get_menu_service
+from apps.menu.models import MenuItem
+from apps.menu.serializers import MenuItemDTOSerializer
+from apps.restaurants.models import Restaurant
+from apps.users.models import User
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class RestaurantMenuSnapshotTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.service = get_menu_service()
+        self.restaurant = Restaurant.objects.create(
+            name='Test Restaurant', address='123 Test St', rating=4.5, status='open',
+            category='italian', latitude=10.0, longitude=-10.0
+        )
+        self.pizza = MenuItem.objects.create(
+            name='Pizza', description='Pizza', price=Decimal('12.50'), preparation_time=20,
+            category='main', restaurant=self.restaurant
+        )
+        admin = User.objects.create_user(
+            email='admin@example.com', first_name='Admin', last_name='User', phone='5550000', is_superuser=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+        self.url = f'/menu/restaurant/{self.restaurant.id}/'
+
+    def test_snapshot_body_etag_and_not_modified(self):
+        """Test que el snapshot conserva el cuerpo, se comprime y responde 304 con el ETag vigente"""
+        items = [self.service._to_dto(self.pizza)]
+        expected = JSONRenderer().render({
+            'items': MenuItemDTOSerializer(items, many=True).data,
+            'total': 1,
+            'restaurant_id': self.restaurant.id
+        })
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, expected)
+        etag = response['ETag']
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), expected)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        print("✅ Test snapshot de menú válido")
+
+    def test_write_regenerates_snapshot(self):
+        """Test que una escritura regenera el snapshot y cambia el ETag"""
+        etag = self.client.get(self.url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.update_menu_item(self.pizza.id, {'price': '14.00'})
+
+        # ya regenerado: la próxima lectura no arma el menú
+        snapshot = self.service.repository.get_menu_snapshot(self.restaurant.id)
+        self.assertIsNotNone(snapshot)
+        self.assertEqual(json.loads(snapshot.body)['items'][0]['price'], '14.00')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], snapshot.etag())
+        print("✅ Test regeneración de snapshot válido")
+
+    def test_write_during_snapshot_build_is_not_cached(self):
+        """Test que un snapshot armado mientras otra request escribe no queda en caché"""
+        repository = self.service.repository
+        read_menu = repository.get_by_restaurant_id
+
+        def read_then_write(restaurant_id):
+            items = list(read_menu(restaurant_id))
+            repository._invalidate_lists(restaurant_id)
+            return items
+
+        with mock.patch.object(repository, 'get_by_restaurant_id', side_effect=read_then_write):
+            self.service.refresh_menu_snapshot(self.restaurant.id)
+
+        self.assertIsNone(repository.get_menu_snapshot(self.restaurant.id))
+        print("✅ Test snapshot con escritura concurrente válido")
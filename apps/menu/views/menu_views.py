@@ -1,3 +1,5 @@
+from adrf.views import APIView as AsyncAPIView
+from asgiref.sync import sync_to_async
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -7,6 +9,7 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 
 from apps.core.decorators import permission_required
 from apps.core.exceptions import ValidationException
+from apps.core.pagination import AsyncPageNumberPagination, KeysetPaginationMixin
 
 from ..dependencies import get_menu_service
 from ..serializers import MenuItemDTOSerializer
@@ -16,14 +19,15 @@ from ..dtos import MenuItemCreateDTO
 service = get_menu_service()
 
 
-class MenuItemListCreateAPIView(APIView):
-    pagination_class = PageNumberPagination
+class MenuItemListCreateAPIView(KeysetPaginationMixin, AsyncAPIView):
+    """Listado async (ORM async); la creación se ejecuta en un hilo con sync_to_async"""
+    pagination_class = AsyncPageNumberPagination
     parser_classes = (MultiPartParser, FormParser, JSONParser)
     
     @property
     def paginator(self):
         if not hasattr(self, '_paginator'):
-            self._paginator = PageNumberPagination()
+            self._paginator = AsyncPageNumberPagination()
             # Permitir personalizar el tamaño de página
             page_size = self.request.query_params.get('page_size')
             if page_size:
@@ -33,10 +37,10 @@ class MenuItemListCreateAPIView(APIView):
                     pass  # usa tamaño por defecto
         return self._paginator
     
-    def paginate_queryset(self, queryset):
+    async def apaginate_queryset(self, queryset):
         if self.paginator is None:
             return None
-        return self.paginator.paginate_queryset(queryset, self.request, view=self)
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
     
     def get_paginated_response(self, data):
         assert self.paginator is not None
@@ -48,7 +52,7 @@ class MenuItemListCreateAPIView(APIView):
         })
     
     @permission_required(['menu.view_menuitem'])
-    def get(self, request):
+    async def get(self, request):
         try:
             # Extraer filtros de los parámetros de consulta
             filters = request.query_params.dict()
@@ -56,20 +60,31 @@ class MenuItemListCreateAPIView(APIView):
                 filters.pop('page')
             if 'page_size' in filters:
                 filters.pop('page_size')
+            if 'cursor' in filters:
+                filters.pop('cursor')
+            if 'include_total' in filters:
+                filters.pop('include_total')
             
             # Obtener queryset filtrado
-            queryset = service.list_menu_items(filters=filters)
+            queryset = await service.alist_menu_items(filters=filters)
+            
+            # Paginación por cursor (?cursor=)
+            if self.use_keyset_pagination():
+                page = await self.apaginate_keyset(queryset)
+                dto_items = service._to_dto_batch(page)
+                serializer = MenuItemDTOSerializer(dto_items, many=True)
+                return self.get_keyset_paginated_response(serializer.data)
             
             # Aplicar paginación
-            page = self.paginate_queryset(queryset)
+            page = await self.apaginate_queryset(queryset)
             if page is not None:
-                # Convertir a DTOs y serializar
-                dto_items = [service._to_dto(item) for item in page]
+                # Convertir a un lote de DTOs y serializar
+                dto_items = service._to_dto_batch(page)
                 serializer = MenuItemDTOSerializer(dto_items, many=True)
                 return self.get_paginated_response(serializer.data)
             
             # Si la paginación está desactivada
-            dto_items = [service._to_dto(item) for item in queryset]
+            dto_items = service._to_dto_batch([item async for item in queryset])
             serializer = MenuItemDTOSerializer(dto_items, many=True)
             return Response({
                 'items': serializer.data,
@@ -78,6 +93,11 @@ class MenuItemListCreateAPIView(APIView):
                 'page_size': len(dto_items)
             }, status=status.HTTP_200_OK)
             
+        except NotFound as e:
+            return Response({
+                'status': 'error',
+                'message': str(e)
+            }, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({
                 'status': 'error',
@@ -85,7 +105,7 @@ class MenuItemListCreateAPIView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     @permission_required(['menu.add_menuitem'])
-    def post(self, request):
+    async def post(self, request):
         try:
             # Convertir datos de entrada a DTO
             # Necesitamos manejar la imagen de forma especial si está presente
@@ -105,7 +125,7 @@ class MenuItemListCreateAPIView(APIView):
             )
             
             # Crear ítem de menú
-            response_data = service.create_menu_item(menu_item_data)
+            response_data = await sync_to_async(service.create_menu_item)(menu_item_data)
             
             return Response(response_data, status=status.HTTP_201_CREATED)
             
@@ -188,7 +208,7 @@ class MenuItemRetrieveUpdateDestroyAPIView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class RestaurantMenuItemsAPIView(APIView):
+class RestaurantMenuItemsAPIView(AsyncAPIView):
     pagination_class = PageNumberPagination
     
     @property
@@ -219,10 +239,15 @@ class RestaurantMenuItemsAPIView(APIView):
         })
     
     @permission_required(['menu.view_menuitem'])
-    def get(self, request, restaurant_id):
+    async def get(self, request, restaurant_id):
         try:
+            # JSON: snapshot precomprimido con ETag; un acierto no serializa nada
+            if request.accepted_renderer.format == 'json':
+                snapshot = await service.aget_menu_snapshot(restaurant_id)
+                return snapshot.to_response(request)
+            
             # Obtener menú de un restaurante específico
-            menu_items = service.get_restaurant_menu(restaurant_id)
+            menu_items = await service.aget_restaurant_menu(restaurant_id)
             
             # Serializar los DTOs
             serializer = MenuItemDTOSerializer(menu_items, many=True)
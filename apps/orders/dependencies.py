@@ -1,12 +1,14 @@
-from .repositories.order_repository import OrderRepository, OrderItemRepository
+from .repositories.order_repository import OrderRepository, OrderItemRepository, ArchivedOrderRepository
 from .services.order_service import OrderService
 
 order_repository = OrderRepository()
 order_item_repository = OrderItemRepository()
+archived_order_repository = ArchivedOrderRepository()
 
 service = OrderService(
     order_repository=order_repository,
-    order_item_repository=order_item_repository
+    order_item_repository=order_item_repository,
+    archived_order_repository=archived_order_repository
 )
 
 def get_order_service():
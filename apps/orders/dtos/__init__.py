@@ -1,8 +1,12 @@
-from .order_dtos import OrderDTO, OrderCreateDTO, OrderUpdateDTO, OrderItemDTO
+from .order_dtos import (
+    OrderDTO, OrderCreateDTO, OrderUpdateDTO, OrderItemDTO, SlottedOrderDTO, SlottedOrderItemDTO
+)
 
 __all__ = [
     'OrderDTO',
     'OrderCreateDTO', 
     'OrderUpdateDTO',
-    'OrderItemDTO'
+    'OrderItemDTO',
+    'SlottedOrderDTO',
+    'SlottedOrderItemDTO'
 ]
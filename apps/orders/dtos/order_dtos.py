@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
+from apps.core.dtos import slotted
+
 
 @dataclass
 class OrderItemDTO:
@@ -16,6 +18,9 @@ class OrderItemDTO:
     updated_at: Optional[datetime] = None
 
 
+SlottedOrderItemDTO = slotted(OrderItemDTO)
+
+
 @dataclass
 class OrderDTO:
     customer_id: int
@@ -32,12 +37,16 @@ class OrderDTO:
     order_items: Optional[List[OrderItemDTO]] = None
 
 
+SlottedOrderDTO = slotted(OrderDTO)
+
+
 @dataclass
 class OrderCreateDTO:
     customer_id: int
     restaurant_id: int
-    total_amount: float
     items: List[Dict[str, Any]]
+    # se calcula en el servidor a partir de los precios del menú
+    total_amount: Optional[float] = None
     is_active: bool = True
     delivery_address: Optional[str] = None
     special_instructions: Optional[str] = None
@@ -0,0 +1,76 @@
+import re
+import statistics
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Max, Min
+
+from apps.orders.dependencies import get_order_service
+from apps.orders.models import Order, OrderItem
+
+
+class Command(BaseCommand):
+    help = (
+        "Muestra el plan (EXPLAIN) y el tiempo de las consultas de acceso a órdenes. "
+        "Ejecutarlo antes y después de migrar permite comparar los planes con y sin índices."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=20, help="Ejecuciones por consulta para medir el tiempo")
+        parser.add_argument('--analyze', action='store_true', help="Usa EXPLAIN ANALYZE (solo PostgreSQL)")
+        parser.add_argument('--verbose-plan', action='store_true', help="Imprime el plan completo")
+
+    def handle(self, *args, **options):
+        sample = Order.objects.order_by().aggregate(
+            restaurant_id=Max('restaurant_id'), customer_id=Max('customer_id'),
+            order_id=Max('id'), newest=Max('created_at'), oldest=Min('created_at')
+        )
+        if not sample['order_id']:
+            self.stdout.write(self.style.ERROR("No hay órdenes para analizar."))
+            return
+
+        service = get_order_service()
+        since = sample['newest'] - timedelta(days=30)
+        queries = {
+            'listado por restaurante': service.list_orders({'restaurant': sample['restaurant_id']}),
+            'restaurante + estado + fecha': service.list_orders({
+                'restaurant': sample['restaurant_id'], 'status': 'pending', 'date_from': since.isoformat()
+            }),
+            'listado por cliente': service.list_orders({'customer': sample['customer_id']}),
+            'rango de montos': service.list_orders({'min_amount': 100, 'max_amount': 200}),
+            'listado general': service.list_orders({}),
+            'página por cursor': service.list_orders({}).order_by('-created_at', '-id').filter(
+                created_at__lt=sample['newest']
+            ),
+            'ítems activos de una orden': OrderItem.objects.filter(order_id=sample['order_id'], is_active=True),
+        }
+
+        explain_options = {'analyze': True} if options['analyze'] and connection.vendor == 'postgresql' else {}
+        for name, queryset in queries.items():
+            page = queryset[:10]
+            plan = page.explain(**explain_options)
+
+            timings = []
+            for _ in range(options['runs']):
+                start = time.perf_counter()
+                list(page.all())  # clon: sin caché de resultados
+                timings.append((time.perf_counter() - start) * 1000)
+
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(f"  acceso: {', '.join(self._access_nodes(plan)) or '-'}")
+            self.stdout.write(
+                f"  tiempo: mediana {statistics.median(timings):.2f} ms, "
+                f"máximo {max(timings):.2f} ms ({options['runs']} ejecuciones)"
+            )
+            if options['verbose_plan']:
+                self.stdout.write(plan)
+
+    def _access_nodes(self, plan):
+        """Nodos de lectura del plan: Seq Scan / Index Scan (PostgreSQL) o SCAN / SEARCH (SQLite)"""
+        nodes = re.findall(
+            r'((?:Parallel )?(?:Seq Scan|Index Only Scan|Index Scan|Bitmap Index Scan)(?: Backward)?'
+            r'(?: using \w+)? on "?\w+"?|(?:SCAN|SEARCH) \S+(?: USING (?:COVERING )?INDEX \w+)?)',
+            plan
+        )
+        return list(dict.fromkeys(nodes))
@@ -0,0 +1,43 @@
+from datetime import date, datetime, time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.orders.dependencies import get_order_service
+from apps.orders.partitions import PARTITIONED_TABLES, add_months, detach_partitions, ensure_partitions, is_partitioned
+
+
+class Command(BaseCommand):
+    help = (
+        "Crea por adelantado las particiones mensuales de ORDERS/ORDER_ITEMS y, "
+        "si se indica una retención, archiva las órdenes de las particiones más "
+        "antiguas y separa las que quedan vacías."
+    )
+
+    def add_arguments(self, parser):
+        config = getattr(settings, 'ORDER_PARTITIONS', {})
+        parser.add_argument(
+            '--months-ahead', type=int, default=config.get('MONTHS_AHEAD', 3),
+            help="Meses futuros con partición creada"
+        )
+        parser.add_argument(
+            '--retention-months', type=int, default=config.get('RETENTION_MONTHS'),
+            help="Meses que se conservan adjuntos; los anteriores se archivan y se separan (DETACH)"
+        )
+
+    def handle(self, *args, **options):
+        if not any(is_partitioned(table) for table in PARTITIONED_TABLES):
+            self.stdout.write(self.style.WARNING("Las tablas de órdenes no están particionadas (solo PostgreSQL)."))
+            return
+
+        for name in ensure_partitions(options['months_ahead']):
+            self.stdout.write(self.style.SUCCESS(f"Partición '{name}' creada."))
+
+        if options['retention_months']:
+            before = add_months(date.today(), -options['retention_months'])
+            batch_size = getattr(settings, 'ORDER_ARCHIVE', {}).get('BATCH_SIZE', 1000)
+            archived = get_order_service().archive_all_orders(datetime.combine(before, time.min), batch_size)
+            self.stdout.write(self.style.SUCCESS(f"{archived} órdenes archivadas."))
+            for name in detach_partitions(before):
+                self.stdout.write(self.style.SUCCESS(f"Partición '{name}' separada."))
+
+        self.stdout.write(self.style.SUCCESS("Mantenimiento de particiones completado."))
@@ -0,0 +1,126 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:14
+
+import datetime
+import django.db.models.deletion
+from django.db import migrations, models
+
+# meses creados por adelantado; luego los mantiene manage_order_partitions
+MONTHS_AHEAD = 3
+
+
+def _add_months(day, months):
+    month = day.month - 1 + months
+    return datetime.date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def _partition_table(schema_editor, model):
+    """
+    Convierte la tabla en una tabla particionada por mes sobre created_at.
+    La clave primaria pasa a ser (id, created_at), requisito de PostgreSQL.
+    """
+    table = model._meta.db_table
+    legacy = f'{table}_legacy'
+    quote = schema_editor.quote_name
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'SELECT min(created_at), max(id) FROM {quote(table)}')
+        first, max_id = cursor.fetchone()
+
+    schema_editor.execute(f'ALTER TABLE {quote(table)} RENAME TO {quote(legacy)}')
+    schema_editor.execute(
+        f'CREATE TABLE {quote(table)} (LIKE {quote(legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY RANGE (created_at)'
+    )
+
+    # una partición por mes desde la primera orden, más una por defecto
+    today = datetime.date.today()
+    month = (first.date() if first else today).replace(day=1)
+    last = _add_months(today.replace(day=1), MONTHS_AHEAD)
+    while month <= last:
+        schema_editor.execute(
+            f'CREATE TABLE {quote(f"{table}_p{month:%Y_%m}")} PARTITION OF {quote(table)} '
+            f'FOR VALUES FROM (%s) TO (%s)',
+            (month, _add_months(month, 1))
+        )
+        month = _add_months(month, 1)
+    schema_editor.execute(f'CREATE TABLE {quote(f"{table}_default")} PARTITION OF {quote(table)} DEFAULT')
+
+    schema_editor.execute(f'INSERT INTO {quote(table)} SELECT * FROM {quote(legacy)}')
+    schema_editor.execute(f'DROP TABLE {quote(legacy)}')
+
+    # la columna identity no se copia: se reemplaza por una secuencia propia
+    sequence = f'{table}_id_seq'
+    schema_editor.execute(f'CREATE SEQUENCE {quote(sequence)} OWNED BY {quote(table)}.id')
+    if max_id:
+        schema_editor.execute('SELECT setval(%s, %s)', (quote(sequence), max_id))
+    schema_editor.execute(
+        f'ALTER TABLE {quote(table)} ALTER COLUMN id SET DEFAULT nextval(%s::regclass)',
+        (quote(sequence),)
+    )
+    schema_editor.execute(
+        f'ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(f"{table}_pkey")} PRIMARY KEY (id, created_at)'
+    )
+
+    # índices y FKs con los mismos nombres que generaría Django
+    for field in model._meta.local_fields:
+        for statement in schema_editor._field_indexes_sql(model, field):
+            schema_editor.execute(statement)
+        if field.remote_field and field.db_constraint:
+            schema_editor.execute(schema_editor._create_fk_sql(model, field, '_fk_%(to_table)s_%(to_column)s'))
+    for index in model._meta.indexes:
+        schema_editor.add_index(model, index)
+
+
+def partition_orders(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    _partition_table(schema_editor, apps.get_model('orders', 'Order'))
+    _partition_table(schema_editor, apps.get_model('orders', 'OrderItem'))
+
+
+def _unpartition_table(schema_editor, model):
+    """
+    Vuelve a una tabla sin particionar: copia las filas de las particiones
+    adjuntas y recrea la tabla como la genera Django. Las particiones ya
+    separadas por detach_partitions quedan como tablas independientes.
+    """
+    table = model._meta.db_table
+    quote = schema_editor.quote_name
+    columns = ', '.join(quote(field.column) for field in model._meta.local_concrete_fields)
+    rows = f'{table}_rows'
+
+    schema_editor.execute(f'CREATE TEMPORARY TABLE {quote(rows)} AS SELECT {columns} FROM {quote(table)}')
+    schema_editor.execute(f'DROP TABLE {quote(table)}')
+    schema_editor.create_model(model)
+    schema_editor.execute(
+        f'INSERT INTO {quote(table)} ({columns}) OVERRIDING SYSTEM VALUE SELECT {columns} FROM {quote(rows)}'
+    )
+    schema_editor.execute(f'DROP TABLE {quote(rows)}')
+    schema_editor.execute(
+        f"SELECT setval(pg_get_serial_sequence(%s, 'id'), coalesce(max(id), 1), max(id) IS NOT NULL) "
+        f"FROM {quote(table)}",
+        (quote(table),)
+    )
+
+
+def unpartition_orders(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    _unpartition_table(schema_editor, apps.get_model('orders', 'OrderItem'))
+    _unpartition_table(schema_editor, apps.get_model('orders', 'Order'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_order_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='orderitem',
+            name='order',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='order_items', to='orders.order'),
+        ),
+        migrations.RunPython(partition_orders, unpartition_orders),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_partition_orders_by_month'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('customer_id', models.BigIntegerField()),
+                ('restaurant_id', models.BigIntegerField()),
+                ('status', models.CharField(max_length=20)),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('data', models.JSONField()),
+            ],
+            options={
+                'verbose_name': 'Archived Order',
+                'verbose_name_plural': 'Archived Orders',
+                'db_table': 'ORDERS_ARCHIVE',
+                'indexes': [models.Index(fields=['restaurant_id', '-created_at'], name='idx_archive_restaurant_created'), models.Index(fields=['customer_id', '-created_at'], name='idx_archive_customer_created')],
+            },
+        ),
+    ]
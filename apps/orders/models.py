@@ -3,15 +3,18 @@ from django.utils.translation import gettext_lazy as _
 
 class Order(models.Model):
     is_active = models.BooleanField(default=True)
+    # sin índice propio: los índices compuestos de Meta empiezan por estas columnas
     customer = models.ForeignKey(
         "users.User",
         on_delete=models.CASCADE,
         related_name="orders",
+        db_index=False,
     )
     restaurant = models.ForeignKey(
         "restaurants.Restaurant",
         on_delete=models.CASCADE,
         related_name="orders",
+        db_index=False,
     )
     status = models.CharField(
         max_length=20,
@@ -54,13 +57,34 @@ class Order(models.Model):
         verbose_name = _('Order')
         verbose_name_plural = _('Orders')
         ordering = ["-created_at"]
+        indexes = [
+            # combinaciones de OrderFilter, en el orden del listado
+            models.Index(fields=['restaurant', '-created_at', '-id'], name='idx_order_restaurant_created'),
+            models.Index(fields=['restaurant', 'status', '-created_at'], name='idx_order_rest_status_created'),
+            models.Index(fields=['customer', '-created_at', '-id'], name='idx_order_customer_created'),
+            models.Index(fields=['total_amount'], name='idx_order_total_amount'),
+            # orden por defecto y paginación por cursor; cubre las columnas del listado
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='idx_order_created_covering',
+                include=['restaurant', 'customer', 'status', 'total_amount', 'is_active'],
+            ),
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='idx_order_active_created',
+                condition=models.Q(is_active=True),
+            ),
+        ]
 
 class OrderItem(models.Model):
     is_active = models.BooleanField(default=True)
+    # sin FK en la base: en PostgreSQL ORDERS está particionada por created_at y
+    # su clave primaria es (id, created_at); el CASCADE lo resuelve el ORM
     order = models.ForeignKey(
         Order,
         on_delete=models.CASCADE,
         related_name="order_items",
+        db_constraint=False,
     )
     menu_item = models.ForeignKey(
         "menu.MenuItem",
@@ -91,3 +115,44 @@ class OrderItem(models.Model):
         verbose_name = _('Order Item')
         verbose_name_plural = _('Order Items')
         ordering = ["-created_at"]
+        indexes = [
+            # OrderItemRepository.get_by_order_id y los ítems activos de cada orden
+            models.Index(
+                fields=['order'],
+                name='idx_order_item_active_order',
+                condition=models.Q(is_active=True),
+            ),
+        ]
+
+
+class ArchivedOrder(models.Model):
+    """
+    Orden cerrada movida fuera de ORDERS. Guarda las columnas por las que se
+    busca y la orden con sus ítems tal como la devuelve la API.
+    """
+    # mismo id que tenía en ORDERS; sin FKs para no depender de filas vivas
+    id = models.BigIntegerField(primary_key=True)
+    customer_id = models.BigIntegerField()
+    restaurant_id = models.BigIntegerField()
+    status = models.CharField(max_length=20)
+    total_amount = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+    )
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+    data = models.JSONField()
+
+    def __str__(self):
+        return f"ArchivedOrder {self.id} - {self.status}"
+
+    class Meta:
+        db_table = "ORDERS_ARCHIVE"
+        verbose_name = _('Archived Order')
+        verbose_name_plural = _('Archived Orders')
+        indexes = [
+            models.Index(fields=['restaurant_id', '-created_at'], name='idx_archive_restaurant_created'),
+            models.Index(fields=['customer_id', '-created_at'], name='idx_archive_customer_created'),
+        ]
@@ -0,0 +1,160 @@
+import logging
+import re
+from datetime import date
+from typing import List, Optional, Tuple
+from django.db import DatabaseError, connection, transaction
+
+from .models import Order, OrderItem
+
+logger = logging.getLogger(__name__)
+
+# tablas particionadas por mes sobre created_at (ver migración 0003)
+PARTITIONED_TABLES = (Order._meta.db_table, OrderItem._meta.db_table)
+
+_PARTITION_RE = re.compile(r'_p(\d{4})_(\d{2})$')
+
+
+def add_months(day: date, months: int) -> date:
+    """Primer día del mes que está `months` meses después (o antes) de `day`"""
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f'{table}_p{month:%Y_%m}'
+
+
+def is_partitioned(table: str) -> bool:
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid '
+            'WHERE c.relname = %s AND c.relnamespace = current_schema()::regnamespace',
+            [table]
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(table: str) -> List[Tuple[str, date]]:
+    """Particiones mensuales adjuntas a la tabla, con el mes que cubren"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits i '
+            'JOIN pg_class child ON child.oid = i.inhrelid '
+            'JOIN pg_class parent ON parent.oid = i.inhparent '
+            'WHERE parent.relname = %s AND parent.relnamespace = current_schema()::regnamespace',
+            [table]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        match = _PARTITION_RE.search(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def default_partition(table: str) -> Optional[str]:
+    """Partición por defecto de la tabla, si la tiene"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits i '
+            'JOIN pg_class child ON child.oid = i.inhrelid '
+            'JOIN pg_class parent ON parent.oid = i.inhparent '
+            "WHERE parent.relname = %s AND parent.relnamespace = current_schema()::regnamespace "
+            "AND pg_get_expr(child.relpartbound, child.oid) = 'DEFAULT'",
+            [table]
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def create_partition(table: str, month: date) -> str:
+    """
+    Crea la partición de un mes. PostgreSQL no la crea si la partición por
+    defecto ya tiene filas de ese mes: se separa la de defecto, se crea la
+    partición, se mueven las filas y se vuelve a adjuntar, todo en una
+    transacción que bloquea la tabla mientras dura.
+    """
+    quote = connection.ops.quote_name
+    name = partition_name(table, month)
+    bounds = [month, add_months(month, 1)]
+    default = default_partition(table)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        rows_in_default = False
+        if default:
+            cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM {quote(default)} WHERE created_at >= %s AND created_at < %s)',
+                bounds
+            )
+            rows_in_default = cursor.fetchone()[0]
+
+        if rows_in_default:
+            cursor.execute(f'ALTER TABLE {quote(table)} DETACH PARTITION {quote(default)}')
+        cursor.execute(
+            f'CREATE TABLE {quote(name)} PARTITION OF {quote(table)} FOR VALUES FROM (%s) TO (%s)',
+            bounds
+        )
+        if rows_in_default:
+            cursor.execute(
+                f'INSERT INTO {quote(name)} SELECT * FROM {quote(default)} '
+                f'WHERE created_at >= %s AND created_at < %s',
+                bounds
+            )
+            cursor.execute(f'DELETE FROM {quote(default)} WHERE created_at >= %s AND created_at < %s', bounds)
+            cursor.execute(f'ALTER TABLE {quote(table)} ATTACH PARTITION {quote(default)} DEFAULT')
+            logger.info(f"Filas de {month:%Y-%m} movidas de {default} a {name}")
+    return name
+
+
+def ensure_partitions(months_ahead: int = 3, today: Optional[date] = None) -> List[str]:
+    """
+    Crea las particiones del mes actual y de los siguientes `months_ahead`
+    meses. Un fallo se registra y no impide crear las demás.
+    """
+    today = today or date.today()
+    created = []
+
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(table):
+            logger.info(f"{table} no está particionada; no se crean particiones")
+            continue
+
+        existing = {name for name, _month in list_partitions(table)}
+        for offset in range(months_ahead + 1):
+            month = add_months(today, offset)
+            if partition_name(table, month) in existing:
+                continue
+            try:
+                created.append(create_partition(table, month))
+            except DatabaseError as e:
+                logger.error(f"No se pudo crear la partición {month:%Y-%m} de {table}: {str(e)}")
+    return created
+
+
+def detach_partitions(before: date) -> List[str]:
+    """
+    Separa las particiones vacías de meses anteriores a `before`. Las órdenes
+    se archivan antes (ver maintain_order_partitions); una partición que
+    todavía tiene filas, como órdenes pendientes, se conserva y se reporta.
+    """
+    quote = connection.ops.quote_name
+    detached = []
+
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(table):
+            continue
+        for name, month in list_partitions(table):
+            if add_months(month, 1) > before:
+                continue
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {quote(name)})')
+                if cursor.fetchone()[0]:
+                    logger.warning(f"{name} tiene filas sin archivar; no se separa")
+                    continue
+                cursor.execute(f'ALTER TABLE {quote(table)} DETACH PARTITION {quote(name)}')
+            detached.append(name)
+    return detached
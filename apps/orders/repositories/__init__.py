@@ -1,3 +1,3 @@
-from .order_repository import OrderRepository, OrderItemRepository
+from .order_repository import OrderRepository, OrderItemRepository, ArchivedOrderRepository
 
-__all__ = ['OrderRepository', 'OrderItemRepository']
+__all__ = ['OrderRepository', 'OrderItemRepository', 'ArchivedOrderRepository']
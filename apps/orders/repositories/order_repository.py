@@ -1,63 +1,153 @@
-from typing import Optional, Dict, Any, List
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterable, List
 from django.db import models, transaction
 from django.core.cache import cache
 from apps.core.repositories.django_repository import DjangoRepository
-from ..models import Order, OrderItem
-import json
+from apps.core.cache import ResultCache, async_cache, invalidate_on_commit, tagged_cache
+from apps.core.db_router import aread_db, mark_written, read_db
+from apps.menu.models import MenuItem
+from apps.reports.repositories import DailySalesRollupRepository
+from ..models import ArchivedOrder, Order, OrderItem
+
+# orden de los items de una orden en todas las lecturas
+ITEM_ORDERING = ('-created_at', '-id')
+
+
+def active_items_prefetch(since: Optional[datetime] = None) -> models.Prefetch:
+    """
+    Items activos de cada orden, filtrados y ordenados en SQL, en order.active_items.
+    Los items se crean después que su orden: `since` (el created_at de la orden más
+    antigua) descarta en PostgreSQL las particiones anteriores de ORDER_ITEMS.
+    """
+    queryset = OrderItem.objects.filter(is_active=True)
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+    return models.Prefetch('order_items', queryset=queryset.order_by(*ITEM_ORDERING), to_attr='active_items')
 
 
 class OrderRepository(DjangoRepository[Order]):
     def __init__(self):
         super().__init__(Order)
         self.cache_timeout = 60 * 5  # 5 minutos
+        # paginas ya serializadas del listado de ordenes
+        self.page_cache = ResultCache('orders_page', self.cache_timeout)
+        # ventas diarias agregadas, se actualizan en la misma transacción
+        self.rollups = DailySalesRollupRepository()
 
     def get_by_id(self, id: int) -> Optional[Order]:
         cache_key = f'order_{id}'
-        order = cache.get(cache_key)
+        order = self._cache_get(cache.get, cache_key)
         
-        if not order:
-            order = super().get_by_id(id)
+        # las entradas sin active_items son de antes del Prefetch
+        if not order or not hasattr(order, 'active_items'):
+            order = Order.objects.using(read_db(cache_key)).filter(id=id).first()
             if order:
-                order = Order.objects.select_related(
-                    'customer', 'restaurant'
-                ).prefetch_related(
-                    'order_items', 'order_items__menu_item'
-                ).get(id=id)
-                cache.set(cache_key, order, self.cache_timeout)
+                models.prefetch_related_objects([order], active_items_prefetch(order.created_at))
+                self._cache_set(cache.set, cache_key, order, self.cache_timeout)
         
         return order
     
-    def get_all(self, filters: Optional[Dict[str, Any]] = None) -> models.QuerySet:
-        filter_str = '_'.join(f"{k}:{v}" for k, v in sorted(filters.items())) if filters else "all"
-        cache_key = f'orders_{filter_str}'
+    async def aget_by_id(self, id: int) -> Optional[Order]:
+        """get_by_id() para vistas async: misma clave de caché, ORM y redis async"""
+        cache_key = f'order_{id}'
+        order = await self._acache_get(async_cache.get, cache_key)
         
-        queryset = cache.get(cache_key)
-        if queryset is None:
-            queryset = Order.objects.select_related(
-                'customer', 'restaurant'
-            ).all()
-            
-            # aplicar filtros si existen
-            if filters:
-                queryset = super().apply_filters(queryset, filters)
-                
-            cache.set(cache_key, queryset, self.cache_timeout) 
+        # las entradas sin active_items son de antes del Prefetch
+        if not order or not hasattr(order, 'active_items'):
+            order = await Order.objects.using(await aread_db(cache_key)).filter(id=id).afirst()
+            if order:
+                await models.aprefetch_related_objects([order], active_items_prefetch(order.created_at))
+                await self._acache_set(async_cache.set, cache_key, order, self.cache_timeout)
+        
+        return order
+    
+    def get_all(self, filters: Optional[Dict[str, Any]] = None,
+                list_filters: Optional[Dict[str, Any]] = None) -> models.QuerySet:
+        # el queryset es perezoso: se cachea el resultado serializado (ver get_cached_page)
+        # réplica, salvo que el usuario haya escrito hace poco
+        queryset = Order.objects.using(read_db()).select_related(
+            'customer', 'restaurant'
+        ).all()
+        
+        # aplicar filtros si existen
+        if filters:
+            queryset = queryset.filter(**filters)
         return queryset
     
-    @transaction.atomic
+    def get_cached_page(self, filters: Optional[Dict[str, Any]], page: Any, page_size: Any) -> Optional[bytes]:
+        """Obtener una pagina del listado ya serializada"""
+        return self._cache_get(self.page_cache.get, filters, page, page_size)
+    
+    def page_versions(self, filters: Optional[Dict[str, Any]]) -> Dict[str, int]:
+        """Versiones de las etiquetas de una pagina; se toman antes de consultarla"""
+        return tagged_cache.get_versions(self._page_tags(filters))
+    
+    def cache_page(self, filters: Optional[Dict[str, Any]], page: Any, page_size: Any,
+                   ids: List[int], body: bytes, versions: Dict[str, int]) -> None:
+        """Guardar una pagina del listado ya serializada con las versiones previas a la consulta"""
+        self._cache_set(self.page_cache.set, filters, page, page_size, ids, body, versions)
+    
+    def _page_tags(self, filters: Optional[Dict[str, Any]]) -> List[str]:
+        """Etiquetas de las que depende una pagina segun sus filtros"""
+        filters = filters or {}
+        tags = []
+        if filters.get('restaurant'):
+            tags.append(f"orders:restaurant:{filters['restaurant']}")
+        if filters.get('customer'):
+            tags.append(f"orders:customer:{filters['customer']}")
+        return tags or ['orders']
+    
+    def _invalidate_lists(self, order: Order) -> None:
+        invalidate_on_commit(
+            tagged_cache.invalidate,
+            'orders',
+            f'orders:restaurant:{order.restaurant_id}',
+            f'orders:customer:{order.customer_id}'
+        )
+    
+    @transaction.atomic(savepoint=False)
     def create(self, entity: Order, order_items: List[OrderItem] = None) -> Order:
         entity.save()
         
         if order_items:
             for item in order_items:
                 item.order = entity
-                item.save()
+            # un solo INSERT; en PostgreSQL los ids vuelven con RETURNING
+            OrderItem.objects.bulk_create(order_items)
         
-        cache.delete_pattern('orders_*')
-        cache_key = f'order_{entity.id}'
-        cache.set(cache_key, entity, self.cache_timeout)
+        self.rollups.apply([entity])
+        
+        # order_{id} se cachea en la primera lectura, ya con sus items
+        self._invalidate_lists(entity)
         return entity
     
+    @transaction.atomic
+    def create_batch(self, orders: List[Order], order_items: List[List[OrderItem]],
+                     batch_size: int = 1000) -> List[Order]:
+        """Inserta órdenes con sus ítems por lotes: un INSERT por lote y por tabla"""
+        for start in range(0, len(orders), batch_size):
+            chunk = orders[start:start + batch_size]
+            Order.objects.bulk_create(chunk)
+            
+            # los ids de las órdenes vuelven con RETURNING y se asignan a sus ítems
+            items = []
+            for order, chunk_items in zip(chunk, order_items[start:start + batch_size]):
+                for item in chunk_items:
+                    item.order = order
+                items.extend(chunk_items)
+            OrderItem.objects.bulk_create(items, batch_size=batch_size)
+        
+        self.rollups.apply(orders)
+        
+        # una sola invalidación por restaurante y cliente afectados
+        invalidate_on_commit(
+            tagged_cache.invalidate,
+            'orders',
+            *{f'orders:restaurant:{order.restaurant_id}' for order in orders},
+            *{f'orders:customer:{order.customer_id}' for order in orders}
+        )
+        return orders
+    
     @transaction.atomic
     def update(self, entity: Order) -> Order:
         existing = Order.objects.filter(id=entity.id).first()
@@ -76,8 +166,14 @@ class OrderRepository(DjangoRepository[Order]):
         # actualizar solo los campos que cambiaron
         entity.save(update_fields=changed_fields + ['updated_at'])
         
-        cache.delete(f'order_{entity.id}')
-        cache.delete_pattern('orders_*')
+        # la orden cambia de fila en el agregado diario si cambió su estado o monto
+        if 'status' in changed_fields or 'total_amount' in changed_fields:
+            self.rollups.apply([existing], sign=-1)
+            self.rollups.apply([entity])
+        
+        invalidate_on_commit(cache.delete, f'order_{entity.id}')
+        mark_written(f'order_{entity.id}')
+        self._invalidate_lists(existing)
         return entity
     
     @transaction.atomic
@@ -87,19 +183,124 @@ class OrderRepository(DjangoRepository[Order]):
             order.is_active = False
             order.save(update_fields=['is_active', 'updated_at'])
             
-            cache.delete(f'order_{id}')
-            cache.delete_pattern('orders_*')
+            invalidate_on_commit(cache.delete, f'order_{id}')
+            mark_written(f'order_{id}')
+            self._invalidate_lists(order)
             return True
         except Order.DoesNotExist:
             return False
+    
+    def get_archivable(self, before: datetime, limit: int = 1000) -> List[Order]:
+        """
+        Órdenes inactivas o cerradas creadas antes de `before`, con todos sus
+        ítems: archive() borra también los inactivos
+        """
+        return list(Order.objects.filter(
+            models.Q(is_active=False) | models.Q(status__in=['completed', 'cancelled']),
+            created_at__lt=before
+        ).prefetch_related('order_items').order_by('created_at', 'id')[:limit])
+    
+    @transaction.atomic
+    def archive(self, orders: List[Order], payloads: List[Dict[str, Any]]) -> int:
+        """
+        Copia las órdenes a ORDERS_ARCHIVE y las borra de ORDERS y ORDER_ITEMS.
+        El agregado diario no cambia: las ventas archivadas siguen contando.
+        """
+        ArchivedOrder.objects.bulk_create(
+            [
+                ArchivedOrder(
+                    id=order.id,
+                    customer_id=order.customer_id,
+                    restaurant_id=order.restaurant_id,
+                    status=order.status,
+                    total_amount=order.total_amount,
+                    created_at=order.created_at,
+                    data=payload
+                ) for order, payload in zip(orders, payloads)
+            ],
+            # un reintento tras un fallo parcial no duplica filas
+            ignore_conflicts=True
+        )
+        
+        ids = [order.id for order in orders]
+        # created_at acota la búsqueda a las particiones antiguas
+        oldest = min(order.created_at for order in orders)
+        OrderItem.objects.filter(order_id__in=ids, created_at__gte=oldest).delete()
+        _total, deleted = Order.objects.filter(id__in=ids, created_at__gte=oldest).delete()
+        
+        invalidate_on_commit(cache.delete_many, [f'order_{id}' for id in ids])
+        mark_written(*(f'order_{id}' for id in ids))
+        invalidate_on_commit(
+            tagged_cache.invalidate,
+            'orders',
+            *{f'orders:restaurant:{order.restaurant_id}' for order in orders},
+            *{f'orders:customer:{order.customer_id}' for order in orders}
+        )
+        return deleted.get(Order._meta.label, 0)
+
+
+class ArchivedOrderRepository(DjangoRepository[ArchivedOrder]):
+    def __init__(self):
+        super().__init__(ArchivedOrder)
+        # las órdenes archivadas no cambian
+        self.cache_timeout = 60 * 60  # 1 hora
+    
+    def get_by_id(self, id: int) -> Optional[ArchivedOrder]:
+        cache_key = f'archived_order_{id}'
+        archived = self._cache_get(cache.get, cache_key)
+        
+        if not archived:
+            archived = ArchivedOrder.objects.filter(id=id).first()
+            if archived:
+                self._cache_set(cache.set, cache_key, archived, self.cache_timeout)
+        
+        return archived
+    
+    async def aget_by_id(self, id: int) -> Optional[ArchivedOrder]:
+        cache_key = f'archived_order_{id}'
+        archived = await self._acache_get(async_cache.get, cache_key)
+        
+        if not archived:
+            archived = await ArchivedOrder.objects.filter(id=id).afirst()
+            if archived:
+                await self._acache_set(async_cache.set, cache_key, archived, self.cache_timeout)
+        
+        return archived
 
 
 class OrderItemRepository(DjangoRepository[OrderItem]):
     def __init__(self):
         super().__init__(OrderItem)
     
-    def get_by_order_id(self, order_id: int) -> List[OrderItem]:
-        return OrderItem.objects.filter(order_id=order_id, is_active=True)
+    def get_by_order_id(self, order_id: int, since: Optional[datetime] = None) -> List[OrderItem]:
+        queryset = OrderItem.objects.filter(order_id=order_id, is_active=True)
+        if since is not None:
+            queryset = queryset.filter(created_at__gte=since)
+        return queryset.order_by(*ITEM_ORDERING)
+    
+    def get_by_order_ids(self, order_ids: List[int], fields: Iterable[str],
+                         since: Optional[datetime] = None) -> Dict[int, List[Any]]:
+        """
+        Items activos de varias órdenes en una consulta, proyectados a `fields` y
+        agrupados por orden. `since` acota las particiones (ver active_items_prefetch)
+        """
+        items = {}
+        if not order_ids:
+            return items
+        queryset = OrderItem.objects.using(read_db()).filter(order_id__in=order_ids, is_active=True)
+        if since is not None:
+            queryset = queryset.filter(created_at__gte=since)
+        queryset = queryset.order_by(*ITEM_ORDERING)
+        for item in self.project(queryset, fields):
+            items.setdefault(item.order_id, []).append(item)
+        return items
+    
+    def get_menu_item_prices(self, menu_item_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Precio, restaurante y disponibilidad de los ítems de menú en una sola consulta"""
+        rows = MenuItem.objects.filter(id__in=set(menu_item_ids)).values(
+            'id', 'price', 'restaurant_id', 'is_active', 'is_available'
+        )
+        return {row['id']: row for row in rows}
     
     @transaction.atomic
     def create_batch(self, items: List[OrderItem]) -> List[OrderItem]:
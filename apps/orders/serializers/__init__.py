@@ -2,12 +2,14 @@ from .order_serializers import (
     OrderDTOSerializer, 
     OrderCreateDTOSerializer, 
     OrderUpdateDTOSerializer,
-    OrderItemDTOSerializer
+    OrderItemDTOSerializer,
+    BulkOrderUploadSerializer
 )
 
 __all__ = [
     'OrderDTOSerializer',
     'OrderCreateDTOSerializer',
     'OrderUpdateDTOSerializer',
-    'OrderItemDTOSerializer'
+    'OrderItemDTOSerializer',
+    'BulkOrderUploadSerializer'
 ]
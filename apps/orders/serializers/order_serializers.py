@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from django.utils.translation import gettext as _
 
+from apps.core.serializers import CompiledSerializerMixin
 
-class OrderItemDTOSerializer(serializers.Serializer):
+
+class OrderItemDTOSerializer(CompiledSerializerMixin, serializers.Serializer):
     id = serializers.IntegerField(required=False)
     order_id = serializers.IntegerField(required=False)
     menu_item_id = serializers.IntegerField()
@@ -28,7 +30,7 @@ class OrderItemDTOSerializer(serializers.Serializer):
         return value
 
 
-class OrderDTOSerializer(serializers.Serializer):
+class OrderDTOSerializer(CompiledSerializerMixin, serializers.Serializer):
     id = serializers.IntegerField(required=False)
     customer_id = serializers.IntegerField()
     restaurant_id = serializers.IntegerField()
@@ -63,7 +65,8 @@ class OrderDTOSerializer(serializers.Serializer):
 class OrderCreateDTOSerializer(serializers.Serializer):
     customer_id = serializers.IntegerField()
     restaurant_id = serializers.IntegerField()
-    total_amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    # opcional: el total y los subtotales se calculan con los precios del menú
+    total_amount = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, allow_null=True)
     delivery_address = serializers.CharField(required=False, allow_null=True, allow_blank=True)
     special_instructions = serializers.CharField(required=False, allow_null=True, allow_blank=True)
     estimated_delivery_time = serializers.DateTimeField(required=False, allow_null=True)
@@ -81,14 +84,17 @@ class OrderCreateDTOSerializer(serializers.Serializer):
         
         # validar estructura de cada item
         for item in value:
-            if not all(k in item for k in ('menu_item_id', 'quantity', 'subtotal')):
-                raise serializers.ValidationError(_("Cada ítem debe contener menu_item_id, quantity y subtotal"))
+            if not all(k in item for k in ('menu_item_id', 'quantity')):
+                raise serializers.ValidationError(_("Cada ítem debe contener menu_item_id y quantity"))
             
-            if item['quantity'] <= 0:
-                raise serializers.ValidationError(_("La cantidad debe ser mayor a cero"))
+            try:
+                quantity = int(item['quantity'])
+                int(item['menu_item_id'])
+            except (TypeError, ValueError):
+                raise serializers.ValidationError(_("menu_item_id y quantity deben ser números enteros"))
             
-            if float(item['subtotal']) <= 0:
-                raise serializers.ValidationError(_("El subtotal debe ser mayor a cero"))
+            if quantity <= 0:
+                raise serializers.ValidationError(_("La cantidad debe ser mayor a cero"))
         return value
 
 
@@ -106,3 +112,29 @@ class OrderUpdateDTOSerializer(serializers.Serializer):
             if value not in valid_statuses:
                 raise serializers.ValidationError(_("Estado inválido. Debe ser uno de: pending, completed, cancelled"))
         return value
+
+
+class BulkOrderUploadSerializer(serializers.Serializer):
+    # 20MB máximo, también para el cuerpo application/x-ndjson
+    max_size = 20 * 1024 * 1024
+    file = serializers.FileField(
+        required=True,
+        help_text="Archivo NDJSON con una orden por línea: {\"customer_id\", \"restaurant_id\", \"items\": [...], ...}",
+        error_messages={
+            'required': _('Debe proporcionar un archivo NDJSON')
+        }
+    )
+    
+    def validate_file(self, value):
+        """
+        Validación del archivo NDJSON:
+        - Verifica la extensión (.ndjson o .jsonl)
+        - Verifica que el tamaño del archivo no exceda 20MB
+        """
+        if not value.name.endswith(('.ndjson', '.jsonl')):
+            raise serializers.ValidationError(_("El archivo debe ser NDJSON (.ndjson o .jsonl)"))
+        
+        if value.size > self.max_size:
+            raise serializers.ValidationError(_("El archivo es demasiado grande (máximo 20MB)"))
+        
+        return value
@@ -1,25 +1,30 @@
-from typing import Optional, Dict, Any, Union
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterable, Union, List
 from django.db import models, transaction
 from django.utils.translation import gettext as _
 from rest_framework.exceptions import NotFound, ValidationError
 
-from ..repositories import OrderRepository, OrderItemRepository
-from ..dtos import OrderDTO, OrderCreateDTO, OrderUpdateDTO, OrderItemDTO
-from ..models import Order, OrderItem
+from ..repositories import OrderRepository, OrderItemRepository, ArchivedOrderRepository
+from ..dtos import OrderDTO, OrderCreateDTO, OrderUpdateDTO, OrderItemDTO, SlottedOrderDTO, SlottedOrderItemDTO
+from ..models import ArchivedOrder, Order, OrderItem
 from ..serializers import (
     OrderDTOSerializer, 
     OrderCreateDTOSerializer,
     OrderUpdateDTOSerializer
 )
 from ..filters import OrderFilter
+from apps.core.dtos import DTOBatch, dto_fields
 from apps.core.exceptions import ValidationException
+from apps.core.renderers import FastJSONRenderer
 
 
 class OrderService:
     def __init__(self, order_repository: OrderRepository = None, 
-                order_item_repository: OrderItemRepository = None):
+                order_item_repository: OrderItemRepository = None,
+                archived_order_repository: ArchivedOrderRepository = None):
         self.order_repository = order_repository or OrderRepository()
         self.order_item_repository = order_item_repository or OrderItemRepository()
+        self.archived_order_repository = archived_order_repository or ArchivedOrderRepository()
     
     def _format_validation_error(self, serializer_errors):
         """Formatea errores de validación para una respuesta consistente"""
@@ -34,63 +39,105 @@ class OrderService:
         """Obtiene una orden por su ID"""
         order = self.order_repository.get_by_id(order_id)
         if not order:
-            raise NotFound(_("Orden no encontrada"))
+            # las órdenes cerradas antiguas se leen del archivo
+            archived = self.archived_order_repository.get_by_id(order_id)
+            if not archived:
+                raise NotFound(_("Orden no encontrada"))
+            return self._archived_to_dto(archived)
         
         # Convertir a DTO
         return self._to_dto(order)
     
+    async def aget_order(self, order_id: int) -> Optional[OrderDTO]:
+        """get_order() para vistas async"""
+        order = await self.order_repository.aget_by_id(order_id)
+        if not order:
+            archived = await self.archived_order_repository.aget_by_id(order_id)
+            if not archived:
+                raise NotFound(_("Orden no encontrada"))
+            return self._archived_to_dto(archived)
+        
+        return self._to_dto(order)
+    
     def list_orders(self, filters: Optional[Dict[str, Any]] = None) -> models.QuerySet:
         """Lista órdenes con filtros opcionales"""
-        base_queryset = self.order_repository.get_all()
+        base_queryset = self.order_repository.get_all(list_filters=filters)
         
         # Aplicar filtros
         filter_set = OrderFilter(filters or {}, queryset=base_queryset)
         filtered_queryset = filter_set.qs
         
-        return filtered_queryset.order_by('-created_at')
+        # filas con las columnas del DTO en vez de modelos (ver _to_dto_batch)
+        return self.order_repository.project(filtered_queryset.order_by('-created_at'), dto_fields(OrderDTO))
+    
+    def get_cached_orders_page(self, filters: Optional[Dict[str, Any]], page: Any, page_size: Any) -> Optional[bytes]:
+        """Obtiene una página del listado ya serializada, si está en caché"""
+        return self.order_repository.get_cached_page(filters, page, page_size)
+    
+    def orders_page_versions(self, filters: Optional[Dict[str, Any]]) -> Dict[str, int]:
+        """Versiones de caché de un listado, a tomar antes de consultarlo"""
+        return self.order_repository.page_versions(filters)
+    
+    def cache_orders_page(self, filters: Optional[Dict[str, Any]], page: Any, page_size: Any,
+                          orders: List[Order], data: Dict, versions: Dict[str, int]) -> None:
+        """Guarda en caché una página del listado ya serializada"""
+        body = FastJSONRenderer().render(data)
+        self.order_repository.cache_page(
+            filters, page, page_size, [order.id for order in orders], body, versions
+        )
     
     @transaction.atomic
     def create_order(self, order_data: OrderCreateDTO) -> Dict:
-        """Crea una nueva orden con sus ítems"""
+        """Crea una nueva orden con sus ítems, con precios calculados en el servidor"""
         try:
             # Validar datos de entrada
             serializer = OrderCreateDTOSerializer(data=order_data.__dict__)
             serializer.is_valid(raise_exception=True)
             
+            # Precios y disponibilidad de todos los ítems en una sola consulta
+            menu_items = self.order_item_repository.get_menu_item_prices(
+                [int(item['menu_item_id']) for item in order_data.items]
+            )
+            
+            # Construir los ítems con el subtotal según el precio actual del menú
+            order_items = []
+            for item_data in order_data.items:
+                menu_item_id = int(item_data['menu_item_id'])
+                menu_item = menu_items.get(menu_item_id)
+                if (not menu_item
+                        or menu_item['restaurant_id'] != int(order_data.restaurant_id)
+                        or not menu_item['is_active']
+                        or not menu_item['is_available']):
+                    raise ValidationError({'items': [
+                        _("El ítem de menú %(id)s no está disponible en este restaurante") % {'id': menu_item_id}
+                    ]})
+                
+                quantity = int(item_data['quantity'])
+                order_items.append(OrderItem(
+                    menu_item_id=menu_item_id,
+                    quantity=quantity,
+                    subtotal=menu_item['price'] * quantity,
+                    note=item_data.get('note', None),
+                    is_active=True
+                ))
+            
             # Crear orden en estado "pending"
             order = Order(
                 customer_id=order_data.customer_id,
                 restaurant_id=order_data.restaurant_id,
                 status="pending",
-                total_amount=order_data.total_amount,
+                total_amount=sum(item.subtotal for item in order_items),
                 delivery_address=order_data.delivery_address,
                 special_instructions=order_data.special_instructions,
                 estimated_delivery_time=order_data.estimated_delivery_time,
                 is_active=order_data.is_active
             )
             
-            # Crear la orden
-            created_order = self.order_repository.create(order)
+            # Crear la orden y sus ítems en batch
+            created_order = self.order_repository.create(order, order_items)
             
-            # Crear los ítems de la orden
-            order_items = []
-            for item_data in order_data.items:
-                order_item = OrderItem(
-                    order=created_order,
-                    menu_item_id=item_data['menu_item_id'],
-                    quantity=item_data['quantity'],
-                    subtotal=item_data['subtotal'],
-                    note=item_data.get('note', None),
-                    is_active=True
-                )
-                order_items.append(order_item)
-            
-            # Crear los ítems en batch para optimizar
-            self.order_item_repository.create_batch(order_items)
-            
-            # Recargar la orden con sus ítems para devolver
-            complete_order = self.order_repository.get_by_id(created_order.id)
-            return OrderDTOSerializer(self._to_dto(complete_order)).data
+            # La respuesta se arma con los objetos en memoria, sin recargar la orden
+            return OrderDTOSerializer(self._to_dto(created_order, order_items)).data
             
         except ValidationError as e:
             # Centralizar manejo de errores de validación
@@ -164,24 +211,46 @@ class OrderService:
         # Marcamos como inactiva la orden
         return self.order_repository.delete(order_id)
     
-    def _to_dto(self, model: Order) -> OrderDTO:
+    def archive_orders(self, before: datetime, batch_size: int = 1000) -> int:
+        """Archiva un lote de órdenes inactivas o cerradas creadas antes de `before`"""
+        orders = self.order_repository.get_archivable(before, batch_size)
+        if not orders:
+            return 0
+        
+        # se guarda la representación de la API con todos los ítems y su
+        # is_active: las filas de ORDER_ITEMS se borran. El lote se serializa
+        # por columnas, sin un DTO ni un serializador por orden
+        batch = DTOBatch.from_objects(SlottedOrderDTO, orders, {'total_amount': float}, {
+            'order_items': [self._items_to_dtos(order.order_items.all(), SlottedOrderItemDTO) for order in orders]
+        })
+        payloads = OrderDTOSerializer(batch, many=True).data
+        return self.order_repository.archive(orders, payloads)
+    
+    def archive_all_orders(self, before: datetime, batch_size: int = 1000) -> int:
+        """Archiva por lotes todas las órdenes archivables anteriores a `before`"""
+        # cada lote es una transacción corta
+        archived = 0
+        while True:
+            count = self.archive_orders(before, batch_size)
+            archived += count
+            if count < batch_size:
+                return archived
+    
+    def _archived_to_dto(self, archived: ArchivedOrder) -> OrderDTO:
+        """Convierte una orden archivada a su DTO"""
+        data = dict(archived.data)
+        data['total_amount'] = float(data['total_amount'])
+        # como en las órdenes vivas, la API muestra solo los ítems activos
+        data['order_items'] = [
+            OrderItemDTO(**{**item, 'subtotal': float(item['subtotal'])})
+            for item in data.get('order_items') or [] if item.get('is_active', True)
+        ]
+        return OrderDTO(**data)
+    
+    def _to_dto(self, model: Order, order_items: Optional[List[OrderItem]] = None) -> OrderDTO:
         """Convierte un modelo Order a su DTO"""
         # Convertir items a DTOs
-        item_dtos = None
-        if hasattr(model, 'order_items'):
-            item_dtos = [
-                OrderItemDTO(
-                    id=item.id,
-                    order_id=item.order_id,
-                    menu_item_id=item.menu_item_id,
-                    quantity=item.quantity,
-                    subtotal=float(item.subtotal),
-                    note=item.note,
-                    is_active=item.is_active,
-                    created_at=item.created_at,
-                    updated_at=item.updated_at
-                ) for item in model.order_items.all() if item.is_active
-            ]
+        item_dtos = self._items_to_dtos(self._active_items(model) if order_items is None else order_items)
         
         # Crear DTO de la orden
         return OrderDTO(
@@ -199,6 +268,47 @@ class OrderService:
             order_items=item_dtos
         )
     
+    def _to_dto_batch(self, instances: Iterable[Any]) -> DTOBatch[SlottedOrderDTO]:
+        """
+        Convierte órdenes a un lote columnar de DTOs para listados y exportaciones.
+        Acepta modelos o filas proyectadas de list_orders(); para las filas, los
+        items de todo el lote se leen en una sola consulta.
+        """
+        instances = list(instances)
+        if instances and not isinstance(instances[0], Order):
+            items = self.order_item_repository.get_by_order_ids(
+                [row.id for row in instances], dto_fields(OrderItemDTO),
+                min(row.created_at for row in instances)
+            )
+            return DTOBatch.from_objects(SlottedOrderDTO, instances, {'total_amount': float}, {
+                'order_items': [self._items_to_dtos(items.get(row.id, []), SlottedOrderItemDTO) for row in instances]
+            })
+        return DTOBatch.from_objects(SlottedOrderDTO, instances, {'total_amount': float}, {
+            'order_items': [self._items_to_dtos(self._active_items(order), SlottedOrderItemDTO) for order in instances]
+        })
+    
+    def _active_items(self, model: Order) -> Iterable[OrderItem]:
+        """Items activos de la orden: los del Prefetch del repositorio o, sin él, una consulta"""
+        if hasattr(model, 'active_items'):
+            return model.active_items
+        return self.order_item_repository.get_by_order_id(model.id, model.created_at)
+    
+    def _items_to_dtos(self, items: Iterable[Any], dto_class: type = OrderItemDTO) -> List[Any]:
+        """DTOs de items ya filtrados; modelos o filas proyectadas. Los lotes usan la variante slotted"""
+        return [
+            dto_class(
+                id=item.id,
+                order_id=item.order_id,
+                menu_item_id=item.menu_item_id,
+                quantity=item.quantity,
+                subtotal=float(item.subtotal),
+                note=item.note,
+                is_active=item.is_active,
+                created_at=item.created_at,
+                updated_at=item.updated_at
+            ) for item in items
+        ]
+    
     def _to_model(self, dto: Union[OrderCreateDTO, OrderUpdateDTO, OrderDTO]) -> Order:
         """Convierte un DTO a modelo Order"""
         model = Order()
@@ -0,0 +1,281 @@
+import json
+import logging
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext as _
+from rest_framework.exceptions import ValidationError
+
+from apps.restaurants.models import Restaurant
+from apps.users.models import User
+from .dependencies import get_order_service
+from .models import Order, OrderItem
+from .partitions import add_months, detach_partitions, ensure_partitions
+from .repositories import OrderRepository, OrderItemRepository
+
+logger = logging.getLogger(__name__)
+
+BULK_ORDERS_LIMIT = 50000
+BULK_ORDERS_BATCH_SIZE = 1000
+VALID_STATUSES = {value for value, _label in Order._meta.get_field('status').choices}
+
+
+def _amount_limit(model, name):
+    """Límite exclusivo de un DecimalField: max_digits - decimal_places dígitos enteros"""
+    field = model._meta.get_field(name)
+    return Decimal(10) ** (field.max_digits - field.decimal_places)
+
+
+SUBTOTAL_LIMIT = _amount_limit(OrderItem, 'subtotal')
+TOTAL_LIMIT = _amount_limit(Order, 'total_amount')
+
+
+def _max_quantity():
+    """Mayor cantidad que admite la columna en la base configurada"""
+    field = OrderItem._meta.get_field('quantity')
+    return connection.ops.integer_field_range(field.get_internal_type())[1]
+
+
+def _parse_lines(file_content):
+    """Decodifica el NDJSON; las líneas inválidas se reportan como errores"""
+    rows, errors = [], []
+    for i, line in enumerate(file_content.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError(_("Cada línea debe ser un objeto JSON"))
+            rows.append((i, row))
+        except ValueError as e:
+            errors.append({'line': i, 'error': str(e)})
+    return rows, errors
+
+
+def _as_int(value, field):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError(_("El campo {} debe ser un número entero").format(field))
+
+
+def _id_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_text(value, field, max_length=None):
+    """Campo de texto opcional; otro tipo haría fallar el bulk_create de todo el lote"""
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ValidationError(_("El campo {} debe ser un texto").format(field))
+    if max_length and len(value) > max_length:
+        raise ValidationError(_("El campo {} excede {} caracteres").format(field, max_length))
+    return value
+
+
+@shared_task(bind=True, max_retries=3)
+def process_bulk_orders(self, file_content, task_id):
+    """
+    Procesa un archivo NDJSON (una orden JSON por línea) para creación masiva de órdenes
+    Args:
+        file_content (str): Contenido del archivo NDJSON
+        task_id (str): ID de la tarea para seguimiento
+    Returns:
+        dict: Resultado del procesamiento
+    """
+    results = {
+        'task_id': task_id,
+        'total': 0,
+        'success': 0,
+        'errors': [],
+        'details': []
+    }
+
+    # tras create_batch las órdenes ya están confirmadas: un reintento las duplicaría
+    written = False
+    try:
+        rows, results['errors'] = _parse_lines(file_content)
+        results['total'] = len(rows) + len(results['errors'])
+
+        if results['total'] > BULK_ORDERS_LIMIT:
+            results['errors'] = [{
+                'line': 0,
+                'error': _("Límite de {} órdenes por tarea excedido").format(BULK_ORDERS_LIMIT)
+            }]
+            cache.set(f'bulk_order_task_{task_id}', results, timeout=3600)
+            return results
+
+        # ids referenciados en todo el archivo: una consulta por tabla. Se
+        # convierten igual que en _as_int ("5" es el id 5); los inválidos se
+        # reportan luego en su fila
+        customer_ids, restaurant_ids, menu_item_ids = set(), set(), set()
+        for _line, row in rows:
+            customer_ids.add(_id_or_none(row.get('customer_id')))
+            restaurant_ids.add(_id_or_none(row.get('restaurant_id')))
+            items_data = row.get('items')
+            if isinstance(items_data, list):
+                for item in items_data:
+                    if isinstance(item, dict):
+                        menu_item_ids.add(_id_or_none(item.get('menu_item_id')))
+
+        valid_customer_ids = set(User.objects.filter(
+            id__in=customer_ids - {None}, is_active=True
+        ).values_list('id', flat=True))
+        valid_restaurant_ids = set(Restaurant.objects.filter(
+            id__in=restaurant_ids - {None}
+        ).values_list('id', flat=True))
+        menu_items = OrderItemRepository().get_menu_item_prices(list(menu_item_ids - {None}))
+        # una fila fuera de rango haría fallar el INSERT de todo el lote
+        max_quantity = _max_quantity()
+
+        orders, order_items, lines = [], [], []
+        for i, row in rows:
+            try:
+                customer_id = _as_int(row.get('customer_id'), 'customer_id')
+                if customer_id not in valid_customer_ids:
+                    raise ValidationError(_("El customer_id no es válido"))
+
+                restaurant_id = _as_int(row.get('restaurant_id'), 'restaurant_id')
+                if restaurant_id not in valid_restaurant_ids:
+                    raise ValidationError(_("El restaurant_id no es válido"))
+
+                order_status = row.get('status') or 'pending'
+                if order_status not in VALID_STATUSES:
+                    raise ValidationError(_("Estado inválido. Debe ser uno de: pending, completed, cancelled"))
+
+                estimated_delivery_time = row.get('estimated_delivery_time')
+                if estimated_delivery_time:
+                    estimated_delivery_time = parse_datetime(estimated_delivery_time)
+                    if estimated_delivery_time is None:
+                        raise ValidationError(_("El campo estimated_delivery_time no es una fecha válida"))
+
+                delivery_address = _as_text(row.get('delivery_address'), 'delivery_address', 255)
+                special_instructions = _as_text(row.get('special_instructions'), 'special_instructions')
+
+                items_data = row.get('items')
+                if not isinstance(items_data, list) or not items_data:
+                    raise ValidationError(_("Se requiere al menos un ítem para crear una orden"))
+
+                # subtotales con el precio actual del menú, igual que create_order
+                items = []
+                for item_data in items_data:
+                    if not isinstance(item_data, dict):
+                        raise ValidationError(_("Cada ítem debe contener menu_item_id y quantity"))
+                    menu_item_id = _as_int(item_data.get('menu_item_id'), 'menu_item_id')
+                    quantity = _as_int(item_data.get('quantity'), 'quantity')
+                    if quantity <= 0:
+                        raise ValidationError(_("La cantidad debe ser mayor a cero"))
+                    if quantity > max_quantity:
+                        raise ValidationError(_("La cantidad excede el máximo de {}").format(max_quantity))
+
+                    menu_item = menu_items.get(menu_item_id)
+                    if (not menu_item
+                            or menu_item['restaurant_id'] != restaurant_id
+                            or not menu_item['is_active']
+                            or not menu_item['is_available']):
+                        raise ValidationError(
+                            _("El ítem de menú {} no está disponible en este restaurante").format(menu_item_id))
+
+                    subtotal = menu_item['price'] * quantity
+                    if subtotal >= SUBTOTAL_LIMIT:
+                        raise ValidationError(_("El subtotal del ítem {} excede el máximo permitido").format(menu_item_id))
+
+                    items.append(OrderItem(
+                        menu_item_id=menu_item_id,
+                        quantity=quantity,
+                        subtotal=subtotal,
+                        note=_as_text(item_data.get('note'), 'note'),
+                        is_active=True
+                    ))
+
+                total_amount = sum(item.subtotal for item in items)
+                if total_amount >= TOTAL_LIMIT:
+                    raise ValidationError(_("El total de la orden excede el máximo permitido"))
+
+                orders.append(Order(
+                    customer_id=customer_id,
+                    restaurant_id=restaurant_id,
+                    status=order_status,
+                    total_amount=total_amount,
+                    delivery_address=delivery_address,
+                    special_instructions=special_instructions,
+                    estimated_delivery_time=estimated_delivery_time,
+                    is_active=True
+                ))
+                order_items.append(items)
+                lines.append(i)
+
+            except ValidationError as e:
+                detail = e.detail[0] if isinstance(e.detail, list) else e.detail
+                results['errors'].append({'line': i, 'error': str(detail)})
+            except (TypeError, ValueError) as e:
+                # valores de otro tipo (una fecha numérica, un estado como lista): la
+                # fila es inválida, no un fallo de la tarea que amerite reintentos
+                results['errors'].append({'line': i, 'error': str(e)})
+
+        if orders:
+            OrderRepository().create_batch(orders, order_items, batch_size=BULK_ORDERS_BATCH_SIZE)
+            written = True
+            results['success'] = len(orders)
+            results['details'] = [
+                {'line': line, 'order_id': order.id, 'status': 'success'}
+                for line, order in zip(lines, orders)
+            ]
+
+        results['errors'].sort(key=lambda error: error['line'])
+        cache.set(f'bulk_order_task_{task_id}', results, timeout=3600)
+        return results
+
+    except Exception as e:
+        error_detail = str(e)
+        results['errors'].append({'line': 0, 'error': error_detail})
+        try:
+            cache.set(f'bulk_order_task_{task_id}', results, timeout=3600)
+        except Exception as cache_error:
+            logger.warning(f"No se pudo guardar el resultado de la tarea {task_id}: {str(cache_error)}")
+        if written:
+            logger.error(f"Tarea {task_id}: {results['success']} órdenes creadas, sin reintento: {error_detail}")
+            return results
+        raise self.retry(exc=e)
+
+
+@shared_task
+def maintain_order_partitions():
+    """
+    Crea las particiones de los próximos meses y separa las que exceden la
+    retención, después de archivar sus órdenes: solo se separan vacías
+    """
+    config = getattr(settings, 'ORDER_PARTITIONS', {})
+    created = ensure_partitions(config.get('MONTHS_AHEAD', 3))
+
+    archived, detached = 0, []
+    if config.get('RETENTION_MONTHS'):
+        before = add_months(date.today(), -config['RETENTION_MONTHS'])
+        batch_size = getattr(settings, 'ORDER_ARCHIVE', {}).get('BATCH_SIZE', 1000)
+        archived = get_order_service().archive_all_orders(datetime.combine(before, time.min), batch_size)
+        detached = detach_partitions(before)
+
+    logger.info(f"Particiones creadas: {created}; órdenes archivadas: {archived}; separadas: {detached}")
+    return {'created': created, 'archived': archived, 'detached': detached}
+
+
+@shared_task
+def archive_orders():
+    """
+    Mueve a ORDERS_ARCHIVE las órdenes inactivas o cerradas más antiguas que
+    ORDER_ARCHIVE['AFTER_DAYS'], por lotes, para que ORDERS conserve solo las recientes
+    """
+    config = getattr(settings, 'ORDER_ARCHIVE', {})
+    before = datetime.now() - timedelta(days=config.get('AFTER_DAYS', 180))
+    archived = get_order_service().archive_all_orders(before, config.get('BATCH_SIZE', 1000))
+
+    logger.info(f"Órdenes archivadas: {archived}")
+    return {'archived': archived}
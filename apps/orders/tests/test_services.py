@@ -0,0 +1,128 @@
+from decimal import Decimal
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.core.exceptions import ValidationException
+from apps.menu.models import MenuItem
+from apps.orders.dtos import OrderCreateDTO
+from apps.orders.models import Order
+from apps.orders.serializers import OrderDTOSerializer
+from apps.orders.services import OrderService
+from apps.restaurants.models import Restaurant
+from apps.users.models import User
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class OrderServiceCreateTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.service = OrderService()
+        self.customer = User.objects.create_user(
+            email='cliente@example.com', first_name='Test', last_name='Cliente', phone='5550000'
+        )
+        self.restaurant = Restaurant.objects.create(
+            name='Test Restaurant', address='123 Test St', rating=4.5, status='open',
+            category='italian', latitude=10.0, longitude=-10.0
+        )
+        self.pizza = MenuItem.objects.create(
+            name='Pizza', description='Pizza', price=Decimal('12.50'), preparation_time=20,
+            category='main', restaurant=self.restaurant
+        )
+        self.soda = MenuItem.objects.create(
+            name='Soda', description='Soda', price=Decimal('2.00'), preparation_time=1,
+            category='drinks', restaurant=self.restaurant
+        )
+
+    def test_create_order_prices_items_on_server(self):
+        """Test que el total y los subtotales se calculan con los precios del menú"""
+        data = self.service.create_order(OrderCreateDTO(
+            customer_id=self.customer.id,
+            restaurant_id=self.restaurant.id,
+            total_amount=1,  # ignorado
+            items=[
+                {'menu_item_id': self.pizza.id, 'quantity': 2, 'subtotal': 1},
+                {'menu_item_id': self.soda.id, 'quantity': 3},
+            ]
+        ))
+
+        self.assertEqual(data['total_amount'], '31.00')
+        self.assertEqual([item['subtotal'] for item in data['order_items']], ['25.00', '6.00'])
+        self.assertEqual(Order.objects.get(id=data['id']).total_amount, Decimal('31.00'))
+        print("✅ Test precios calculados en el servidor válido")
+
+    def test_create_order_rejects_unavailable_items(self):
+        """Test que no se aceptan ítems no disponibles"""
+        self.soda.is_available = False
+        self.soda.save()
+
+        with self.assertRaises(ValidationException):
+            self.service.create_order(OrderCreateDTO(
+                customer_id=self.customer.id,
+                restaurant_id=self.restaurant.id,
+                items=[{'menu_item_id': self.soda.id, 'quantity': 1}]
+            ))
+        self.assertFalse(Order.objects.exists())
+        print("✅ Test ítem no disponible válido")
+
+    def test_aget_order_matches_get_order(self):
+        """Test que la lectura async devuelve la misma orden que la síncrona, con y sin caché"""
+        data = self.service.create_order(OrderCreateDTO(
+            customer_id=self.customer.id,
+            restaurant_id=self.restaurant.id,
+            items=[{'menu_item_id': self.pizza.id, 'quantity': 1}]
+        ))
+        expected = OrderDTOSerializer(self.service.get_order(data['id'])).data
+
+        cache.clear()
+        for _ in range(2):
+            order = async_to_sync(self.service.aget_order)(data['id'])
+            self.assertEqual(OrderDTOSerializer(order).data, expected)
+        print("✅ Test lectura async de órdenes válido")
+
+    def test_list_orders_projection_matches_models(self):
+        """Test que el listado proyectado serializa igual que los modelos Order"""
+        for quantity in (1, 2):
+            self.service.create_order(OrderCreateDTO(
+                customer_id=self.customer.id,
+                restaurant_id=self.restaurant.id,
+                items=[
+                    {'menu_item_id': self.pizza.id, 'quantity': quantity},
+                    {'menu_item_id': self.soda.id, 'quantity': 1},
+                ]
+            ))
+        Order.objects.first().order_items.filter(menu_item=self.soda).update(is_active=False)
+
+        rows = list(self.service.list_orders())
+        self.assertFalse(any(isinstance(row, Order) for row in rows))
+        self.assertEqual(len(rows), 2)
+        models = [Order.objects.get(id=row.id) for row in rows]
+
+        with self.assertNumQueries(1):
+            batch = self.service._to_dto_batch(rows)
+        self.assertEqual(
+            OrderDTOSerializer(batch, many=True).data,
+            OrderDTOSerializer([self.service._to_dto(order) for order in models], many=True).data
+        )
+        print("✅ Test listado de órdenes proyectado válido")
+
+    def test_read_before_commit_is_not_served_after_commit(self):
+        """Test que lo cacheado entre la escritura y el commit se descarta al confirmar"""
+        data = self.service.create_order(OrderCreateDTO(
+            customer_id=self.customer.id,
+            restaurant_id=self.restaurant.id,
+            items=[{'menu_item_id': self.pizza.id, 'quantity': 1}]
+        ))
+        stale = self.service.order_repository.get_by_id(data['id'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.update_order(data['id'], {'status': 'completed'})
+            # un lector concurrente todavía ve la fila sin confirmar y la cachea
+            versions = self.service.orders_page_versions({})
+            cache.set(f"order_{data['id']}", stale)
+            self.service.cache_orders_page({}, 1, 20, [stale], {'results': []}, versions)
+            self.assertEqual(self.service.get_order(data['id']).status, 'pending')
+
+        self.assertEqual(self.service.get_order(data['id']).status, 'completed')
+        self.assertIsNone(self.service.get_cached_orders_page({}, 1, 20))
+        print("✅ Test invalidación al confirmar válido")
@@ -0,0 +1,247 @@
+import json
+from datetime import date, datetime, timedelta
+from unittest import mock, skipUnless
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from apps.menu.models import MenuItem
+from apps.orders.dependencies import get_order_service
+from apps.orders.models import ArchivedOrder, Order, OrderItem
+from apps.orders.partitions import add_months, ensure_partitions, partition_name
+from apps.orders.serializers import OrderDTOSerializer
+from apps.orders.tasks import archive_orders, maintain_order_partitions, process_bulk_orders
+from apps.reports.models import DailySalesRollup
+from apps.reports.repositories import DailySalesRollupRepository
+from apps.restaurants.models import Restaurant
+from apps.users.models import User
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class BulkOrdersTaskTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.customer = User.objects.create_user(
+            email='cliente@example.com', first_name='Test', last_name='Cliente', phone='5550000'
+        )
+        self.restaurant = Restaurant.objects.create(
+            name='Test Restaurant', address='123 Test St', rating=4.5, status='open',
+            category='italian', latitude=10.0, longitude=-10.0
+        )
+        self.pizza = MenuItem.objects.create(
+            name='Pizza', description='Pizza', price=Decimal('12.50'), preparation_time=20,
+            category='main', restaurant=self.restaurant
+        )
+
+    def test_bulk_orders_reports_errors_per_line(self):
+        """Test que la carga masiva inserta las filas válidas y reporta errores por línea"""
+        valid = {
+            'customer_id': self.customer.id,
+            'restaurant_id': self.restaurant.id,
+            'items': [{'menu_item_id': self.pizza.id, 'quantity': 2}]
+        }
+        content = "\n".join([
+            json.dumps(valid),
+            'no es json',
+            json.dumps({**valid, 'customer_id': 0}),
+            json.dumps({**valid, 'items': [{'menu_item_id': 0, 'quantity': 1}]}),
+            json.dumps(valid),
+        ])
+
+        results = process_bulk_orders.run(content, 'test')
+
+        self.assertEqual(results['total'], 5)
+        self.assertEqual(results['success'], 2)
+        self.assertEqual([error['line'] for error in results['errors']], [2, 3, 4])
+        self.assertEqual(
+            list(Order.objects.values_list('total_amount', flat=True)),
+            [Decimal('25.00'), Decimal('25.00')]
+        )
+        self.assertEqual(cache.get('bulk_order_task_test'), results)
+        print("✅ Test carga masiva de órdenes válido")
+
+    def test_bulk_orders_reports_wrong_types_per_line(self):
+        """Test que los valores de otro tipo invalidan su línea sin abortar el lote"""
+        valid = {
+            'customer_id': str(self.customer.id),
+            'restaurant_id': self.restaurant.id,
+            'items': [{'menu_item_id': str(self.pizza.id), 'quantity': '2'}]
+        }
+        content = "\n".join([
+            json.dumps(valid),
+            json.dumps({**valid, 'estimated_delivery_time': 123}),
+            json.dumps({**valid, 'customer_id': [self.customer.id]}),
+            json.dumps({**valid, 'status': ['pending']}),
+            json.dumps({**valid, 'delivery_address': {'calle': 1}}),
+            json.dumps({**valid, 'items': 'pizza'}),
+        ])
+
+        results = process_bulk_orders.run(content, 'test')
+
+        self.assertEqual(results['success'], 1)
+        self.assertEqual([error['line'] for error in results['errors']], [2, 3, 4, 5, 6])
+        self.assertEqual(Order.objects.get().customer_id, self.customer.id)
+        print("✅ Test carga masiva con tipos inválidos válido")
+
+    def test_bulk_orders_reports_out_of_range_rows(self):
+        """Test que cantidades y montos fuera del rango de las columnas invalidan solo su línea"""
+        valid = {
+            'customer_id': self.customer.id,
+            'restaurant_id': self.restaurant.id,
+            'items': [{'menu_item_id': self.pizza.id, 'quantity': 1}]
+        }
+        content = "\n".join([
+            json.dumps(valid),
+            json.dumps({**valid, 'items': [{'menu_item_id': self.pizza.id, 'quantity': 10 ** 19}]}),
+            json.dumps({**valid, 'items': [{'menu_item_id': self.pizza.id, 'quantity': 8000000}]}),
+            json.dumps({**valid, 'items': [{'menu_item_id': self.pizza.id, 'quantity': 4800000}] * 2}),
+        ])
+
+        results = process_bulk_orders.run(content, 'test')
+
+        self.assertEqual(results['success'], 1)
+        self.assertEqual([error['line'] for error in results['errors']], [2, 3, 4])
+        print("✅ Test carga masiva con valores fuera de rango válido")
+
+    def test_bulk_orders_not_retried_after_insert(self):
+        """Test que un fallo posterior al INSERT no reintenta la tarea ni duplica órdenes"""
+        content = json.dumps({
+            'customer_id': self.customer.id,
+            'restaurant_id': self.restaurant.id,
+            'items': [{'menu_item_id': self.pizza.id, 'quantity': 1}]
+        })
+
+        with mock.patch('apps.orders.tasks.cache') as task_cache, \
+                mock.patch.object(process_bulk_orders, 'retry') as retry:
+            task_cache.set.side_effect = ConnectionError('redis no disponible')
+            results = process_bulk_orders.run(content, 'test')
+
+        retry.assert_not_called()
+        self.assertEqual(results['success'], 1)
+        self.assertEqual(Order.objects.count(), 1)
+        print("✅ Test carga masiva sin reintento tras insertar válido")
+
+    @override_settings(ORDER_ARCHIVE={'AFTER_DAYS': 30, 'BATCH_SIZE': 1})
+    def test_archive_orders_moves_closed_orders(self):
+        """Test que el archivo mueve las órdenes cerradas antiguas y se siguen leyendo por id"""
+        line = {
+            'customer_id': self.customer.id,
+            'restaurant_id': self.restaurant.id,
+            'items': [{'menu_item_id': self.pizza.id, 'quantity': 2}]
+        }
+        content = "\n".join(
+            json.dumps({**line, 'status': order_status})
+            for order_status in ['completed', 'cancelled', 'pending', 'completed']
+        )
+        process_bulk_orders.run(content, 'test')
+        old, cancelled, pending, recent = Order.objects.order_by('id')
+        Order.objects.exclude(id=recent.id).update(created_at=datetime.now() - timedelta(days=60))
+        DailySalesRollupRepository().rebuild()
+        rollups = sorted(DailySalesRollup.objects.values_list('date', 'status', 'order_count'))
+        before = OrderDTOSerializer(get_order_service().get_order(old.id)).data
+
+        results = archive_orders.run()
+
+        self.assertEqual(results, {'archived': 2})
+        self.assertEqual(set(Order.objects.values_list('id', flat=True)), {pending.id, recent.id})
+        self.assertFalse(OrderItem.objects.filter(order_id__in=[old.id, cancelled.id]).exists())
+        self.assertEqual(set(ArchivedOrder.objects.values_list('id', flat=True)), {old.id, cancelled.id})
+        self.assertEqual(OrderDTOSerializer(get_order_service().get_order(old.id)).data, before)
+
+        # el agregado diario conserva las ventas archivadas
+        self.assertEqual(sorted(DailySalesRollup.objects.values_list('date', 'status', 'order_count')), rollups)
+        DailySalesRollupRepository().rebuild()
+        self.assertEqual(sorted(DailySalesRollup.objects.values_list('date', 'status', 'order_count')), rollups)
+        print("✅ Test archivo de órdenes válido")
+
+    @override_settings(ORDER_ARCHIVE={'AFTER_DAYS': 30, 'BATCH_SIZE': 10})
+    def test_archive_keeps_items_of_deleted_orders(self):
+        """Test que el archivo conserva los ítems inactivos de las órdenes eliminadas"""
+        line = {
+            'customer_id': self.customer.id,
+            'restaurant_id': self.restaurant.id,
+            'items': [{'menu_item_id': self.pizza.id, 'quantity': 2}]
+        }
+        process_bulk_orders.run(json.dumps(line), 'test')
+        order = Order.objects.get()
+        item_id = order.order_items.get().id
+        get_order_service().delete_order(order.id)
+        Order.objects.update(created_at=datetime.now() - timedelta(days=60))
+
+        self.assertEqual(archive_orders.run(), {'archived': 1})
+
+        items = ArchivedOrder.objects.get(id=order.id).data['order_items']
+        self.assertEqual([(item['id'], item['is_active']) for item in items], [(item_id, False)])
+        # la API sigue mostrando solo los ítems activos
+        self.assertEqual(get_order_service().get_order(order.id).order_items, [])
+        print("✅ Test archivo de órdenes eliminadas válido")
+
+
+@skipUnless(connection.vendor == 'postgresql', 'ORDERS solo está particionada en PostgreSQL')
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class OrderPartitionsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        customer = User.objects.create_user(
+            email='cliente@example.com', first_name='Test', last_name='Cliente', phone='5550000'
+        )
+        restaurant = Restaurant.objects.create(
+            name='Test Restaurant', address='123 Test St', rating=4.5, status='open',
+            category='italian', latitude=10.0, longitude=-10.0
+        )
+        pizza = MenuItem.objects.create(
+            name='Pizza', description='Pizza', price=Decimal('12.50'), preparation_time=20,
+            category='main', restaurant=restaurant
+        )
+        self.line = {
+            'customer_id': customer.id,
+            'restaurant_id': restaurant.id,
+            'items': [{'menu_item_id': pizza.id, 'quantity': 1}]
+        }
+
+    def _create_orders_in(self, month, *statuses):
+        """Órdenes de un mes sin partición: caen en la partición por defecto"""
+        content = "\n".join(json.dumps({**self.line, 'status': status}) for status in statuses)
+        process_bulk_orders.run(content, 'test')
+        created_at = datetime(month.year, month.month, 15)
+        Order.objects.update(created_at=created_at)
+        OrderItem.objects.update(created_at=created_at)
+
+    def test_ensure_partitions_moves_rows_from_default(self):
+        """Test que crear la partición de un mes con filas en la partición por defecto las mueve"""
+        month = add_months(date.today(), 24)
+        self._create_orders_in(month, 'pending')
+
+        created = ensure_partitions(0, today=month)
+
+        self.assertEqual(created, [partition_name(table, month) for table in ('ORDERS', 'ORDER_ITEMS')])
+        with connection.cursor() as cursor:
+            for name in created:
+                cursor.execute(f'SELECT count(*) FROM {connection.ops.quote_name(name)}')
+                self.assertEqual(cursor.fetchone()[0], 1)
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(OrderItem.objects.count(), 1)
+        print("✅ Test particiones con filas en la partición por defecto válido")
+
+    @override_settings(ORDER_PARTITIONS={'MONTHS_AHEAD': 0, 'RETENTION_MONTHS': 12})
+    def test_retention_archives_before_detaching(self):
+        """Test que la retención archiva las órdenes y solo separa particiones vacías"""
+        month = add_months(date.today(), -24)
+        self._create_orders_in(month, 'pending', 'completed')
+        ensure_partitions(0, today=month)
+
+        result = maintain_order_partitions.run()
+
+        # la orden pendiente no se archiva: su partición se conserva
+        self.assertEqual((result['archived'], result['detached']), (1, []))
+        self.assertEqual(ArchivedOrder.objects.get().status, 'completed')
+        self.assertEqual(Order.objects.get().status, 'pending')
+
+        Order.objects.update(status='cancelled')
+        result = maintain_order_partitions.run()
+
+        self.assertEqual(result['archived'], 1)
+        self.assertEqual(result['detached'], [partition_name(table, month) for table in ('ORDERS', 'ORDER_ITEMS')])
+        self.assertEqual(ArchivedOrder.objects.count(), 2)
+        print("✅ Test retención de particiones válido")
@@ -0,0 +1,91 @@
+from decimal import Decimal
+from unittest import mock
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.menu.models import MenuItem
+from apps.orders.models import Order, OrderItem
+from apps.orders.serializers import BulkOrderUploadSerializer
+from apps.restaurants.models import Restaurant
+from apps.users.models import User
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class OrderListQueryCountTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        restaurant = Restaurant.objects.create(
+            name='Test Restaurant', address='123 Test St', rating=4.5, status='open',
+            category='italian', latitude=10.0, longitude=-10.0
+        )
+        pizza = MenuItem.objects.create(
+            name='Pizza', description='Pizza', price=Decimal('12.50'), preparation_time=20,
+            category='main', restaurant=restaurant
+        )
+        admin = User.objects.create_user(
+            email='admin@example.com', first_name='Admin', last_name='User', phone='5550000', is_superuser=True
+        )
+        for _ in range(25):
+            order = Order.objects.create(
+                customer=admin, restaurant=restaurant, total_amount=Decimal('12.50'), status='pending'
+            )
+            OrderItem.objects.create(order=order, menu_item=pizza, quantity=1, subtotal=Decimal('12.50'))
+            OrderItem.objects.create(order=order, menu_item=pizza, quantity=2, subtotal=Decimal('25.00'),
+                                     is_active=False)
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def _count_queries(self, url):
+        # cada tamaño de página es otra clave: ninguna respuesta sale de la caché de páginas
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()['items']
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        """Test que el listado de órdenes hace las mismas consultas con 5 o 20 órdenes por página"""
+        for url in ('/orders/?page_size={}', '/orders/?cursor=&page_size={}'):
+            small, small_items = self._count_queries(url.format(5))
+            large, large_items = self._count_queries(url.format(20))
+
+            self.assertEqual((len(small_items), len(large_items)), (5, 20))
+            self.assertEqual(small, large)
+            self.assertLessEqual(large, 6)
+            # solo los items activos, filtrados en SQL
+            self.assertTrue(all(
+                [item['quantity'] for item in order['order_items']] == [1] for order in large_items
+            ))
+        print("✅ Test consultas constantes en el listado de órdenes válido")
+
+
+class BulkOrderUploadViewTest(TestCase):
+    def setUp(self):
+        admin = User.objects.create_user(
+            email='admin@example.com', first_name='Admin', last_name='User', phone='5550000', is_superuser=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def _post(self, body):
+        with mock.patch('apps.orders.views.order_views.process_bulk_orders.delay') as delay:
+            response = self.client.post('/orders/bulk/', body, content_type='application/x-ndjson')
+        return response, delay
+
+    def test_ndjson_body_is_limited_and_decoded_safely(self):
+        """Test que el cuerpo NDJSON respeta el límite de tamaño y rechaza bytes que no son UTF-8"""
+        with mock.patch.object(BulkOrderUploadSerializer, 'max_size', 10):
+            response, delay = self._post(b'{"customer_id": 1}')
+        self.assertEqual(response.status_code, 400)
+        delay.assert_not_called()
+
+        response, delay = self._post(b'\xff\xfe{}')
+        self.assertEqual(response.status_code, 400)
+        delay.assert_not_called()
+
+        response, delay = self._post(b'{"customer_id": 1}')
+        self.assertEqual(response.status_code, 202)
+        delay.assert_called_once()
+        print("✅ Test límite del cuerpo NDJSON válido")
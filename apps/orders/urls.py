@@ -1,7 +1,13 @@
 from django.urls import path
-from .views.order_views import OrderListCreateAPIView, OrderRetrieveUpdateDestroyAPIView
+from .views.order_views import (
+    OrderListCreateAPIView, OrderRetrieveUpdateDestroyAPIView,
+    BulkOrderCreateAPIView, BulkOrderTaskStatusAPIView
+)
 
 urlpatterns = [
     path('', OrderListCreateAPIView.as_view(), name='order-list-create'),
-    path('<int:order_id>/', OrderRetrieveUpdateDestroyAPIView.as_view(), name='order-detail')
+    path('<int:order_id>/', OrderRetrieveUpdateDestroyAPIView.as_view(), name='order-detail'),
+
+    path('bulk/', BulkOrderCreateAPIView.as_view(), name='bulk-order-create'),
+    path('bulk/status/<str:task_id>/', BulkOrderTaskStatusAPIView.as_view(), name='bulk-order-status')
 ]
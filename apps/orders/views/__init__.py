@@ -1,3 +1,13 @@
-from .order_views import OrderListCreateAPIView, OrderRetrieveUpdateDestroyAPIView
+from .order_views import (
+    OrderListCreateAPIView,
+    OrderRetrieveUpdateDestroyAPIView,
+    BulkOrderCreateAPIView,
+    BulkOrderTaskStatusAPIView
+)
 
-__all__ = ['OrderListCreateAPIView', 'OrderRetrieveUpdateDestroyAPIView']
+__all__ = [
+    'OrderListCreateAPIView',
+    'OrderRetrieveUpdateDestroyAPIView',
+    'BulkOrderCreateAPIView',
+    'BulkOrderTaskStatusAPIView'
+]
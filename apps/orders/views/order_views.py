@@ -1,21 +1,29 @@
+import uuid
+from adrf.views import APIView as AsyncAPIView
+from asgiref.sync import sync_to_async
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.exceptions import NotFound
+from django.http import HttpResponse
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
 
 from apps.core.decorators import permission_required
 from apps.core.exceptions import ValidationException
+from apps.core.pagination import KeysetPaginationMixin
 from apps.orders.dependencies import get_order_service
+from apps.orders.tasks import process_bulk_orders
 
-from ..serializers import OrderDTOSerializer
+from ..serializers import OrderDTOSerializer, BulkOrderUploadSerializer
 from ..dtos import OrderCreateDTO
 
 # Obtener servicio
 service = get_order_service()
 
 
-class OrderListCreateAPIView(APIView):
+class OrderListCreateAPIView(KeysetPaginationMixin, APIView):
     pagination_class = PageNumberPagination
     
     @property
@@ -53,19 +61,49 @@ class OrderListCreateAPIView(APIView):
                 filters.pop('page')
             if 'page_size' in filters:
                 filters.pop('page_size')
+            if 'cursor' in filters:
+                filters.pop('cursor')
+            if 'include_total' in filters:
+                filters.pop('include_total')
+            
+            # las paginas JSON ya serializadas se sirven directo desde cache
+            page_number = request.query_params.get('page', 1)
+            if self.use_keyset_pagination():
+                page_number = 'cursor:{}:{}'.format(
+                    request.query_params.get('cursor'),
+                    request.query_params.get('include_total', '')
+                )
+            use_cache = request.accepted_renderer.format == 'json'
+            if use_cache:
+                cached = service.get_cached_orders_page(filters, page_number, self.paginator.page_size)
+                if cached is not None:
+                    return HttpResponse(cached, content_type='application/json')
+                # antes de la consulta: una invalidación durante ella deja la página vencida
+                versions = service.orders_page_versions(filters)
             
             # obtener queryset filtrado
             queryset = service.list_orders(filters=filters)
             
-            # paginacion
-            page = self.paginate_queryset(queryset)
+            # paginacion por cursor (?cursor=) o por numero de pagina
+            if self.use_keyset_pagination():
+                page = self.paginate_keyset(queryset)
+            else:
+                page = self.paginate_queryset(queryset)
             if page is not None:
-                # convertir a DTOs y serializar
-                dto_items = [service._to_dto(item) for item in page]
+                # convertir a un lote de DTOs y serializar
+                dto_items = service._to_dto_batch(page)
                 serializer = OrderDTOSerializer(dto_items, many=True)
-                return self.get_paginated_response(serializer.data)
+                if self.use_keyset_pagination():
+                    response = self.get_keyset_paginated_response(serializer.data)
+                else:
+                    response = self.get_paginated_response(serializer.data)
+                if use_cache:
+                    service.cache_orders_page(
+                        filters, page_number, self.paginator.page_size, page, response.data, versions
+                    )
+                return response
             
-            dto_items = [service._to_dto(item) for item in queryset]
+            dto_items = service._to_dto_batch(queryset)
             serializer = OrderDTOSerializer(dto_items, many=True)
             return Response({
                 'items': serializer.data,
@@ -74,6 +112,11 @@ class OrderListCreateAPIView(APIView):
                 'page_size': len(dto_items)
             }, status=status.HTTP_200_OK)
             
+        except NotFound as e:
+            return Response({
+                'status': 'error',
+                'message': str(e)
+            }, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({
                 'status': 'error',
@@ -100,12 +143,17 @@ class OrderListCreateAPIView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class OrderRetrieveUpdateDestroyAPIView(APIView):
+class OrderRetrieveUpdateDestroyAPIView(AsyncAPIView):
+    """
+    Vista async: la lectura usa el ORM y la caché async. Django no mezcla
+    métodos sync y async en una vista, así que las escrituras se ejecutan
+    en un hilo con sync_to_async.
+    """
     @permission_required(['orders.view_order'])
-    def get(self, request, order_id):
+    async def get(self, request, order_id):
         try:
             # obtener orden por ID
-            order = service.get_order(order_id)
+            order = await service.aget_order(order_id)
             serializer = OrderDTOSerializer(order)
             return Response(serializer.data, status=status.HTTP_200_OK)
             
@@ -121,10 +169,10 @@ class OrderRetrieveUpdateDestroyAPIView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     @permission_required(['orders.change_order'])
-    def put(self, request, order_id):
+    async def put(self, request, order_id):
         try:
             # actualizar orden
-            response_data = service.update_order(order_id, request.data)
+            response_data = await sync_to_async(service.update_order)(order_id, request.data)
             return Response(response_data, status=status.HTTP_200_OK)
             
         except NotFound as e:
@@ -141,10 +189,10 @@ class OrderRetrieveUpdateDestroyAPIView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     @permission_required(['orders.delete_order'])
-    def delete(self, request, order_id):
+    async def delete(self, request, order_id):
         try:
             # Eliminar orden (marcar como inactiva)
-            deleted = service.delete_order(order_id)
+            deleted = await sync_to_async(service.delete_order)(order_id)
             
             if deleted:
                 return Response(status=status.HTTP_204_NO_CONTENT)
@@ -159,3 +207,71 @@ class OrderRetrieveUpdateDestroyAPIView(APIView):
                 'status': 'error',
                 'message': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class BulkOrderCreateAPIView(APIView):
+    """
+    Endpoint para creación masiva de órdenes mediante NDJSON (una orden por línea).
+    Acepta el archivo como multipart ('file') o el cuerpo como application/x-ndjson.
+    """
+    @permission_required(['orders.add_order'])
+    def post(self, request):
+        ndjson = request.content_type.startswith('application/x-ndjson')
+        if ndjson:
+            # mismo límite que el archivo multipart; CONTENT_LENGTH evita leer un cuerpo enorme
+            try:
+                declared = int(request.META.get('CONTENT_LENGTH') or 0)
+            except ValueError:
+                declared = 0
+            max_size = BulkOrderUploadSerializer.max_size
+            if declared > max_size or len(request.body) > max_size:
+                return Response({
+                    'status': 'error',
+                    'message': _("El archivo es demasiado grande (máximo 20MB)")
+                }, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            serializer = BulkOrderUploadSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+        
+        try:
+            # Leer el archivo (un cuerpo que no es UTF-8 es un 400)
+            if ndjson:
+                file_content = request.body.decode('utf-8')
+            else:
+                file_content = serializer.validated_data['file'].read().decode('utf-8')
+            
+            # Generar ID unico para la tarea
+            task_id = str(uuid.uuid4())
+            
+            # Enviar tarea a Celery
+            process_bulk_orders.delay(file_content, task_id)
+            
+            return Response({
+                'status': 'processing',
+                'message': _("El archivo está siendo procesado"),
+                'task_id': task_id,
+                'monitor_url': f'/orders/bulk/status/{task_id}'
+            }, status=status.HTTP_202_ACCEPTED)
+            
+        except Exception as e:
+            return Response({
+                'status': 'error',
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+
+class BulkOrderTaskStatusAPIView(APIView):
+    """
+    Endpoint para consultar estado de tareas de carga masiva de órdenes
+    """
+    @permission_required(['orders.view_order'])
+    def get(self, request, task_id):
+        results = cache.get(f'bulk_order_task_{task_id}')
+        
+        if not results:
+            return Response({
+                'status': 'not_found',
+                'message': _("Tarea no encontrada o expirada")
+            }, status=status.HTTP_404_NOT_FOUND)
+            
+        return Response(results, status=status.HTTP_200_OK)
@@ -0,0 +1,63 @@
+import csv
+from typing import Iterable, Iterator, Optional
+from django.core.files import File
+
+
+class _Echo:
+    """Pseudo-buffer: csv.writer devuelve cada línea en vez de acumularla"""
+
+    def write(self, value):
+        return value
+
+
+class CsvStream(File):
+    """
+    Archivo de solo lectura que genera un CSV a medida que el storage lo consume.
+
+    Las filas se piden al iterable solo cuando se lee el siguiente bloque, así
+    el reporte completo nunca está en memoria ni pasa por un archivo temporal.
+    """
+
+    def __init__(self, rows: Iterable[Iterable], name: str, encoding: str = 'utf-8'):
+        super().__init__(None, name)
+        self._writer = csv.writer(_Echo())
+        self._rows = iter(rows)
+        self._encoding = encoding
+        self._buffer = b''
+
+    def read(self, size: int = -1) -> bytes:
+        parts = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            try:
+                row = next(self._rows)
+            except StopIteration:
+                break
+            line = self._writer.writerow(row).encode(self._encoding)
+            parts.append(line)
+            length += len(line)
+
+        data = b''.join(parts)
+        if size < 0 or length <= size:
+            self._buffer = b''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+    def chunks(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        while True:
+            data = self.read(chunk_size)
+            if not data:
+                return
+            yield data
+
+    def multiple_chunks(self, chunk_size: Optional[int] = None) -> bool:
+        return True
+
+    def open(self, mode=None):
+        return self
+
+    def close(self):
+        self._rows = iter(())
+        self._buffer = b''
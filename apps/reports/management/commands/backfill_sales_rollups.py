@@ -0,0 +1,25 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.reports.repositories import DailySalesRollupRepository
+
+
+class Command(BaseCommand):
+    help = "Recalcula la tabla de ventas diarias agregadas (DailySalesRollup) a partir de ORDERS."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--restaurant', type=int, help="Solo el restaurante indicado")
+        parser.add_argument('--since', type=str, help="Solo desde la fecha indicada (YYYY-MM-DD)")
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError(f"Fecha inválida: {options['since']}")
+
+        written = DailySalesRollupRepository().rebuild(
+            restaurant_id=options['restaurant'], since=since
+        )
+        self.stdout.write(self.style.SUCCESS(f"Ventas diarias recalculadas: {written} filas."))
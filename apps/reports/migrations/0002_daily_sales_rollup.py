@@ -0,0 +1,58 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_sales(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    DailySalesRollup = apps.get_model('reports', 'DailySalesRollup')
+    rows = Order.objects.order_by().annotate(day=TruncDate('created_at')).values(
+        'restaurant_id', 'day', 'status'
+    ).annotate(order_count=Count('id'), total_amount=Sum('total_amount'))
+    DailySalesRollup.objects.bulk_create(
+        [
+            DailySalesRollup(
+                restaurant_id=row['restaurant_id'], date=row['day'], status=row['status'],
+                order_count=row['order_count'], total_amount=row['total_amount']
+            ) for row in rows
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+        ('reports', '0001_initial'),
+        ('restaurants', '0003_alter_restaurant_latitude_alter_restaurant_longitude_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='salesreport',
+            options={'ordering': ['-year', '-month'], 'verbose_name': 'Sales Report', 'verbose_name_plural': 'Sales Reports'},
+        ),
+        migrations.CreateModel(
+            name='DailySalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('order_count', models.IntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('restaurant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='restaurants.restaurant')),
+            ],
+            options={
+                'verbose_name': 'Daily Sales Rollup',
+                'verbose_name_plural': 'Daily Sales Rollups',
+                'ordering': ['-date', 'status'],
+                'constraints': [models.UniqueConstraint(fields=('restaurant', 'date', 'status'), name='uniq_daily_sales_rollup')],
+            },
+        ),
+        migrations.RunPython(backfill_daily_sales, migrations.RunPython.noop),
+    ]
@@ -22,3 +22,25 @@ class SalesReport(models.Model):
         verbose_name = 'Sales Report'
         verbose_name_plural = 'Sales Reports'
         ordering = ['-year', '-month']
+
+
+class DailySalesRollup(models.Model):
+    """Ventas agregadas por restaurante, día y estado; se mantiene al crear y actualizar órdenes"""
+
+    restaurant = models.ForeignKey('restaurants.Restaurant', on_delete=models.CASCADE, related_name='daily_sales')
+    date = models.DateField()
+    status = models.CharField(max_length=20)
+    order_count = models.IntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Daily Sales for {self.restaurant_id} - {self.date} ({self.status})"
+
+    class Meta:
+        verbose_name = 'Daily Sales Rollup'
+        verbose_name_plural = 'Daily Sales Rollups'
+        ordering = ['-date', 'status']
+        constraints = [
+            models.UniqueConstraint(fields=['restaurant', 'date', 'status'], name='uniq_daily_sales_rollup'),
+        ]
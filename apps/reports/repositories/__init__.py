@@ -0,0 +1,3 @@
+from .daily_sales_rollup_repository import DailySalesRollupRepository
+
+__all__ = ['DailySalesRollupRepository']
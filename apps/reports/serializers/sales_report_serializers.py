@@ -1,7 +1,25 @@
 from rest_framework import serializers
-from apps.reports.models import SalesReport
+from apps.reports.models import SalesReport, DailySalesRollup
 
 class SalesReportSerializer(serializers.ModelSerializer):
     class Meta:
         model = SalesReport
         fields = '__all__'
+
+
+class DailySalesRollupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DailySalesRollup
+        fields = ['date', 'status', 'order_count', 'total_amount']
+
+
+class DailySalesQuerySerializer(serializers.Serializer):
+    restaurant_id = serializers.IntegerField()
+    start = serializers.DateField()
+    end = serializers.DateField()
+    status = serializers.CharField(required=False)
+
+    def validate(self, data):
+        if data['start'] > data['end']:
+            raise serializers.ValidationError("La fecha inicial debe ser anterior a la final.")
+        return data
@@ -1,69 +1,137 @@
-import os
-import csv
+import heapq
 import logging
+from datetime import datetime, timedelta
+from decimal import Decimal
 from celery import shared_task
-from django.core.files.base import ContentFile
-from django.core.files import File
-from django.core.files.storage import default_storage
-from django.conf import settings
+from django.db.models import Sum
 
-from apps.orders.models import Order
+from apps.core.db_router import read_db
+from apps.menu.models import MenuItem
+from apps.orders.models import ArchivedOrder, Order, OrderItem
+from apps.reports.csv_stream import CsvStream
 from apps.reports.models import SalesReport
+from apps.reports.repositories import DailySalesRollupRepository
 
 logger = logging.getLogger(__name__)
 
+# filas que se traen por viaje al recorrer el detalle de órdenes
+REPORT_CHUNK_SIZE = 2000
+
+
+def _month_range(year, month):
+    """Rango [inicio, fin) del mes: filtra por created_at sin funciones sobre la columna"""
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
+
+def _amount(value):
+    """Montos con dos decimales, como los suma Python sobre los DecimalField"""
+    return value.quantize(Decimal('0.01')) if value is not None else 0
+
+
+def _report_rows(report):
+    """Genera las filas del reporte; cada sección se agrega en SQL y se recorre en streaming"""
+    start, end = _month_range(int(report.year), int(report.month))
+    # el reporte es de solo lectura: réplica si está al día
+    db = read_db()
+    orders = Order.objects.using(db).filter(
+        restaurant_id=report.restaurant_id,
+        created_at__gte=start,
+        created_at__lt=end
+    ).order_by()
+    # las órdenes archivadas ya no están en ORDERS ni ORDER_ITEMS, pero siguen contando
+    archived = ArchivedOrder.objects.using(db).filter(
+        restaurant_id=report.restaurant_id,
+        created_at__gte=start,
+        created_at__lt=end
+    ).order_by()
+
+    # Resumen y ventas por día salen del agregado diario: una fila por día y estado
+    by_day = list(DailySalesRollupRepository().get_range(
+        report.restaurant_id, start.date(), end.date() - timedelta(days=1)
+    ))
+
+    # Resumen (mismas dos primeras filas de siempre)
+    yield ["ID Restaurante", "Nombre", "Total Ventas", "Total Precio Ventas"]
+    yield [
+        report.restaurant.id,
+        report.restaurant.name,
+        sum(row.order_count for row in by_day),
+        _amount(sum(row.total_amount for row in by_day)) if by_day else 0
+    ]
+
+    # Ventas por día y estado
+    yield []
+    yield ["Fecha", "Estado", "Ventas", "Precio Ventas"]
+    for row in by_day:
+        yield [row.date, row.status, row.order_count, _amount(row.total_amount)]
+
+    # Ventas por ítem de menú: ORDER_ITEMS agregado en SQL más los ítems de las
+    # órdenes archivadas del mes. Es una fila por ítem del menú, así que se
+    # suman y ordenan en memoria
+    yield []
+    yield ["ID Ítem", "Ítem", "Cantidad", "Precio Ventas"]
+    # el ítem se crea junto con su orden: el límite inferior permite podar particiones de ORDER_ITEMS
+    by_item = OrderItem.objects.using(db).filter(order__in=orders, created_at__gte=start).values(
+        'menu_item_id', 'menu_item__name'
+    ).annotate(
+        total_quantity=Sum('quantity'), total_price=Sum('subtotal')
+    )
+    items = {
+        row['menu_item_id']: [row['menu_item__name'], row['total_quantity'], row['total_price']]
+        for row in by_item.iterator(chunk_size=REPORT_CHUNK_SIZE)
+    }
+    for data in archived.values_list('data', flat=True).iterator(chunk_size=REPORT_CHUNK_SIZE):
+        for item in data.get('order_items') or []:
+            totals = items.setdefault(item['menu_item_id'], [None, 0, Decimal('0')])
+            totals[1] += item['quantity']
+            totals[2] += Decimal(str(item['subtotal']))
+    unnamed = [menu_item_id for menu_item_id, totals in items.items() if totals[0] is None]
+    if unnamed:
+        for menu_item_id, name in MenuItem.objects.using(db).filter(id__in=unnamed).values_list('id', 'name'):
+            items[menu_item_id][0] = name
+    for menu_item_id, (name, quantity, price) in sorted(items.items(), key=lambda entry: (-entry[1][2], entry[0])):
+        yield [menu_item_id, name, quantity, _amount(price)]
+
+    # Detalle de órdenes: ORDERS y ORDERS_ARCHIVE por fecha, intercaladas en streaming
+    yield []
+    yield ["ID Orden", "Fecha", "Estado", "ID Cliente", "Total"]
+    columns = ('created_at', 'id', 'status', 'customer_id', 'total_amount')
+    detail = heapq.merge(*(
+        queryset.values_list(*columns).order_by('created_at', 'id').iterator(chunk_size=REPORT_CHUNK_SIZE)
+        for queryset in (orders, archived)
+    ))
+    for created_at, order_id, order_status, customer_id, total_amount in detail:
+        yield [order_id, created_at.strftime('%Y-%m-%d %H:%M:%S'), order_status, customer_id, total_amount]
+
+
 @shared_task(bind=True)
 def generate_sales_report(self, report_id):
     try:
-        report = SalesReport.objects.get(id=report_id)
+        report = SalesReport.objects.select_related('restaurant').get(id=report_id)
         report.status = 'processing'
-        report.save()
-
-        orders = Order.objects.filter(
-            restaurant=report.restaurant,
-            created_at__year=report.year,
-            created_at__month=report.month
-        )
-
-        # Nombre del archivo
-        filename = f"reports/sales_report_{report.restaurant.id}_{report.year}_{report.month}.csv"
-        
-        # Asegurar que el directorio reports/ existe
-        os.makedirs(os.path.join(settings.MEDIA_ROOT, 'reports'), exist_ok=True)
-        
-        # Ruta completa temporal del archivo
-        temp_path = os.path.join(settings.MEDIA_ROOT, filename)
-        
-        # Guardar CSV en disco temporalmente
-        with open(temp_path, 'w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(["ID Restaurante", "Nombre", "Total Ventas", "Total Precio Ventas"])
-            total_sales = orders.count()
-            total_price = sum(order.total_amount for order in orders)
-            writer.writerow([report.restaurant.id, report.restaurant.name, total_sales, total_price])
-        
-        # Abrir el archivo recién creado y guardarlo en el campo FileField
-        with open(temp_path, 'rb') as f:
-            # Usar solo el nombre de archivo sin la ruta completa
-            report.report_file.save(os.path.basename(filename), File(f), save=True)
-        
-        # Eliminar el archivo temporal
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-            
+        report.save(update_fields=['status'])
+
+        # Nombre del archivo (upload_to agrega el directorio reports/)
+        filename = f"sales_report_{report.restaurant.id}_{report.year}_{report.month}.csv"
+
+        # Las filas se escriben en el storage a medida que se generan, sin archivo temporal
+        report.report_file.save(filename, CsvStream(_report_rows(report), filename), save=False)
+
         report.status = 'completed'
-        report.save()
-        
-        logger.info(f"Reporte generado en: {report.report_file.path}")
-        
-        return f"Reporte guardado en {report.report_file.path}"
-        
+        report.save(update_fields=['report_file', 'status'])
+
+        logger.info(f"Reporte generado en: {report.report_file.name}")
+
+        return f"Reporte guardado en {report.report_file.name}"
+
     except SalesReport.DoesNotExist:
         logger.error(f"Error: Reporte con ID {report_id} no encontrado")
         return f"Error: Reporte con ID {report_id} no encontrado"
-        
+
     except Exception as e:
         report.status = 'failed'
-        report.save()
+        report.save(update_fields=['status'])
         logger.error(f"Error al generar el reporte: {str(e)}")
         raise e
@@ -6,7 +6,10 @@ import os
 
 from apps.reports.tasks import generate_sales_report
 
-from ..serializers.sales_report_serializers import SalesReportSerializer
+from ..repositories import DailySalesRollupRepository
+from ..serializers.sales_report_serializers import (
+    SalesReportSerializer, DailySalesRollupSerializer, DailySalesQuerySerializer
+)
 from ..models import SalesReport
 
 
@@ -50,3 +53,20 @@ class DownloadReportView(APIView):
             return response
         except SalesReport.DoesNotExist:
             return Response({"error": "El reporte no está disponible."}, status=status.HTTP_404_NOT_FOUND)
+
+
+class DailySalesView(APIView):
+    """Ventas por día y estado de un restaurante, leídas del agregado diario"""
+
+    def get(self, request):
+        query = DailySalesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        rows = DailySalesRollupRepository().get_range(**query.validated_data)
+        items = DailySalesRollupSerializer(rows, many=True).data
+
+        return Response({
+            'items': items,
+            'total': len(items),
+            'restaurant_id': query.validated_data['restaurant_id'],
+        }, status=status.HTTP_200_OK)
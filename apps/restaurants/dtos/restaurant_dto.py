@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+from apps.core.dtos import slotted
+
 @dataclass
 class RestaurantDTO:
     name: str
@@ -16,6 +18,8 @@ class RestaurantDTO:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
+SlottedRestaurantDTO = slotted(RestaurantDTO)
+
 @dataclass
 class RestaurantCreateDTO:
     name: str
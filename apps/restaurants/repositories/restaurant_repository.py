@@ -1,6 +1,8 @@
 from typing import Optional, Dict, Any
 from django.core.cache import cache
 from django.db import models
+from apps.core.cache import tagged_cache, entity_cache, invalidate_on_commit
+from apps.core.db_router import read_db
 from apps.core.repositories.django_repository import DjangoRepository
 from ..models import Restaurant
 
@@ -11,12 +13,12 @@ class RestaurantRepository(DjangoRepository[Restaurant]):
 
     def get_by_id(self, id: int) -> Optional[Restaurant]:
         cache_key = f'restaurant_{id}'
-        restaurant = cache.get(cache_key)
+        restaurant = self._cache_get(entity_cache.get, cache_key)
         
         if not restaurant:
-            restaurant = super().get_by_id(id)
+            restaurant = Restaurant.objects.using(read_db(cache_key)).filter(id=id).first()
             if restaurant:
-                cache.set(cache_key, restaurant, self.cache_timeout)
+                self._cache_set(entity_cache.set, cache_key, restaurant, self.cache_timeout)
         
         return restaurant
     
@@ -24,15 +26,17 @@ class RestaurantRepository(DjangoRepository[Restaurant]):
         filter_str = '_'.join(f"{k}:{v}" for k, v in sorted(filters.items())) if filters else "all"
         cache_key = f'restaurants_{filter_str}'
         
-        queryset = cache.get(cache_key)
+        queryset = self._cache_get(tagged_cache.get, cache_key)
         if queryset is None:
-            queryset = super().get_all(filters)
-            cache.set(cache_key, queryset, self.cache_timeout) 
+            queryset = Restaurant.objects.using(read_db()).all()
+            if filters:
+                queryset = queryset.filter(**filters)
+            self._cache_set(tagged_cache.set, cache_key, queryset, ['restaurants'], self.cache_timeout)
         return queryset
         
     def create(self, entity: Restaurant) -> Restaurant:
         entity = super().create(entity)
-        cache.delete_pattern('restaurants_*')
+        invalidate_on_commit(tagged_cache.invalidate, 'restaurants')
         return entity
     
     def update(self, entity: Restaurant) -> Restaurant:
@@ -55,13 +59,13 @@ class RestaurantRepository(DjangoRepository[Restaurant]):
         entity.save(update_fields=changed_fields + ['updated_at'])
         
         # Invalidar caché
-        cache.delete(f'restaurant_{entity.id}')
-        cache.delete_pattern('restaurants_*')
+        invalidate_on_commit(entity_cache.delete, f'restaurant_{entity.id}')
+        invalidate_on_commit(tagged_cache.invalidate, 'restaurants')
         return entity
     
     def delete(self, id: int) -> bool:
         result = super().delete(id)
         if result:
-            cache.delete_pattern(f'restaurant_{id}')
-            cache.delete_pattern('restaurants_*')
+            invalidate_on_commit(entity_cache.delete, f'restaurant_{id}')
+            invalidate_on_commit(tagged_cache.invalidate, 'restaurants')
         return result
@@ -2,11 +2,13 @@ from rest_framework import serializers
 from drf_spectacular.utils import extend_schema_serializer
 from django.utils.translation import gettext_lazy as _
 
+from apps.core.serializers import CompiledSerializerMixin
+
 @extend_schema_serializer(
     component_name="Restaurant",
     examples=[]
 )
-class RestaurantDTOSerializer(serializers.Serializer):
+class RestaurantDTOSerializer(CompiledSerializerMixin, serializers.Serializer):
     id = serializers.IntegerField(required=False)
     name = serializers.CharField()
     address = serializers.CharField()
@@ -1,12 +1,13 @@
 from rest_framework.exceptions import NotFound
 from rest_framework import serializers
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Iterable, Union
 from django.utils.translation import gettext_lazy as _
 from django.db import models
+from apps.core.dtos import DTOBatch, dto_fields
 from apps.core.exceptions import ValidationException
 from ..models import Restaurant
 from ..serializers.restaurant_serializers import RestaurantCreateDTOSerializer, RestaurantDTOSerializer, RestaurantUpdateDTOSerializer
-from ..dtos.restaurant_dto import RestaurantCreateDTO, RestaurantDTO, RestaurantUpdateDTO
+from ..dtos.restaurant_dto import RestaurantCreateDTO, RestaurantDTO, RestaurantUpdateDTO, SlottedRestaurantDTO
 from ..repositories.restaurant_repository import RestaurantRepository
 from ..filters.restaurant_filters import RestaurantFilter
 
@@ -35,7 +36,7 @@ class RestaurantService:
         filter_set = RestaurantFilter(filters or {}, queryset=base_queryset)
         filtered_queryset = filter_set.qs
 
-        return filtered_queryset.order_by('-created_at') 
+        return self.repository.project(filtered_queryset.order_by('-created_at'), dto_fields(RestaurantDTO))
 
     def create_restaurant(self, restaurant_data: RestaurantCreateDTO) -> Dict:
         serializer = RestaurantCreateDTOSerializer(data=restaurant_data.__dict__)
@@ -119,6 +120,14 @@ class RestaurantService:
             updated_at=model.updated_at
         )
     
+    def _to_dto_batch(self, instances: Iterable[Any]) -> DTOBatch[SlottedRestaurantDTO]:
+        """Convierte restaurantes (modelos o filas proyectadas) a un lote columnar de DTOs"""
+        return DTOBatch.from_objects(SlottedRestaurantDTO, instances, {
+            'rating': float,
+            'latitude': float,
+            'longitude': float,
+        })
+    
     def _to_model(self, dto: Union[RestaurantCreateDTO, RestaurantUpdateDTO, RestaurantDTO]) -> Restaurant:
         model = self.repository.model_class()
         
@@ -10,11 +10,12 @@ from ..serializers.restaurant_serializers import RestaurantDTOSerializer
 
 from apps.core.decorators import permission_required
 from apps.core.exceptions import ValidationException
+from apps.core.pagination import KeysetPaginationMixin
 from ..dependencies import get_restaurant_service
 
 service = get_restaurant_service()
 
-class RestaurantListCreateAPIView(APIView):
+class RestaurantListCreateAPIView(KeysetPaginationMixin, APIView):
     pagination_class = PageNumberPagination
 
     @property
@@ -59,20 +60,31 @@ class RestaurantListCreateAPIView(APIView):
                 filters.pop('page')
             if 'page_size' in filters:
                 filters.pop('page_size')
+            if 'cursor' in filters:
+                filters.pop('cursor')
+            if 'include_total' in filters:
+                filters.pop('include_total')
             
             # Obtener queryset filtrado
             queryset = service.list_restaurants(filters=filters)
             
+            # Paginación por cursor (?cursor=)
+            if self.use_keyset_pagination():
+                page = self.paginate_keyset(queryset)
+                dto_items = service._to_dto_batch(page)
+                serializer = RestaurantDTOSerializer(dto_items, many=True)
+                return self.get_keyset_paginated_response(serializer.data)
+            
             # Aplicar paginación
             page = self.paginate_queryset(queryset)
             if page is not None:
-                # Convertir a DTOs y serializar
-                dto_items = [service._to_dto(item) for item in page]
+                # Convertir a un lote de DTOs y serializar
+                dto_items = service._to_dto_batch(page)
                 serializer = RestaurantDTOSerializer(dto_items, many=True)
                 return self.get_paginated_response(serializer.data)
             
             # Si la paginación está desactivada (poco probable con tu configuración)
-            dto_items = [service._to_dto(item) for item in queryset]
+            dto_items = service._to_dto_batch(queryset)
             serializer = RestaurantDTOSerializer(dto_items, many=True)
             return Response({
                 'items': serializer.data,
@@ -1,3 +1,3 @@
-from .user_dtos import UserDTO, UserCreateDTO, UserUpdateDTO
+from .user_dtos import UserDTO, UserCreateDTO, UserUpdateDTO, SlottedUserDTO
 
-__all__ = ['UserDTO', 'UserCreateDTO', 'UserUpdateDTO']
+__all__ = ['UserDTO', 'UserCreateDTO', 'UserUpdateDTO', 'SlottedUserDTO']
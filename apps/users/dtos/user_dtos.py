@@ -3,6 +3,8 @@ from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime
 
+from apps.core.dtos import slotted
+
 
 @dataclass
 class UserDTO:
@@ -20,6 +22,9 @@ class UserDTO:
     last_updated: Optional[datetime] = None
 
 
+SlottedUserDTO = slotted(UserDTO)
+
+
 @dataclass
 class UserCreateDTO:
     email: str
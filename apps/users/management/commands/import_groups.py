@@ -4,6 +4,7 @@ from django.core.management.base import BaseCommand
 from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
 from django.apps import apps
+from apps.core.permissions import invalidate_permissions
 
 class Command(BaseCommand):
     help = "Carga los grupos y permisos desde un archivo CSV ubicado en 'import/groups_permissions.csv'."
@@ -61,4 +62,6 @@ class Command(BaseCommand):
                         else:
                             self.stdout.write(self.style.ERROR(f"Permiso '{codename}' no encontrado."))
 
+        # los permisos compilados en cache dejan de ser validos
+        invalidate_permissions()
         self.stdout.write(self.style.SUCCESS("Importación de grupos y permisos completada."))
@@ -84,6 +84,8 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['first_name', 'last_name', 'phone']
+    # campos que viajan como claims en el token o que lo invalidan (apps.core.signals)
+    CLAIM_FIELDS = ('is_active', 'is_staff', 'is_superuser', 'restaurant_id')
 
     objects = UserManager()
 
@@ -93,6 +95,15 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name_plural = 'Users'
         ordering = ['-date_joined']
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # valores cargados: al guardar se comparan sin volver a consultar
+        instance._loaded_claims = {
+            field: instance.__dict__[field] for field in cls.CLAIM_FIELDS if field in instance.__dict__
+        }
+        return instance
+
     def __str__(self):
         return f'{self.get_full_name()} ({self.email})'
 
@@ -2,6 +2,7 @@ from apps.core.repositories.django_repository import DjangoRepository
 from typing import Dict, Any, Optional
 from django.db import models, transaction
 from django.core.cache import cache
+from apps.core.cache import tagged_cache, entity_cache, invalidate_on_commit
 from apps.users.models import User
 
 
@@ -12,34 +13,34 @@ class UserRepository(DjangoRepository[User]):
     
     def get_by_id(self, id: int) -> Optional[User]:
         cache_key = f'user_{id}'
-        user = cache.get(cache_key)
+        user = self._cache_get(entity_cache.get, cache_key)
         
         if not user:
             user = User.objects.select_related('restaurant').filter(id=id).first()
             if user:
-                cache.set(cache_key, user, self.cache_timeout)
+                self._cache_set(entity_cache.set, cache_key, user, self.cache_timeout)
         
         return user
     
     def get_by_email(self, email: str) -> Optional[User]:
         cache_key = f'user_email_{email}'
-        user = cache.get(cache_key)
+        user = self._cache_get(cache.get, cache_key)
         
         if not user:
             user = User.objects.select_related('restaurant').filter(email=email).first()
             if user:
-                cache.set(cache_key, user, self.cache_timeout)
+                self._cache_set(cache.set, cache_key, user, self.cache_timeout)
         
         return user
     
     def get_by_restaurant_id(self, restaurant_id: int) -> models.QuerySet:
         """Obtener todos los usuarios de un restaurante específico"""
         cache_key = f'users_restaurant_{restaurant_id}'
-        queryset = cache.get(cache_key)
+        queryset = self._cache_get(tagged_cache.get, cache_key)
         
         if queryset is None:
             queryset = User.objects.filter(restaurant_id=restaurant_id, is_active=True)
-            cache.set(cache_key, queryset, self.cache_timeout)
+            self._cache_set(tagged_cache.set, cache_key, queryset, [f'users:restaurant:{restaurant_id}'], self.cache_timeout)
         
         return queryset
     
@@ -48,19 +49,31 @@ class UserRepository(DjangoRepository[User]):
         filter_str = '_'.join(f"{k}:{v}" for k, v in sorted(filters.items())) if filters else "all"
         cache_key = f'users_{filter_str}'
         
-        queryset = cache.get(cache_key)
+        queryset = self._cache_get(tagged_cache.get, cache_key)
         if queryset is None:
             # Optimizar consulta con select_related
             queryset = User.objects.select_related('restaurant').all()
             
             # Aplicar filtros si existen
             if filters:
-                queryset = super().apply_filters(queryset, filters)
+                queryset = queryset.filter(**filters)
                 
-            cache.set(cache_key, queryset, self.cache_timeout)
+            self._cache_set(tagged_cache.set, cache_key, queryset, ['users'], self.cache_timeout)
         
         return queryset
     
+    def invalidate(self, user: User, *previous_emails: str) -> None:
+        """Invalidar las entradas en caché de un usuario"""
+        emails = {user.email, *previous_emails}
+        invalidate_on_commit(entity_cache.delete, f'user_{user.id}', *(f'user_email_{email}' for email in emails))
+    
+    def _invalidate_lists(self, *restaurant_ids: Optional[int]) -> None:
+        tags = ['users'] + [
+            f'users:restaurant:{restaurant_id}'
+            for restaurant_id in set(restaurant_ids) if restaurant_id
+        ]
+        invalidate_on_commit(tagged_cache.invalidate, *tags)
+    
     @transaction.atomic
     def create(self, entity: User) -> User:
         # Si se proporciona contraseña sin cifrar, usar set_password
@@ -72,9 +85,7 @@ class UserRepository(DjangoRepository[User]):
         entity.save()
         
         # Invalidar caché
-        cache.delete_pattern('users_*')
-        if entity.restaurant_id:
-            cache.delete_pattern(f'users_restaurant_{entity.restaurant_id}')
+        self._invalidate_lists(entity.restaurant_id)
     
         return entity
     
@@ -84,6 +95,9 @@ class UserRepository(DjangoRepository[User]):
         if not existing:
             return None
         
+        previous_restaurant_id = existing.restaurant_id
+        previous_email = existing.email
+        
         # Campos que cambiaron
         changed_fields = []
         for field in ['email', 'first_name', 'last_name', 'phone', 
@@ -109,11 +123,9 @@ class UserRepository(DjangoRepository[User]):
             existing.save(update_fields=['password', 'last_updated'])
         
         # Invalidar caché
-        cache.delete(f'user_{entity.id}')
-        cache.delete(f'user_email_{entity.email}')
-        cache.delete_pattern('users_*')
-        if entity.restaurant_id:
-            cache.delete_pattern(f'users_restaurant_{entity.restaurant_id}')
+        # los claims los invalida la señal post_save de User (apps.core.signals)
+        self.invalidate(entity, previous_email)
+        self._invalidate_lists(previous_restaurant_id, existing.restaurant_id)
         
         return existing
     
@@ -131,11 +143,8 @@ class UserRepository(DjangoRepository[User]):
             user.save(update_fields=['is_active', 'last_updated'])
             
             # Invalidar caché
-            cache.delete(f'user_{id}')
-            cache.delete(f'user_email_{user.email}')
-            cache.delete_pattern('users_*')
-            if restaurant_id:
-                cache.delete_pattern(f'users_restaurant_{restaurant_id}')
+            self.invalidate(user)
+            self._invalidate_lists(restaurant_id)
             
             return True
         except User.DoesNotExist:
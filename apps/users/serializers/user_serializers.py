@@ -3,8 +3,10 @@ from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
 
+from apps.core.serializers import CompiledSerializerMixin
 
-class UserDTOSerializer(serializers.Serializer):
+
+class UserDTOSerializer(CompiledSerializerMixin, serializers.Serializer):
     id = serializers.IntegerField(required=False)
     email = serializers.EmailField()
     first_name = serializers.CharField(max_length=100)
@@ -1,4 +1,4 @@
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Iterable, Optional, List, Union
 from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import ValidationError, NotFound
@@ -6,12 +6,13 @@ from rest_framework.exceptions import ValidationError, NotFound
 from apps.users.models import User
 from apps.users.filters import UserFilter
 from apps.users.repositories import UserRepository
-from apps.users.dtos import UserDTO, UserCreateDTO, UserUpdateDTO
+from apps.users.dtos import UserDTO, UserCreateDTO, UserUpdateDTO, SlottedUserDTO
 from apps.users.serializers import (
     UserDTOSerializer,
     UserCreateDTOSerializer,
     UserUpdateDTOSerializer
 )
+from apps.core.dtos import DTOBatch, dto_fields
 from apps.core.exceptions import ValidationException
 
 
@@ -54,7 +55,7 @@ class UserService:
         filter_set = UserFilter(filters or {}, queryset=base_queryset)
         filtered_queryset = filter_set.qs
         
-        return filtered_queryset.order_by('last_name', 'first_name')
+        return self.repository.project(filtered_queryset.order_by('last_name', 'first_name'), dto_fields(UserDTO))
     
     def get_restaurant_users(self, restaurant_id: int) -> List[UserDTO]:
         """Obtiene todos los usuarios de un restaurante específico"""
@@ -175,6 +176,10 @@ class UserService:
             last_updated=model.last_updated
         )
     
+    def _to_dto_batch(self, instances: Iterable[Any]) -> DTOBatch[SlottedUserDTO]:
+        """Convierte usuarios (modelos o filas proyectadas) a un lote columnar de DTOs"""
+        return DTOBatch.from_objects(SlottedUserDTO, instances)
+    
     def _to_model(self, dto: Union[UserCreateDTO, UserUpdateDTO, UserDTO], existing_model: User = None) -> User:
         """Convierte un DTO a modelo User"""
         model = existing_model or User()
@@ -8,7 +8,9 @@ from rest_framework.exceptions import NotFound
 from django.utils.translation import gettext_lazy as _
 from django.core.cache import cache
 from apps.core.decorators import permission_required
+from apps.core.permissions import has_permissions
 from apps.core.exceptions import ValidationException
+from apps.core.pagination import KeysetPaginationMixin
 from apps.users.dtos import UserCreateDTO
 from apps.users.serializers.user_serializers import BulkUserUploadSerializer, UserDTOSerializer
 from apps.users.services import UserService
@@ -18,9 +20,10 @@ from apps.users.tasks import process_bulk_users
 service = UserService()
 
 
-class UserListCreateAPIView(APIView):
+class UserListCreateAPIView(KeysetPaginationMixin, APIView):
     pagination_class = PageNumberPagination
     parser_classes = (JSONParser,)
+    keyset_ordering_field = 'date_joined'
     
     @property
     def paginator(self):
@@ -58,20 +61,31 @@ class UserListCreateAPIView(APIView):
                 filters.pop('page')
             if 'page_size' in filters:
                 filters.pop('page_size')
+            if 'cursor' in filters:
+                filters.pop('cursor')
+            if 'include_total' in filters:
+                filters.pop('include_total')
             
             # Obtener queryset filtrado
             queryset = service.list_users(filters=filters)
             
+            # Paginación por cursor (?cursor=)
+            if self.use_keyset_pagination():
+                page = self.paginate_keyset(queryset)
+                dto_items = service._to_dto_batch(page)
+                serializer = UserDTOSerializer(dto_items, many=True)
+                return self.get_keyset_paginated_response(serializer.data)
+            
             # Aplicar paginación
             page = self.paginate_queryset(queryset)
             if page is not None:
-                # Convertir a DTOs y serializar
-                dto_items = [service._to_dto(item) for item in page]
+                # Convertir a un lote de DTOs y serializar
+                dto_items = service._to_dto_batch(page)
                 serializer = UserDTOSerializer(dto_items, many=True)
                 return self.get_paginated_response(serializer.data)
             
             # Si la paginación está desactivada
-            dto_items = [service._to_dto(item) for item in queryset]
+            dto_items = service._to_dto_batch(queryset)
             serializer = UserDTOSerializer(dto_items, many=True)
             return Response({
                 'items': serializer.data,
@@ -80,6 +94,11 @@ class UserListCreateAPIView(APIView):
                 'page_size': len(dto_items)
             }, status=status.HTTP_200_OK)
             
+        except NotFound as e:
+            return Response({
+                'status': 'error',
+                'message': str(e)
+            }, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({
                 'status': 'error',
@@ -99,7 +118,7 @@ class UserListCreateAPIView(APIView):
             
             # Verificar permisos si se requieren
             if requires_admin_permission:
-                if not request.user.is_authenticated or not request.user.has_perm('users.add_user'):
+                if not request.user.is_authenticated or not has_permissions(request, ['users.add_user']):
                     return Response({
                         'status': 'error',
                         'message': _("No tiene permisos para crear usuarios con privilegios administrativos")
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# un solo event loop por proceso: las vistas async usan redis.asyncio
+os.environ.setdefault('CACHE_ASYNC_CLIENT', 'true')
 
 application = get_asgi_application()
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from celery.schedules import crontab
 from pathlib import Path
 import environ
 import os
@@ -46,6 +47,7 @@ THIRD_PARTY_APPS = [
     'django_password_validators',
     'django_celery_beat',
     'django_filters',
+    'adrf',
     'celery',
 ]
 
@@ -63,7 +65,7 @@ INSTALLED_APPS = BASE_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.authentication.backends.claims_authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -74,15 +76,23 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 
 MIDDLEWARE = [
+    # primero: sus tiempos incluyen al resto de middlewares
+    'apps.core.metrics.PrometheusMiddleware',
+    'apps.core.instrumentation.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.core.db_router.ReadYourWritesMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -121,6 +131,60 @@ DATABASES = {
     }
 }
 
+# Conexiones según el tipo de proceso (DB_PROCESS_TYPE: web, worker o beat).
+# Con psycopg 3 se usa el pool de Django; con psycopg2, conexiones persistentes.
+# El pool se abre en la primera consulta: cada proceso hijo de celery tiene el suyo.
+DB_PROCESS_TYPE = env("DB_PROCESS_TYPE", default="web")
+DB_POOL_SIZES = {
+    # un hilo por request en el servidor web
+    "web": {"min_size": 2, "max_size": env.int("DB_POOL_MAX_SIZE", default=10)},
+    # cada proceso prefork ejecuta una tarea a la vez
+    "worker": {"min_size": 1, "max_size": 2},
+    # beat solo consulta la agenda de django_celery_beat
+    "beat": {"min_size": 1, "max_size": 1},
+}
+
+# con pool, el pool verifica cada conexión al entregarla
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+try:
+    import psycopg_pool  # noqa: F401
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            **DB_POOL_SIZES[DB_PROCESS_TYPE],
+            "name": f"{DB_PROCESS_TYPE}-default",
+            # segundos de espera por una conexión libre antes de fallar
+            "timeout": env.float("DB_POOL_TIMEOUT", default=5),
+            "max_idle": 300,
+            "max_lifetime": 1800,
+        }
+    }
+except ImportError:
+    DATABASES["default"]["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", default=60)
+
+# Réplica de lectura opcional para listados y reportes (ver apps.core.db_router)
+if env("POSTGRES_REPLICA_HOST", default=None):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": env("POSTGRES_REPLICA_HOST"),
+        "PORT": env("POSTGRES_REPLICA_PORT", default=DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+    if "pool" in DATABASES["default"].get("OPTIONS", {}):
+        DATABASES["replica"]["OPTIONS"] = {
+            "pool": {**DATABASES["default"]["OPTIONS"]["pool"], "name": f"{DB_PROCESS_TYPE}-replica"}
+        }
+
+DATABASE_ROUTERS = ['apps.core.db_router.ReplicaRouter']
+
+DATABASE_REPLICA = {
+    'ALIAS': 'replica',
+    # con más retraso las lecturas vuelven al primario; también es la ventana
+    # en que un usuario lee del primario después de escribir
+    'MAX_LAG_SECONDS': env.int('POSTGRES_REPLICA_MAX_LAG_SECONDS', default=5),
+    # cada cuánto se consulta el retraso de la réplica, por proceso
+    'CHECK_INTERVAL': 5,
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -200,6 +264,49 @@ CACHES = {
     }
 }
 
+# Cliente redis.asyncio para las vistas async. Solo bajo ASGI (config/asgi.py lo activa):
+# con WSGI cada vista async corre en un event loop nuevo y no podría reusar conexiones
+CACHE_ASYNC_CLIENT = env.bool('CACHE_ASYNC_CLIENT', default=False)
+
+# Nivel de cache en memoria de cada worker delante de redis (busquedas por id)
+LOCAL_CACHE = {
+    'ENABLED': env.bool('LOCAL_CACHE_ENABLED', default=True),
+    'MAX_ENTRIES': env.int('LOCAL_CACHE_MAX_ENTRIES', default=1024),
+    'TIMEOUT': env.int('LOCAL_CACHE_TIMEOUT', default=30),  # segundos
+    'CHANNEL': 'cache_invalidation',
+}
+
+# Métricas por request (consultas SQL, caché de repositorios y serialización) en la
+# cabecera Server-Timing y en el log apps.core.instrumentation. SAMPLE_RATE es la
+# fracción de requests medidas (0 a 1)
+REQUEST_METRICS = {
+    'SAMPLE_RATE': env.float('REQUEST_METRICS_SAMPLE_RATE', default=0.01),
+    'SERVER_TIMING': env.bool('REQUEST_METRICS_SERVER_TIMING', default=True),
+    'LOG': env.bool('REQUEST_METRICS_LOG', default=True),
+}
+
+# Endpoint /metrics (Prometheus). Con METRICS_TOKEN el scrape debe enviar
+# 'Authorization: Bearer <token>'; sin él solo responde a administradores
+# autenticados, así que en producción METRICS_TOKEN es obligatorio.
+# CELERY_QUEUES son las colas del broker a medir
+METRICS = {
+    'TOKEN': env('METRICS_TOKEN', default=None),
+    'CELERY_QUEUES': ['celery'],
+    'BROKER_TIMEOUT': 1,  # segundos
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        # una línea JSON por request muestreada
+        'apps.core.instrumentation': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 TEST_RUNNER = 'django.test.runner.DiscoverRunner'
 
 # Celery
@@ -210,3 +317,28 @@ CELERY_BROKER_CONNECTION_MAX_RETRIES = 10
 CELERY_BROKER_POOL_LIMIT = None
 CELERY_TIMEZONE = 'America/Bogota'
 CELERY_ENABLE_UTC = False
+CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+CELERY_BEAT_SCHEDULE = {
+    # idempotente: crea las particiones que falten y separa las vencidas
+    'maintain-order-partitions': {
+        'task': 'apps.orders.tasks.maintain_order_partitions',
+        'schedule': crontab(minute=0, hour=3),
+    },
+    'archive-orders': {
+        'task': 'apps.orders.tasks.archive_orders',
+        'schedule': crontab(minute=30, hour=3),
+    },
+}
+
+# Particiones mensuales de ORDERS/ORDER_ITEMS (solo PostgreSQL)
+ORDER_PARTITIONS = {
+    'MONTHS_AHEAD': env.int('ORDER_PARTITIONS_MONTHS_AHEAD', default=3),
+    # None: no se separan particiones antiguas
+    'RETENTION_MONTHS': env.int('ORDER_PARTITIONS_RETENTION_MONTHS', default=None),
+}
+
+# Archivo de órdenes inactivas, completadas o canceladas (ver archive_orders)
+ORDER_ARCHIVE = {
+    'AFTER_DAYS': env.int('ORDER_ARCHIVE_AFTER_DAYS', default=180),
+    'BATCH_SIZE': env.int('ORDER_ARCHIVE_BATCH_SIZE', default=1000),
+}
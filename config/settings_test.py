@@ -0,0 +1,52 @@
+"""
+Settings para tests y para el arnés de rendimiento (apps/core/perf).
+
+Sin servicios externos: SQLite en memoria, o el PostgreSQL local con
+TEST_DATABASE=postgres (variables POSTGRES_*), Redis falso con fakeredis
+y tareas de Celery ejecutadas en el mismo proceso.
+"""
+import os
+import tempfile
+
+TEST_DATABASE = os.environ.get('TEST_DATABASE', 'sqlite')
+
+if TEST_DATABASE == 'sqlite':
+    # settings.py exige las variables de PostgreSQL aunque no se usen
+    for name in ('POSTGRES_DB', 'POSTGRES_USER', 'POSTGRES_PASSWORD', 'POSTGRES_HOST'):
+        os.environ.setdefault(name, 'test')
+
+from .settings import *  # noqa: E402,F401,F403
+import fakeredis  # noqa: E402
+
+if TEST_DATABASE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
+    }
+
+# mismo backend django-redis, contra un servidor redis en memoria
+FAKE_REDIS_SERVER = fakeredis.FakeServer()
+CACHES = {
+    'default': {
+        **CACHES['default'],
+        'OPTIONS': {
+            **CACHES['default']['OPTIONS'],
+            'CONNECTION_POOL_KWARGS': {
+                'connection_class': fakeredis.FakeRedisConnection,
+                'server': FAKE_REDIS_SERVER,
+            },
+        },
+    }
+}
+CACHE_ASYNC_CLIENT = False
+
+CELERY_BROKER_URL = 'memory://'
+CELERY_RESULT_BACKEND = 'cache+memory://'
+CELERY_TASK_ALWAYS_EAGER = True
+
+# hash rápido: los fixtures crean cientos de usuarios
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+MEDIA_ROOT = os.path.join(tempfile.gettempdir(), 'restaurant-test-media')
@@ -3,6 +3,7 @@ from django.conf.urls.static import static
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 from django.contrib import admin
 from django.urls import path, include
+from apps.core.views import MetricsView
 
 
 urlpatterns = [
@@ -13,6 +14,8 @@ urlpatterns = [
     path('menu/', include('apps.menu.urls')),
     path('orders/', include('apps.orders.urls')),
     path('reports/', include('apps.reports.urls')),
+    path('health/', include('apps.core.urls')),
+    path('metrics', MetricsView.as_view(), name='metrics'),
 
     # Documentacion APIs
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),